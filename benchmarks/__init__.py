@@ -0,0 +1,5 @@
+"""Performance benchmarks of the Forge pipeline.
+
+:mod:`benchmarks.generate` writes synthetic Fortran projects of configurable
+size and :mod:`benchmarks.run` times every pipeline stage on them.
+"""
@@ -0,0 +1,265 @@
+"""Deterministic generator of synthetic Fortran code bases.
+
+The generated projects follow the layout of ``examples/basic``: a ``src``
+directory with one module per file and a ``forge.toml`` next to it.  Their
+shape is controlled by :class:`ProjectSpec`:
+
+* ``modules`` modules, each ``use``-ing up to ``use_fanout`` modules with a
+  lower index, so that the use graph is acyclic;
+* ``derived_types`` derived types per module, each with scalar and array
+  components;
+* ``subprograms`` subprograms per module, alternating between subroutines and
+  functions, each with ``declarations`` local variables;
+* ``calls`` calls per subprogram to subprograms of the same module or of a
+  used module, and ``array_refs`` array element references.
+
+The output only depends on the spec (including its ``seed``), so the same tier
+produces byte-identical sources across machines and commits.
+
+Example::
+
+    python -m benchmarks.generate --tier 1k /tmp/bench-1k
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+import random
+
+import typer
+
+
+@dataclass(frozen=True)
+class ProjectSpec:
+    """Shape of a synthetic Fortran project."""
+
+    modules: int = 10
+    subprograms: int = 10
+    declarations: int = 4
+    use_fanout: int = 3
+    derived_types: int = 1
+    calls: int = 3
+    array_refs: int = 4
+    seed: int = 0
+
+    @property
+    def total_subprograms(self) -> int:
+        return self.modules * self.subprograms
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "total_subprograms": self.total_subprograms}
+
+
+#: Predefined sizes, named after their total number of subprograms.
+TIERS: dict[str, ProjectSpec] = {
+    "1k": ProjectSpec(modules=50, subprograms=20),
+    "10k": ProjectSpec(modules=500, subprograms=20),
+    "100k": ProjectSpec(modules=5000, subprograms=20),
+}
+
+
+FORGE_TOML = """\
+# forge.toml: generated by benchmarks/generate.py
+
+[project]
+name = "{name}"
+
+[sources]
+source_dirs = ["src"]
+include_patterns = ["**/*.f90", "**/*.F90"]
+exclude_patterns = []
+
+[parser]
+encoding = "utf-8"
+"""
+
+
+def module_name(index: int) -> str:
+    return f"bench_m{index:05d}"
+
+
+def _subprogram_name(module: int, index: int) -> str:
+    kind = "s" if index % 2 == 0 else "f"
+    return f"{kind}{module:05d}_{index:03d}"
+
+
+def _size_name(module: int) -> str:
+    return f"n{module:05d}"
+
+
+def _type_name(module: int, index: int) -> str:
+    return f"rec{module:05d}_{index}"
+
+
+def _subprogram(spec: ProjectSpec, rng: random.Random, module: int, index: int,
+                used: list[int]) -> list[str]:
+    """Return the source lines of one module procedure."""
+
+    name = _subprogram_name(module, index)
+    size = _size_name(module)
+    is_function = index % 2 == 1
+    lines: list[str] = []
+
+    if is_function:
+        lines.append(f"   real function {name}(a, b) result(r)")
+    else:
+        lines.append(f"   subroutine {name}(a, b)")
+    lines.append(f"      real, intent(inout) :: a({size})")
+    lines.append("      real, intent(in) :: b")
+    lines.append("      integer :: i")
+    for d in range(spec.declarations):
+        if d % 3 == 2:
+            lines.append(f"      real :: w{d}({size})")
+        else:
+            lines.append(f"      real :: t{d} = {d}.0")
+    if spec.derived_types:
+        lines.append(f"      type({_type_name(module, index % spec.derived_types)}) :: rec")
+    lines.append("")
+
+    lines.append(f"      do i = 1, {size}")
+    lines.append("         a(i) = a(i) + b")
+    lines.append("      end do")
+    for k in range(spec.array_refs):
+        lines.append(f"      a({k % 16 + 1}) = a({(k * 7) % 16 + 1}) * b")
+
+    if spec.derived_types:
+        lines.append("      rec%x = a(1)")
+        lines.append("      rec%buf(2) = rec%x + b")
+
+    # Callees: lower-indexed procedures of this module (no recursion) or
+    # procedures of a module this one uses.
+    candidates = [(module, k) for k in range(index)]
+    for dep in used:
+        candidates.extend((dep, k) for k in range(spec.subprograms))
+    for _ in range(min(spec.calls, len(candidates))):
+        callee_module, callee = rng.choice(candidates)
+        callee_name = _subprogram_name(callee_module, callee)
+        if callee % 2 == 1:
+            lines.append(f"      a(2) = {callee_name}(a, b)")
+        else:
+            lines.append(f"      call {callee_name}(a, b)")
+
+    if is_function:
+        lines.append("      r = a(1) + b")
+        lines.append(f"   end function {name}")
+    else:
+        lines.append(f"   end subroutine {name}")
+    lines.append("")
+    return lines
+
+
+def generate_module(spec: ProjectSpec, index: int) -> str:
+    """Return the Fortran source of module *index* of a project."""
+
+    # Seed per module so that modules can be generated independently
+    rng = random.Random(spec.seed * 1_000_003 + index)
+    name = module_name(index)
+    used = sorted(rng.sample(range(index), min(spec.use_fanout, index)))
+    size = _size_name(index)
+
+    lines = [
+        "!====================================================",
+        f"!  Module: {name}",
+        "!  Generated by benchmarks/generate.py",
+        "!====================================================",
+        f"module {name}",
+    ]
+    lines.extend(f"   use {module_name(dep)}" for dep in used)
+    lines.append("   implicit none")
+    lines.append("")
+    lines.append(f"   integer, parameter :: {size} = 16")
+    lines.append("")
+    for t in range(spec.derived_types):
+        lines.extend(
+            [
+                f"   type :: {_type_name(index, t)}",
+                "      real :: x, y",
+                "      integer :: tag",
+                f"      real :: buf({size})",
+                f"   end type {_type_name(index, t)}",
+                "",
+            ]
+        )
+    lines.append("contains")
+    lines.append("")
+    for s in range(spec.subprograms):
+        lines.extend(_subprogram(spec, rng, index, s, used))
+    lines.append(f"end module {name}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def generate_project(
+    spec: ProjectSpec, dest: Path, name: str = "bench", write_config: bool = True
+) -> list[Path]:
+    """Write a synthetic project described by *spec* into *dest*.
+
+    Args:
+        spec: Shape of the project.
+        dest: Project root; created if necessary.
+        name: Project name written to ``forge.toml``.
+        write_config: Whether to write ``forge.toml``; disable when the
+            project is initialised with ``forge init`` instead.
+
+    Returns:
+        Paths of the generated source files.
+    """
+
+    src = dest / "src"
+    src.mkdir(parents=True, exist_ok=True)
+    if write_config:
+        (dest / "forge.toml").write_text(FORGE_TOML.format(name=name), encoding="utf-8")
+
+    files = []
+    for index in range(spec.modules):
+        path = src / f"{module_name(index)}.f90"
+        path.write_text(generate_module(spec, index), encoding="utf-8")
+        files.append(path)
+    return files
+
+
+def resolve_spec(tier: str | None = None, **overrides: int | None) -> ProjectSpec:
+    """Return the spec of *tier* (or the default spec) with *overrides* applied."""
+
+    if tier is not None and tier not in TIERS:
+        raise typer.BadParameter(f"Unknown tier {tier!r}; choose from {', '.join(TIERS)}")
+    spec = TIERS[tier] if tier is not None else ProjectSpec()
+    return replace(spec, **{k: v for k, v in overrides.items() if v is not None})
+
+
+app = typer.Typer(help="Generate a synthetic Fortran project")
+
+
+@app.command()
+def main(
+    dest: Path = typer.Argument(..., help="Directory to write the project to"),
+    tier: str = typer.Option(None, "--tier", help=f"One of {', '.join(TIERS)}"),
+    modules: int = typer.Option(None, "--modules", min=1),
+    subprograms: int = typer.Option(None, "--subprograms", min=1),
+    declarations: int = typer.Option(None, "--declarations", min=0),
+    use_fanout: int = typer.Option(None, "--use-fanout", min=0),
+    derived_types: int = typer.Option(None, "--derived-types", min=0),
+    calls: int = typer.Option(None, "--calls", min=0),
+    array_refs: int = typer.Option(None, "--array-refs", min=0),
+    seed: int = typer.Option(None, "--seed"),
+) -> None:
+    """Write a synthetic project into DEST."""
+
+    spec = resolve_spec(
+        tier,
+        modules=modules,
+        subprograms=subprograms,
+        declarations=declarations,
+        use_fanout=use_fanout,
+        derived_types=derived_types,
+        calls=calls,
+        array_refs=array_refs,
+        seed=seed,
+    )
+    files = generate_project(spec, dest)
+    typer.echo(f"Generated {len(files)} modules ({spec.total_subprograms} subprograms) in {dest}")
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation helper
+    app()
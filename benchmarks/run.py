@@ -0,0 +1,201 @@
+"""Time every stage of the Forge pipeline on a synthetic project.
+
+The runner generates a project with :mod:`benchmarks.generate`, then runs
+``forge init``, ``extract``, ``transform``, ``load`` and ``resolve`` on it, each
+in a fresh interpreter so that start-up cost and peak memory are attributed to
+the right stage.  The wall-clock time of every stage is combined with the
+metrics the stage itself writes to ``.forge/metrics`` into one JSON document,
+which is meant to be kept per commit and compared with ``--compare``.
+
+Example::
+
+    python -m benchmarks.run --tier 1k --output results/1k.json
+    python -m benchmarks.run --tier 1k --compare results/1k.json
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import datetime as _dt
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .generate import TIERS, generate_project, resolve_spec
+
+app = typer.Typer(help="Benchmark the Forge pipeline")
+console = Console()
+
+#: Invoke the CLI of the Forge checkout the runner is executed from.
+FORGE = [sys.executable, "-c", "from forge.cli.main import main; main()"]
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return env
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _stage_metrics(project: Path, stage: str) -> dict | None:
+    """Return the metrics the last run of *stage* wrote, if any."""
+
+    runs = sorted((project / ".forge" / "metrics").glob(f"{stage}-*.json"))
+    if not runs:
+        return None
+    return json.loads(runs[-1].read_text(encoding="utf-8"))
+
+
+def run_stage(project: Path, stage: str, args: list[str]) -> dict:
+    """Run one ``forge`` sub-command in *project* and time it."""
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        FORGE + [stage, *args], cwd=project, env=_env(), capture_output=True, text=True
+    )
+    seconds = time.perf_counter() - start
+    result = {"seconds": seconds, "exit_code": proc.returncode}
+    metrics = _stage_metrics(project, stage)
+    if metrics is not None:
+        result["peak_rss_kb"] = metrics.get("peak_rss_kb")
+        result["metrics"] = metrics
+    if proc.returncode != 0:
+        result["stderr"] = proc.stderr[-4000:]
+    return result
+
+
+def run_benchmark(project: Path, db_url: str, stages: list[str]) -> dict:
+    """Run *stages* of the pipeline on an initialised *project*."""
+
+    stage_args = {
+        "extract": [],
+        "transform": [],
+        "load": ["--db-url", db_url],
+        "resolve": ["--db-url", db_url],
+    }
+    results: dict[str, dict] = {}
+    for stage in stages:
+        console.print(f"[cyan]{stage}[/cyan] ...")
+        results[stage] = run_stage(project, stage, stage_args[stage])
+        if results[stage]["exit_code"] != 0:
+            console.print(f"[red]{stage} failed:[/red]\n{results[stage].get('stderr', '')}")
+            break
+    return results
+
+
+def _compare(current: dict, baseline: dict) -> Table:
+    table = Table(title="Stage timings")
+    table.add_column("Stage")
+    table.add_column("Baseline [s]", justify="right")
+    table.add_column("Current [s]", justify="right")
+    table.add_column("Change", justify="right")
+    for stage, result in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage, {}).get("seconds")
+        now = result["seconds"]
+        change = f"{(now - before) / before:+.1%}" if before else ""
+        table.add_row(stage, f"{before:.2f}" if before else "-", f"{now:.2f}", change)
+    return table
+
+
+@app.command()
+def main(
+    tier: str = typer.Option("1k", "--tier", help=f"One of {', '.join(TIERS)}"),
+    stages: str = typer.Option(
+        "extract,transform,load,resolve",
+        "--stages",
+        help="Comma separated list of stages to run",
+    ),
+    output: Path = typer.Option(None, "--output", "-o", help="Write results to this file"),
+    compare: Path = typer.Option(
+        None, "--compare", help="Compare against a previous results file"
+    ),
+    workdir: Path = typer.Option(
+        None, "--workdir", help="Directory for the generated project (kept afterwards)"
+    ),
+    db_url: str = typer.Option(
+        None, "--db-url", help="Target database URL; defaults to a SQLite file in the project"
+    ),
+) -> None:
+    """Generate a project of the given TIER and time the pipeline on it."""
+
+    spec = resolve_spec(tier)
+    selected = [s.strip() for s in stages.split(",") if s.strip()]
+    unknown = set(selected) - {"extract", "transform", "load", "resolve"}
+    if unknown:
+        raise typer.BadParameter(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    tmp = None
+    if workdir is None:
+        tmp = tempfile.mkdtemp(prefix=f"forge-bench-{tier}-")
+        project = Path(tmp)
+    else:
+        project = workdir.resolve()
+        project.mkdir(parents=True, exist_ok=True)
+
+    try:
+        console.print(f"Generating tier {tier} ({spec.total_subprograms} subprograms) in {project}")
+        start = time.perf_counter()
+        generate_project(spec, project, name=f"bench-{tier}", write_config=False)
+        generate_seconds = time.perf_counter() - start
+
+        init = run_stage(project, "init", [])
+        if init["exit_code"] != 0:
+            console.print(f"[red]init failed:[/red]\n{init.get('stderr', '')}")
+            raise typer.Exit(code=1)
+
+        url = db_url or f"sqlite:///{project / 'target.sqlite3'}"
+        results = {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started": _dt.datetime.utcnow().isoformat(),
+            "tier": tier,
+            "spec": spec.to_dict(),
+            "generate_seconds": generate_seconds,
+            "stages": run_benchmark(project, url, selected),
+        }
+        results["total_seconds"] = sum(r["seconds"] for r in results["stages"].values())
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        console.print(f"Results written to {output}")
+    else:
+        console.print_json(json.dumps(results))
+
+    if compare is not None:
+        baseline = json.loads(compare.read_text(encoding="utf-8"))
+        console.print(_compare(results, baseline))
+
+    if any(r["exit_code"] != 0 for r in results["stages"].values()):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":  # pragma: no cover - manual invocation helper
+    app()
@@ -6,61 +6,465 @@ Metadata about processed files is persisted in the project's SQLite database
 and the overall project state is updated to ``EXTRACTED``.
 
 The command accepts an optional ``--max-workers`` argument to control the level
-of parallelism used when parsing files.
+of parallelism used when parsing files.  With ``--file-timeout`` or
+``--file-memory-limit`` files are parsed in supervised worker processes
+instead of threads, and a file exceeding either limit is marked
+``FAILED_EXTRACT`` without holding up the rest of the run.  Large files with
+several top-level program units are split into units that are parsed in
+parallel and independently, so that a syntax error only loses the offending
+unit (recorded in the file's ``error_message``).  When the ``[cache]`` table
+of ``forge.toml`` is enabled, ASTs are looked up in (and added to) the shared
+content-addressed cache so identical files are never parsed twice.
+
+File records are committed in checkpoints while files are being parsed, so
+an interrupted run only has to parse the files it had not finished yet.  With
+``--shard I/N`` only a stable partition of the source files is extracted,
+into a state database and artifact directory of its own (see
+:mod:`forge.core.shards`), so that shards can run on separate hosts.
+
+Unchanged files are recognised by the digest of their raw bytes (see
+:mod:`forge.tasks.parse.fingerprint`); a file is only read as text by the
+worker that parses it.
 """
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 import datetime as _dt
-import fnmatch
-import glob
-import hashlib
+import multiprocessing
+import os
 import pickle
+import shutil
+import time
+from typing import Mapping
 
 import typer
 from rich.console import Console
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from ...config.loader import load_config
+from ...core.cache import AST, ArtifactCache
+from ...core.metrics import MetricsRecorder, recording
+from ...core.shards import Shard, prepare_shard
 from ...core.schema import (
     FileRecord,
     FileStatus,
     ProjectFSMStatus,
-    ProjectState,
 )
-from ...tasks.parse.extract import extract_from_fortran_string
+from ...core.state import (
+    Checkpointer,
+    file_rows,
+    get_project_id,
+    record_run,
+    set_project_status,
+    write_file_records,
+)
+from ...tasks.parse.discover import discover_source_files
+from ...tasks.parse.extract import extract_units_from_fortran_string
+from ...tasks.parse.fingerprint import fingerprint_files
+from ...tasks.parse.pool import SupervisedPool
 
 
 app = typer.Typer(help="Parse source files")
 console = Console()
 
+#: Directory below ``.forge/asts`` holding artifacts shared by identical files.
+SHARED_DIR = "_shared"
+
+#: Number of files a supervised worker process parses before it is replaced.
+TASKS_PER_WORKER = 200
+
+#: Files with at least this many lines are parsed program unit by program unit.
+SPLIT_MIN_LINES = 2000
+
+
+def _read_source(path: Path, encoding: str) -> str:
+    """Decode the source file at *path* with universal newlines."""
+
+    with open(path, encoding=encoding) as f:
+        return f.read()
 
-def _collect_source_files(project_root: Path, config) -> list[Path]:
-    """Return a list of source files based on include/exclude patterns."""
-
-    files: list[Path] = []
-    for src_dir in config.sources.source_dirs:
-        base = project_root / src_dir
-        for pattern in config.sources.include_patterns:
-            glob_pattern = str(base / pattern)
-            for file_name in glob.glob(glob_pattern, recursive=True):
-                candidate = Path(file_name)
-                rel = candidate.relative_to(project_root)
-                # Apply exclusion patterns
-                if any(
-                    fnmatch.fnmatch(str(rel), pat)
-                    for pat in config.sources.exclude_patterns
-                ):
-                    continue
-                files.append(candidate)
-    return files
 
+def _dump_ast(ast, ast_path: Path) -> None:
+    """Pickle *ast* to *ast_path*.
 
-def _hash_text(text: str, encoding: str) -> str:
-    return hashlib.sha256(text.encode(encoding)).hexdigest()
+    The artifact is written to a temporary file and renamed into place, so
+    hard links to the previous artifact (see :func:`_link_or_copy`) are never
+    modified.
+    """
+
+    ast_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = ast_path.with_name(ast_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(ast, f)
+    os.replace(tmp_path, ast_path)
+
+
+def _parse_and_dump(
+    source: Path, encoding: str, ast_path: Path, map_func=map
+) -> tuple[float, float, bool, str | None]:
+    """Parse the file *source* and pickle the AST to *ast_path*.
+
+    Args:
+        source: Fortran source file.
+        encoding: Encoding of *source*.
+        ast_path: Destination of the pickled AST.
+        map_func: ``map``-like callable used to parse the program units of
+            large files.
+
+    Returns:
+        The seconds spent parsing and writing, whether an AST was produced and
+        a note listing the program units that failed to parse, if any.
+    """
+
+    start = time.perf_counter()
+    text = _read_source(source, encoding)
+    ast, failed = extract_units_from_fortran_string(
+        text, map_func=map_func, min_lines=SPLIT_MIN_LINES
+    )
+    parsed = time.perf_counter()
+    _dump_ast(ast, ast_path)
+    note = f"Failed to parse {', '.join(failed)}" if failed else None
+    return parsed - start, time.perf_counter() - parsed, ast is not None, note
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Materialise *src* at *dest*, preferring a hard link over a copy."""
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dest)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+def _release_artifacts(session: Session, project_root: Path, paths: set[str]) -> None:
+    """Delete AST artifacts in *paths* that no file record references anymore.
+
+    Shared artifacts are reference counted through the ``ast_path`` column, so
+    an artifact is only removed once the last record pointing at it has moved
+    on to different content.
+    """
+
+    if not paths:
+        return
+    referenced = {
+        ast_path
+        for (ast_path,) in session.query(FileRecord.ast_path)
+        .filter(FileRecord.ast_path.in_(paths))
+        .distinct()
+    }
+    for path in paths - referenced:
+        (project_root / path).unlink(missing_ok=True)
+
+
+def run_extract(
+    project_root: Path,
+    max_workers: int = 4,
+    file_timeout: float | None = None,
+    file_memory_limit: int | None = None,
+    files: Mapping[Path, float] | None = None,
+    engine: Engine | None = None,
+    shard: Shard | None = None,
+) -> MetricsRecorder:
+    """Parse the source files of the project at *project_root*.
+
+    Args:
+        project_root: Root directory of the Forge project.
+        max_workers: Number of files parsed concurrently.
+        file_timeout: Seconds a single file may take to parse.
+        file_memory_limit: Address space limit of each parser process in MiB.
+        files: Modification times of the files to consider, keyed by absolute
+            path; defaults to all files of the configured source directories.
+        engine: Engine of the state database; created on demand.
+        shard: Only extract the files of this shard, into its own state
+            database and artifact directory.
+
+    Returns:
+        The metrics recorded for the run.
+    """
+
+    with recording("extract") as recorder:
+        config = load_config(project_root)
+        cache = ArtifactCache.from_config(config.cache)
+
+        forge_dir = project_root / ".forge"
+        if shard is not None:
+            forge_dir = prepare_shard(project_root, shard)
+        db_path = forge_dir / "forge.sqlite3"
+        if engine is None:
+            engine = create_engine(f"sqlite:///{db_path}")
+            recorder.instrument_engine(engine, "state")
+
+        # Load existing file records so we can skip unchanged files
+        with Session(engine) as session:
+            project_id = get_project_id(session)
+            existing = {
+                Path(path): row
+                for path, row in file_rows(
+                    session,
+                    project_id,
+                    FileRecord.file_hash,
+                    FileRecord.status,
+                    FileRecord.ast_path,
+                ).items()
+            }
+
+        ast_root = forge_dir / "asts"
+        ast_root.mkdir(parents=True, exist_ok=True)
+
+        if files is None:
+            with recorder.span("extract.discover"):
+                files = discover_source_files(project_root, config.sources)
+        if shard is not None:
+            files = {
+                path: mtime
+                for path, mtime in files.items()
+                if shard.contains(path.relative_to(project_root))
+            }
+
+        encoding = config.parser.encoding
+        with recorder.span("extract.hash"):
+            fingerprints = fingerprint_files(files)
+        recorder.incr("files.unreadable", len(files) - len(fingerprints))
+
+        # Determine which files need processing
+        to_process: list[tuple[Path, Path, str]] = []
+        lines: dict[str, int] = {}
+        skipped = 0
+        mtimes: dict[Path, float] = {}
+        for file_path, (file_hash, line_count) in fingerprints.items():
+            rel = file_path.relative_to(project_root)
+            mtimes[rel] = files[file_path]
+
+            rec = existing.get(rel)
+            if (
+                rec
+                and rec.file_hash == file_hash
+                and rec.status == FileStatus.EXTRACTED
+                and rec.ast_path
+                and (project_root / rec.ast_path).exists()
+            ):
+                skipped += 1
+                continue
+
+            to_process.append((file_path, rel, file_hash))
+            lines[file_hash] = line_count
+
+        # Identical contents are parsed only once.  Files sharing a hash with
+        # another file of this run, or with an already extracted file, point at a
+        # single immutable artifact under ``asts/_shared``.
+        pending = {rel for _path, rel, _hash in to_process}
+        available: dict[str, Path] = {}
+        for rel, rec in existing.items():
+            if (
+                rel not in pending
+                and rec.ast_path
+                and rec.status != FileStatus.FAILED_EXTRACT
+                and (project_root / rec.ast_path).exists()
+            ):
+                available.setdefault(rec.file_hash, project_root / rec.ast_path)
+
+        groups: dict[str, list[tuple[Path, Path]]] = {}
+        for path, rel, file_hash in to_process:
+            groups.setdefault(file_hash, []).append((path, rel))
+
+        shared_root = ast_root / SHARED_DIR
+        jobs: list[tuple[Path, Path, str, Path, Path | None]] = []
+        for file_hash, members in groups.items():
+            path, rel = members[0]
+            reuse = available.get(file_hash)
+            if len(members) == 1 and reuse is None:
+                ast_path = (ast_root / rel).with_suffix(path.suffix + ".ast")
+            else:
+                ast_path = shared_root / f"{file_hash}.ast"
+            jobs.append((rel, path, file_hash, ast_path, reuse))
+
+        def _reuse(file_hash: str, ast_path: Path, reuse: Path | None) -> bool | None:
+            """Materialise an existing artifact; return whether it came from the cache.
+
+            Returns ``None`` if the file has to be parsed.
+            """
+
+            # Shared artifacts are immutable, so an existing one is still valid
+            if ast_path.parent == shared_root and ast_path.exists():
+                return False
+            if reuse is not None:
+                _link_or_copy(reuse, ast_path)
+                return False
+            if cache is not None and cache.fetch(AST, file_hash, ast_path):
+                return True
+            return None
+
+        def _parsed(file_hash: str, ast_path: Path, outcome: tuple) -> str | None:
+            parse_seconds, write_seconds, ok, note = outcome
+            recorder.add_span("extract.parse", parse_seconds)
+            recorder.add_span("extract.write", write_seconds)
+            # Partially parsed files are not cached, so a fixed parser gets
+            # another chance at them
+            if cache is not None and ok and note is None:
+                cache.store(AST, file_hash, ast_path)
+            return note
+
+        def _parse_file(args: tuple[Path, Path, str, Path, Path | None]):
+            rel, path, file_hash, ast_path, reuse = args
+            with recorder.file(rel):
+                try:
+                    cached = _reuse(file_hash, ast_path, reuse)
+                    if cached is not None:
+                        return (file_hash, ast_path, None, cached, None)
+                    outcome = _parse_and_dump(path, encoding, ast_path, unit_map)
+                    return (file_hash, ast_path, None, False, _parsed(file_hash, ast_path, outcome))
+                except Exception as exc:  # pragma: no cover - best effort
+                    return (file_hash, None, str(exc), False, None)
+
+        def _supervised(jobs: list[tuple[Path, Path, str, Path, Path | None]]):
+            """Parse *jobs* in killable worker processes with resource limits."""
+
+            to_parse = {}
+            for rel, _path, file_hash, ast_path, reuse in jobs:
+                try:
+                    cached = _reuse(file_hash, ast_path, reuse)
+                except OSError as exc:  # pragma: no cover - best effort
+                    yield (file_hash, None, str(exc), False, None)
+                    continue
+                if cached is None:
+                    to_parse[file_hash] = (rel, ast_path)
+                else:
+                    yield (file_hash, ast_path, None, cached, None)
+
+            pool = SupervisedPool(
+                _parse_and_dump,
+                workers=max_workers,
+                timeout=file_timeout,
+                memory_limit=file_memory_limit * 1024 * 1024 if file_memory_limit else None,
+                max_tasks_per_worker=TASKS_PER_WORKER,
+            )
+            tasks = (
+                (file_hash, (path, encoding, ast_path))
+                for _rel, path, file_hash, ast_path, _reuse_path in jobs
+                if file_hash in to_parse
+            )
+            for file_hash, outcome, error in pool.imap_unordered(tasks):
+                rel, ast_path = to_parse[file_hash]
+                if error is not None:
+                    # A killed worker may leave a partial artifact behind
+                    ast_path.unlink(missing_ok=True)
+                    ast_path.with_name(ast_path.name + ".tmp").unlink(missing_ok=True)
+                    yield (file_hash, None, error, False, None)
+                    continue
+                recorder.add_file(rel, outcome[0] + outcome[1])
+                yield (file_hash, ast_path, None, False, _parsed(file_hash, ast_path, outcome))
+
+        # Artifacts that jobs of this run write or link to must outlive the
+        # records they supersede until the run is over
+        targets = {str(ast_path.relative_to(project_root)) for *_rest, ast_path, _reuse in jobs}
+
+        def _persist(session: Session, batch: list[tuple]) -> None:
+            """Write a checkpoint of file records and drop superseded artifacts."""
+
+            now = _dt.datetime.utcnow()
+            inserts: list[dict] = []
+            updates: list[dict] = []
+            superseded: set[str] = set()
+            for rel, file_hash, ast_path, error, note in batch:
+                rel_str = str(rel)
+                new_ast_path = str(ast_path.relative_to(project_root)) if ast_path else None
+                values = {
+                    "file_hash": file_hash,
+                    "status": FileStatus.EXTRACTED if error is None else FileStatus.FAILED_EXTRACT,
+                    "ast_path": new_ast_path,
+                    "last_modified": _dt.datetime.utcfromtimestamp(mtimes[rel]),
+                    "error_message": error or note,
+                }
+
+                row = existing.get(rel)
+                if row is None:
+                    inserts.append(
+                        {
+                            **values,
+                            "project_id": project_id,
+                            "source_path": rel_str,
+                            "last_processed": now if error is None else None,
+                        }
+                    )
+                else:
+                    if row.ast_path and row.ast_path != new_ast_path:
+                        superseded.add(row.ast_path)
+                    if error is None:
+                        values["last_processed"] = now
+                    updates.append({"id": row.id, **values})
+            write_file_records(session, inserts, updates)
+            _release_artifacts(session, project_root, superseded - targets)
+
+        processed = failed = partial = cache_hits = 0
+        unit_map = map
+        with Checkpointer(engine, _persist, span="extract.persist") as checkpoint:
+            if jobs:
+                executors = []
+                if file_timeout is not None or file_memory_limit is not None:
+                    # Supervised workers cannot fork further processes, so they
+                    # parse the units of a large file one after another
+                    outcomes = _supervised(jobs)
+                else:
+                    unit_workers = min(max_workers, os.cpu_count() or 1)
+                    if unit_workers > 1 and any(
+                        lines[file_hash] >= SPLIT_MIN_LINES for _r, _p, file_hash, *_rest in jobs
+                    ):
+                        # Parsing is CPU bound, so the units of large files are
+                        # parsed in processes rather than in the parser threads
+                        executors.append(
+                            ProcessPoolExecutor(
+                                max_workers=unit_workers,
+                                # Forking the threaded parent process is unsafe
+                                mp_context=multiprocessing.get_context("spawn"),
+                            )
+                        )
+                        unit_map = executors[-1].map
+                    executors.append(ThreadPoolExecutor(max_workers=max_workers))
+                    futures = [executors[-1].submit(_parse_file, job) for job in jobs]
+                    outcomes = (future.result() for future in as_completed(futures))
+                try:
+                    # Results are checkpointed in completion order, so an
+                    # interrupted run keeps every file it finished
+                    for file_hash, ast_path, error, cached, note in outcomes:
+                        for _path, rel in groups[file_hash]:
+                            checkpoint.add((rel, file_hash, ast_path, error, note))
+                            processed += 1
+                            failed += error is not None
+                            partial += note is not None
+                        cache_hits += cached
+                finally:
+                    for executor in reversed(executors):
+                        executor.shutdown(cancel_futures=True)
+
+        if cache is not None:
+            with recorder.span("extract.cache_prune"):
+                cache.prune()
+        recorder.incr("files.skipped", skipped)
+        recorder.incr("files.cache_hits", cache_hits)
+        recorder.incr("files.failed", failed)
+        recorder.incr("files.partial", partial)
+        recorder.incr("state.checkpoints", checkpoint.checkpoints)
+
+        if processed and not failed:
+            with Session(engine) as session:
+                set_project_status(session, project_id, ProjectFSMStatus.EXTRACTED)
+                session.commit()
+
+        console.print(
+            f"[green]Processed {processed} files (skipped {skipped}, "
+            f"{cache_hits} from cache).[/green]"
+        )
+
+    recorder.write(forge_dir)
+    record_run(engine, recorder, files=processed)
+    return recorder
 
 
 @app.callback(invoke_without_command=True)
@@ -70,123 +474,45 @@ def extract(
         min=1,
         help="Maximum number of worker threads used for parsing",
         show_default=True,
-    )
+    ),
+    file_timeout: float = typer.Option(
+        None,
+        "--file-timeout",
+        min=0.1,
+        help="Seconds a single file may take to parse before it is abandoned",
+        show_default=False,
+    ),
+    file_memory_limit: int = typer.Option(
+        None,
+        "--file-memory-limit",
+        min=64,
+        help="Address space limit in MiB of each parser worker process",
+        show_default=False,
+    ),
+    shard: Shard = typer.Option(
+        None,
+        "--shard",
+        parser=Shard.parse,
+        metavar="I/N",
+        help="Only extract shard I of N of the source files, e.g. 2/8",
+        show_default=False,
+    ),
+    show_metrics: bool = typer.Option(
+        False, "--metrics", help="Print a timing and throughput summary"
+    ),
 ) -> None:
     """Parse Fortran source files and persist their ASTs."""
 
-    project_root = Path.cwd()
-    config = load_config(project_root)
-
-    forge_dir = project_root / ".forge"
-    db_path = forge_dir / "forge.sqlite3"
-    engine = create_engine(f"sqlite:///{db_path}")
-
-    # Load existing file records so we can skip unchanged files
-    with Session(engine) as session:
-        project_state = session.query(ProjectState).one()
-        existing = {
-            Path(rec.source_path): rec
-            for rec in session.query(FileRecord)
-            .filter_by(project_id=project_state.id)
-            .all()
-        }
-
-    ast_root = forge_dir / "asts"
-    ast_root.mkdir(parents=True, exist_ok=True)
-
-    source_files = _collect_source_files(project_root, config)
-
-    # Determine which files need processing
-    to_process: list[tuple[Path, Path, str, str]] = []
-    skipped = 0
-    for file_path in source_files:
-        rel = file_path.relative_to(project_root)
-        text = file_path.read_text(encoding=config.parser.encoding)
-        file_hash = _hash_text(text, config.parser.encoding)
-
-        rec = existing.get(rel)
-        ast_file = ast_root / rel
-        ast_file = ast_file.with_suffix(file_path.suffix + ".ast")
-        if (
-            rec
-            and rec.file_hash == file_hash
-            and rec.status == FileStatus.EXTRACTED
-            and ast_file.exists()
-        ):
-            skipped += 1
-            continue
-
-        to_process.append((file_path, rel, text, file_hash))
-
-    def _parse_file(args: tuple[Path, Path, str, str]):
-        path, rel, text, file_hash = args
-        try:
-            ast = extract_from_fortran_string(text)
-            ast_path = ast_root / rel
-            ast_path = ast_path.with_suffix(path.suffix + ".ast")
-            ast_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(ast_path, "wb") as f:
-                pickle.dump(ast, f)
-
-            return (rel, file_hash, ast_path, None)
-        except Exception as exc:  # pragma: no cover - best effort
-            return (rel, file_hash, None, str(exc))
-
-    results: list[tuple[Path, str, Path | None, str | None]] = []
-    if to_process:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for res in executor.map(_parse_file, to_process):
-                results.append(res)
-
-    # Persist results to the database
-    with Session(engine) as session:
-        project_state = session.query(ProjectState).one()
-
-        for rel, file_hash, ast_path, error in results:
-            rel_str = str(rel)
-            last_modified = _dt.datetime.utcfromtimestamp(
-                (project_root / rel).stat().st_mtime
-            )
-
-            record = (
-                session.query(FileRecord)
-                .filter_by(project_id=project_state.id, source_path=rel_str)
-                .one_or_none()
-            )
-
-            status = FileStatus.EXTRACTED if error is None else FileStatus.FAILED_EXTRACT
-
-            if record is None:
-                record = FileRecord(
-                    project_id=project_state.id,
-                    source_path=rel_str,
-                    file_hash=file_hash,
-                    status=status,
-                    ast_path=str(ast_path.relative_to(project_root)) if ast_path else None,
-                    last_modified=last_modified,
-                    last_processed=_dt.datetime.utcnow() if error is None else None,
-                    error_message=error,
-                )
-                session.add(record)
-            else:
-                record.file_hash = file_hash
-                record.status = status
-                record.ast_path = (
-                    str(ast_path.relative_to(project_root)) if ast_path else None
-                )
-                record.last_modified = last_modified
-                record.last_processed = _dt.datetime.utcnow() if error is None else record.last_processed
-                record.error_message = error
-
-        if results and all(err is None for *_rest, err in results):
-            project_state.fsm_status = ProjectFSMStatus.EXTRACTED
-
-        session.commit()
-
-    console.print(
-        f"[green]Processed {len(results)} files (skipped {skipped}).[/green]"
+    recorder = run_extract(
+        Path.cwd(),
+        max_workers=max_workers,
+        file_timeout=file_timeout,
+        file_memory_limit=file_memory_limit,
+        shard=shard,
     )
+    if show_metrics:
+        console.print(recorder.summary_table())
 
 
-__all__ = ["app"]
+__all__ = ["app", "run_extract"]
 
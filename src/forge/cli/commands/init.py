@@ -43,6 +43,11 @@ exclude_patterns = []
 
 [parser]
 encoding = "utf-8"
+
+[cache]
+enabled = false
+directory = "~/.cache/forge"
+max_size_mb = 2048
 """
 
     config_path.write_text(template)
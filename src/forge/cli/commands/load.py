@@ -17,30 +17,54 @@ work required for the tests:
 
 The command operates on all files marked as ``TRANSFORMED`` and is idempotent –
 re-running the command will skip modules that already exist in the target
-database.
+database.  Files are loaded in the topological waves of the module dependency
+graph recorded by ``forge transform``, so a module is in the database before
+the files that use it and their uses are linked to it as they are inserted.
+Uses that could not be linked that way (dependency cycles across files, or
+modules loaded by a later run) are linked in a final pass.
+
+SQLite admits a single writer at a time, so with ``--workers N`` an SQLite
+target is loaded by *N* processes, each into a temporary database of its own
+holding a disjoint part of the files.  The temporary databases are merged into
+the target with ``ATTACH`` and ``INSERT ... SELECT``, shifting their keys past
+those already in the target (see :mod:`forge.tasks.parse.load.shards`).
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import datetime as _dt
-import json
+import multiprocessing
+import tempfile
+import time
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
 
 import typer
-from pydantic import BaseModel, Field
 from rich.console import Console
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from fpyevolve_core.db.schema import fortrans as ft_schema
 from fpyevolve_core.keys.fortran import ModuleKey, SubprogramKey
 
+from ...core.metrics import MetricsRecorder, current, recording
 from ...core.models.semantics import ModuleSemantics, SubprogramSemantics
 from ...core.schema import (
+    Base,
     FileRecord,
     FileStatus,
     ProjectFSMStatus,
-    ProjectState,
+)
+from ...core.state import (
+    file_waves,
+    get_project_id,
+    iter_file_records,
+    record_run,
+    set_project_status,
+    write_file_records,
 )
 from ...tasks.parse.load.load import (
     load_calls_from_subprogram,
@@ -55,25 +79,99 @@ from ...tasks.parse.load.load import (
     load_symbol_table_from_module,
     load_symbol_table_from_subprogram,
     load_uses,
+    relink_uses,
 )
+from ...tasks.parse.load.reader import iter_file_semantics
+from ...tasks.parse.load.shards import merge_database
 
+#: Number of module or subprogram entries validated and inserted together.
+LOAD_BATCH_SIZE = 256
 
-class FileSemantics(BaseModel):
-    """Semantic information extracted from a single source file."""
 
-    modules: dict[str, ModuleSemantics] = Field(
-        default_factory=dict,
-        description="Mapping of module names to their semantics.",
-    )
+app = typer.Typer(help="Load JSON semantics into a database")
+console = Console()
 
-    subprograms: dict[str, SubprogramSemantics] = Field(
-        default_factory=dict,
-        description="Mapping of subprogram names to their semantics.",
-    )
 
+def run_load(
+    project_root: Path,
+    db_url: str | None = None,
+    state_engine: Engine | None = None,
+    target_engine: Engine | None = None,
+    workers: int = 1,
+) -> MetricsRecorder:
+    """Load all transformed files of the project at *project_root*.
+
+    Args:
+        project_root: Root directory of the Forge project.
+        db_url: URL of the target database; ignored if *target_engine* is
+            given.
+        state_engine: Engine of the state database; created on demand.
+        target_engine: Engine of the target database; created from *db_url*
+            on demand.
+        workers: Number of processes loading files concurrently, each into a
+            database of its own that is merged into the target afterwards;
+            only supported for SQLite targets.
+
+    Returns:
+        The metrics recorded for the run.
+
+    Raises:
+        ValueError: If *workers* is larger than one and the target is not an
+            SQLite database.
+    """
+
+    with recording("load") as recorder:
+        forge_dir = project_root / ".forge"
+        db_path = forge_dir / "forge.sqlite3"
+        if state_engine is None:
+            state_engine = create_engine(f"sqlite:///{db_path}")
+            recorder.instrument_engine(state_engine, "state")
+        if target_engine is None:
+            target_engine = create_engine(db_url)
+            recorder.instrument_engine(target_engine, "target")
+        if workers > 1 and target_engine.dialect.name != "sqlite":
+            raise ValueError("parallel loading is only supported for SQLite targets")
+        Base.metadata.create_all(state_engine)
+        ft_schema.Base.metadata.create_all(target_engine)
+
+        with Session(state_engine) as state_sess, Session(target_engine) as tgt_sess:
+            project_id = get_project_id(state_sess)
+            by_id = {
+                rec.id: rec
+                for rec in iter_file_records(
+                    state_sess, project_id, FileRecord.json_path, status=FileStatus.TRANSFORMED
+                )
+            }
+            with recorder.span("load.schedule"):
+                waves = file_waves(state_sess, by_id)
+            recorder.incr("load.waves", len(waves))
+
+            files = [
+                (file_id, by_id[file_id].source_path, by_id[file_id].json_path)
+                for wave in waves
+                for file_id in wave
+            ]
+            if workers > 1 and len(files) > 1:
+                updates = _load_parallel(project_root, forge_dir, target_engine, files, workers)
+            else:
+                updates = _load_files(tgt_sess, project_root, files)
+
+            if by_id:
+                with recorder.span("load.relink_uses"):
+                    recorder.incr("rows.relinked_uses", relink_uses(tgt_sess))
+                    tgt_sess.commit()
 
-app = typer.Typer(help="Load JSON semantics into a database")
-console = Console()
+            write_file_records(state_sess, updates=updates)
+            if by_id and all(u["status"] == FileStatus.LOADED for u in updates):
+                set_project_status(state_sess, project_id, ProjectFSMStatus.LOADED)
+
+            state_sess.commit()
+
+        console.print(f"[green]Processed {len(by_id)} files.[/green]")
+
+    recorder.write(forge_dir)
+    record_run(state_engine, recorder, files=len(by_id))
+    return recorder
 
 
 @app.callback(invoke_without_command=True)
@@ -81,94 +179,218 @@ def load(
     db_url: str = typer.Option(
         ..., "--db-url", help="Target database URL", show_default=False
     ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        min=1,
+        help="Load an SQLite target with this many processes, each into a "
+        "database of its own that is merged into the target",
+    ),
+    show_metrics: bool = typer.Option(
+        False, "--metrics", help="Print a timing and throughput summary"
+    ),
 ) -> None:
     """Load transformed JSON semantics into a relational database."""
 
-    project_root = Path.cwd()
-    forge_dir = project_root / ".forge"
-    db_path = forge_dir / "forge.sqlite3"
-    state_engine = create_engine(f"sqlite:///{db_path}")
-    target_engine = create_engine(db_url)
-    ft_schema.Base.metadata.create_all(target_engine)
-
-    with Session(state_engine) as state_sess, Session(target_engine) as tgt_sess:
-        project_state = state_sess.query(ProjectState).one()
-        records = (
-            state_sess.query(FileRecord)
-            .filter_by(project_id=project_state.id, status=FileStatus.TRANSFORMED)
-            .all()
-        )
-
-        for rec in records:
-            json_path = project_root / rec.json_path
-            try:
-                data = json.loads(json_path.read_text())
-                semantics = FileSemantics.model_validate(data)
-
-                # -------------------------------------------------- Modules
-                module_names = list(semantics.modules.keys())
-                existing = set(_existing_module_names(tgt_sess, module_names))
-                new_modules = [ModuleKey(module_name=m) for m in module_names if m not in existing]
-                if new_modules:
-                    load_modules(tgt_sess, new_modules)
-                    tgt_sess.commit()
-
-                for mod_name, mod_sem in semantics.modules.items():
-                    mk = ModuleKey(module_name=mod_name)
-                    load_symbol_table_from_module(tgt_sess, [mk], [mod_sem.symbol_table])
-                    load_derived_types_from_module(tgt_sess, [mk], [mod_sem.derived_types])
-                    load_symbol_references_from_module(tgt_sess, [mk], [mod_sem.references])
-                    load_uses(tgt_sess, [mk], [mod_sem.used_modules])
-                tgt_sess.commit()
-
-                # ------------------------------------------------ Subprograms
-                sp_keys: list[SubprogramKey] = []
-                sp_sems: list[SubprogramSemantics] = []
-                for sp_fullname, sp_sem in semantics.subprograms.items():
-                    if "::" in sp_fullname:
-                        mod_name, sp_name = sp_fullname.split("::", 1)
-                    else:  # pragma: no cover - no such case in tests
-                        mod_name, sp_name = "", sp_fullname
-                    sp_type = "function" if sp_sem.signature and sp_sem.signature.output else "subroutine"
-                    sp_keys.append(
-                        SubprogramKey(
-                            module_name=mod_name,
-                            subprogram_type=sp_type,
-                            subprogram_name=sp_name,
-                        )
+    try:
+        recorder = run_load(Path.cwd(), db_url, workers=workers)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--workers")
+    if show_metrics:
+        console.print(recorder.summary_table())
+
+
+def _load_files(
+    session: Session, project_root: Path, files: list[tuple[int, str, str]]
+) -> list[dict]:
+    """Load the JSON semantics of *files* into the database of *session*.
+
+    Args:
+        session: Session bound to the target database.
+        project_root: Root directory of the Forge project.
+        files: ``(id, source_path, json_path)`` of the file records to load.
+
+    Returns:
+        The updates of the file records.
+    """
+
+    recorder = current()
+    updates: list[dict] = []
+    for file_id, source_path, json_path in files:
+        try:
+            file_start = time.perf_counter()
+            with open(project_root / json_path, encoding="utf-8") as f:
+                for section, entries in groupby(iter_file_semantics(f), key=itemgetter(0)):
+                    while batch := list(islice(entries, LOAD_BATCH_SIZE)):
+                        if section == "modules":
+                            _load_module_batch(session, batch)
+                        else:
+                            _load_subprogram_batch(session, batch)
+
+            recorder.add_file(source_path, time.perf_counter() - file_start)
+            updates.append(
+                {
+                    "id": file_id,
+                    "status": FileStatus.LOADED,
+                    "last_processed": _dt.datetime.utcnow(),
+                    "error_message": None,
+                }
+            )
+
+        except Exception as exc:  # pragma: no cover - best effort
+            session.rollback()
+            updates.append(
+                {"id": file_id, "status": FileStatus.FAILED_LOAD, "error_message": str(exc)}
+            )
+            recorder.incr("files.failed")
+    return updates
+
+
+def _load_partition(
+    project_root: Path, db_path: Path, files: list[tuple[int, str, str]]
+) -> tuple[Path, list[dict], dict[str, float], dict[str, int]]:
+    """Load *files* into a new SQLite database at *db_path*.
+
+    Runs in a worker process of :func:`_load_parallel`.
+
+    Returns:
+        *db_path*, the updates of the file records and the per-file timings
+        and counters of the worker.
+    """
+
+    with recording("load") as recorder:
+        engine = create_engine(f"sqlite:///{db_path}")
+        try:
+            ft_schema.Base.metadata.create_all(engine)
+            with Session(engine) as session:
+                updates = _load_files(session, project_root, files)
+        finally:
+            engine.dispose()
+    return db_path, updates, recorder.files, recorder.counters
+
+
+def _partition(
+    project_root: Path, files: list[tuple[int, str, str]], parts: int
+) -> list[list[tuple[int, str, str]]]:
+    """Split *files* into *parts* lists of about the same JSON size.
+
+    Files keep their relative order, so each part is still loaded in the
+    order of the module dependency graph.
+    """
+
+    def _size(json_path: str) -> int:
+        try:
+            return (project_root / json_path).stat().st_size
+        except OSError:
+            return 0
+
+    sizes = [_size(json_path) for _id, _source, json_path in files]
+    partitions: list[list[int]] = [[] for _ in range(parts)]
+    loads = [0] * parts
+    # Largest first onto the least loaded part, then restore the file order
+    for i in sorted(range(len(files)), key=sizes.__getitem__, reverse=True):
+        part = loads.index(min(loads))
+        partitions[part].append(i)
+        loads[part] += sizes[i]
+    return [[files[i] for i in sorted(part)] for part in partitions if part]
+
+
+def _load_parallel(
+    project_root: Path,
+    forge_dir: Path,
+    target_engine: Engine,
+    files: list[tuple[int, str, str]],
+    workers: int,
+) -> list[dict]:
+    """Load *files* with *workers* processes and merge their databases into the target.
+
+    Each worker loads a disjoint part of the files into an SQLite database of
+    its own, so the workers never contend for the single writer lock of
+    SQLite.  The databases are merged into the target as the workers finish;
+    uses of modules loaded by other workers are linked by the final
+    :func:`relink_uses` pass of :func:`run_load`.
+    """
+
+    recorder = current()
+    updates: list[dict] = []
+    natural_keys = {ft_schema.FortranModule.__tablename__: ("name",)}
+    with tempfile.TemporaryDirectory(prefix="load-", dir=forge_dir) as tmp:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            # Forking a process holding database connections is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(_load_partition, project_root, Path(tmp) / f"{i}.sqlite3", part)
+                for i, part in enumerate(_partition(project_root, files, workers))
+            ]
+            for future in as_completed(futures):
+                db_path, part_updates, timings, counters = future.result()
+                for path, seconds in timings.items():
+                    recorder.add_file(path, seconds)
+                for name, value in counters.items():
+                    recorder.incr(name, value)
+                with recorder.span("load.merge"):
+                    merge_database(
+                        target_engine, db_path, ft_schema.Base.metadata, natural_keys
                     )
-                    sp_sems.append(sp_sem)
-
-                if sp_keys:
-                    load_subprograms(tgt_sess, sp_keys)
-                    tgt_sess.commit()
-
-                    for sp_key, sp_sem in zip(sp_keys, sp_sems):
-                        load_symbol_table_from_subprogram(tgt_sess, [sp_key], [sp_sem.symbol_table])
-                        load_derived_types_from_subprogram(tgt_sess, [sp_key], [sp_sem.derived_types])
-                        load_symbol_references_from_subprogram(tgt_sess, [sp_key], [sp_sem.references])
-                        load_calls_from_subprogram(tgt_sess, [sp_key], [sp_sem.calls])
-                        load_ios_from_subprogram(tgt_sess, [sp_key], [sp_sem.ios])
-                        load_uses(tgt_sess, [sp_key], [sp_sem.used_modules])
-                        load_signatures_from_subprogram(tgt_sess, [sp_key], [sp_sem.signature])
-                    tgt_sess.commit()
-
-                # -------------------------------------------------- State DB
-                rec.status = FileStatus.LOADED
-                rec.last_processed = _dt.datetime.utcnow()
-                rec.error_message = None
-
-            except Exception as exc:  # pragma: no cover - best effort
-                tgt_sess.rollback()
-                rec.status = FileStatus.FAILED_LOAD
-                rec.error_message = str(exc)
-
-        if records and all(r.status == FileStatus.LOADED for r in records):
-            project_state.fsm_status = ProjectFSMStatus.LOADED
+                db_path.unlink()
+                updates.extend(part_updates)
+    return updates
+
+
+def _load_module_batch(session: Session, batch: list[tuple[str, str, dict]]) -> None:
+    """Validate and insert a batch of module entries together with their tables."""
+
+    names = [name for _section, name, _entry in batch]
+    sems = [ModuleSemantics.model_validate(entry) for _section, _name, entry in batch]
+
+    existing = set(_existing_module_names(session, names))
+    new_modules = [ModuleKey(module_name=m) for m in names if m not in existing]
+    if new_modules:
+        load_modules(session, new_modules)
+        session.commit()
+
+    keys = [ModuleKey(module_name=m) for m in names]
+    load_symbol_table_from_module(session, keys, [s.symbol_table for s in sems])
+    load_derived_types_from_module(session, keys, [s.derived_types for s in sems])
+    load_symbol_references_from_module(session, keys, [s.references for s in sems])
+    load_uses(session, keys, [s.used_modules for s in sems])
+    session.commit()
+
+
+def _load_subprogram_batch(session: Session, batch: list[tuple[str, str, dict]]) -> None:
+    """Validate and insert a batch of subprogram entries together with their tables."""
+
+    keys: list[SubprogramKey] = []
+    sems: list[SubprogramSemantics] = []
+    for _section, fullname, entry in batch:
+        sem = SubprogramSemantics.model_validate(entry)
+        if "::" in fullname:
+            mod_name, sp_name = fullname.split("::", 1)
+        else:  # External subprogram
+            mod_name, sp_name = "", fullname
+        sp_type = "function" if sem.signature and sem.signature.output else "subroutine"
+        keys.append(
+            SubprogramKey(
+                module_name=mod_name,
+                subprogram_type=sp_type,
+                subprogram_name=sp_name,
+            )
+        )
+        sems.append(sem)
 
-        state_sess.commit()
+    load_subprograms(session, keys)
+    session.commit()
 
-    console.print(f"[green]Processed {len(records)} files.[/green]")
+    load_symbol_table_from_subprogram(session, keys, [s.symbol_table for s in sems])
+    load_derived_types_from_subprogram(session, keys, [s.derived_types for s in sems])
+    load_symbol_references_from_subprogram(session, keys, [s.references for s in sems])
+    load_calls_from_subprogram(session, keys, [s.calls for s in sems])
+    load_ios_from_subprogram(session, keys, [s.ios for s in sems])
+    load_uses(session, keys, [s.used_modules for s in sems])
+    load_signatures_from_subprogram(session, keys, [s.signature for s in sems])
+    session.commit()
 
 
 def _existing_module_names(session: Session, names: list[str]) -> list[str]:
@@ -185,5 +407,5 @@ def _existing_module_names(session: Session, names: list[str]) -> list[str]:
 
 
 # expose helper for internal use in callback
-__all__ = ["app"]
+__all__ = ["app", "run_load"]
 
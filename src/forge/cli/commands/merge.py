@@ -0,0 +1,120 @@
+"""Implementation of the ``forge merge`` command.
+
+The command folds the state databases and artifacts written by
+``forge extract --shard`` and ``forge transform --shard`` into the main
+``.forge`` directory, so that ``forge load`` and ``forge resolve`` see the
+whole project.  Rows are copied with bulk ``INSERT ... SELECT`` statements
+on the attached shard databases and artifacts are hard-linked, so merging
+takes seconds and nothing is processed again; see :mod:`forge.core.merge`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+
+import typer
+from rich.console import Console
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ...core.merge import merge_shard, merged_status
+from ...core.metrics import MetricsRecorder, recording
+from ...core.schema import Base
+from ...core.shards import SHARDS_DIR, STATE_DB
+from ...core.state import get_project_id, record_run, set_project_status
+
+app = typer.Typer(help="Merge shard state into the project")
+console = Console()
+
+
+def run_merge(
+    project_root: Path,
+    shard_dirs: list[Path] | None = None,
+    keep_shards: bool = False,
+    engine: Engine | None = None,
+) -> MetricsRecorder:
+    """Merge shard directories into the main state of *project_root*.
+
+    Args:
+        project_root: Root directory of the Forge project.
+        shard_dirs: Shard directories to merge; defaults to all shards below
+            ``.forge/shards``.
+        keep_shards: Keep the shard directories after merging them.
+        engine: Engine of the main state database; created on demand.
+
+    Returns:
+        The metrics recorded for the run.
+    """
+
+    forge_dir = project_root / ".forge"
+    if shard_dirs is None:
+        shard_dirs = sorted(p.parent for p in (forge_dir / SHARDS_DIR).glob(f"*/{STATE_DB}"))
+
+    with recording("merge") as recorder:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{forge_dir / STATE_DB}")
+            recorder.instrument_engine(engine, "state")
+        Base.metadata.create_all(engine)
+
+        statuses = []
+        files = 0
+        for shard_dir in shard_dirs:
+            with recorder.span("merge.shard"):
+                result = merge_shard(engine, project_root, shard_dir)
+            statuses.append(result.status)
+            files += result.files
+            console.print(
+                f"{shard_dir.name}: merged {result.files} files"
+                + (f", kept {result.kept} newer" if result.kept else "")
+            )
+            if not keep_shards:
+                shutil.rmtree(shard_dir)
+
+        status = merged_status(statuses)
+        if status is not None:
+            with Session(engine) as session:
+                set_project_status(session, get_project_id(session), status)
+                session.commit()
+
+        console.print(f"[green]Merged {files} files from {len(shard_dirs)} shards.[/green]")
+
+    recorder.write(forge_dir)
+    record_run(engine, recorder, files=files)
+    return recorder
+
+
+@app.callback(invoke_without_command=True)
+def merge(
+    shard_dirs: list[Path] = typer.Argument(
+        None,
+        exists=True,
+        file_okay=False,
+        help="Shard directories to merge; defaults to all of .forge/shards",
+        show_default=False,
+    ),
+    keep_shards: bool = typer.Option(
+        False, "--keep-shards", help="Keep the shard directories after merging"
+    ),
+    show_metrics: bool = typer.Option(
+        False, "--metrics", help="Print a timing and throughput summary"
+    ),
+) -> None:
+    """Merge the state and artifacts of shards into the project."""
+
+    project_root = Path.cwd()
+    if not (project_root / ".forge" / STATE_DB).exists():
+        console.print("[red]No Forge project found; run 'forge init' first.[/red]")
+        raise typer.Exit(code=1)
+
+    try:
+        recorder = run_merge(project_root, shard_dirs or None, keep_shards=keep_shards)
+    except FileNotFoundError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1)
+    if show_metrics:
+        console.print(recorder.summary_table())
+
+
+__all__ = ["app", "run_merge"]
@@ -6,16 +6,33 @@ This command performs the final post-processing step of the Forge pipeline.
 It operates directly on the semantic target database produced by the ``load``
 command and runs a number of resolution tasks.  Once complete the local project
 state is advanced to ``RESOLVED``.
+
+Before the tasks run, the indexes their lookups need are created where the
+target lacks them (see :mod:`forge.tasks.resolve.indexes`); ``--drop-indexes``
+removes the indexes created by the run again afterwards and ``--explain``
+prints the SQLite query plans of the lookups before and after the indexes
+were created.
+
+With ``--in-memory`` an SQLite target is copied into memory with the SQLite
+backup API and resolved there; the result is written back to the target with
+the backup API in one pass.
 """
 
 from pathlib import Path
+from typing import Collection
 
 import typer
 from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session
 
-from ...core.schema import ProjectState, ProjectFSMStatus
+from ...core.metrics import MetricsRecorder, recording
+from ...core.schema import ProjectFSMStatus
+from ...core.snapshot import copy_database, memory_snapshot
+from ...core.state import get_project_id, record_run, set_project_status
 from ...tasks.resolve import (
     AddResultVarTask,
     CalleeNameParseTask,
@@ -23,45 +40,179 @@ from ...tasks.resolve import (
     PartRefUpdateTask,
     SymbolReferenceUpdateTask,
 )
+from ...tasks.resolve.indexes import (
+    create_resolve_indexes,
+    drop_resolve_indexes,
+    explain_resolve_lookups,
+)
 
 app = typer.Typer(help="Resolve symbols")
 console = Console()
 
 
+def _plans_table(before: dict[str, str], after: dict[str, str]) -> Table:
+    table = Table(title="Query plans of the resolve lookups")
+    table.add_column("Index")
+    table.add_column("Before")
+    table.add_column("After")
+    for name, plan in before.items():
+        changed = plan != after[name]
+        table.add_row(
+            name,
+            escape(plan),
+            escape(after[name]),
+            style=None if changed else "dim",
+        )
+    return table
+
+
+def run_resolve(
+    project_root: Path,
+    db_url: str | None = None,
+    modules: Collection[str] | None = None,
+    state_engine: Engine | None = None,
+    target_engine: Engine | None = None,
+    in_memory: bool = False,
+    drop_indexes: bool = False,
+    explain: bool = False,
+) -> MetricsRecorder:
+    """Run all resolution tasks against the target database.
+
+    Args:
+        project_root: Root directory of the Forge project.
+        db_url: URL of the target database; ignored if *target_engine* is
+            given.
+        modules: Only resolve what is hosted in these modules; everything if
+            ``None``.
+        state_engine: Engine of the state database; created on demand.
+        target_engine: Engine of the target database; created from *db_url*
+            on demand.
+        in_memory: Resolve against an in-memory copy of the target and
+            write the copy back afterwards; only supported for SQLite
+            targets.
+        drop_indexes: Drop the indexes created for the resolution tasks
+            once they are done.
+        explain: Print the query plans of the resolve lookups before and
+            after the indexes were created; only supported for SQLite
+            targets.
+
+    Returns:
+        The metrics recorded for the run.
+
+    Raises:
+        ValueError: If *in_memory* is set and the target is not an SQLite
+            database.
+    """
+
+    with recording("resolve") as recorder:
+        forge_dir = project_root / ".forge"
+        state_db = forge_dir / "forge.sqlite3"
+
+        if state_engine is None:
+            state_engine = create_engine(f"sqlite:///{state_db}")
+            recorder.instrument_engine(state_engine, "state")
+        if target_engine is None:
+            target_engine = create_engine(db_url)
+            recorder.instrument_engine(target_engine, "target")
+
+        engine = target_engine
+        if in_memory:
+            with recorder.span("resolve.snapshot"):
+                engine = memory_snapshot(target_engine)
+            recorder.instrument_engine(engine, "memory")
+
+        plans = explain_resolve_lookups(engine) if explain else {}
+        with recorder.span("resolve.indexes"):
+            indexes = create_resolve_indexes(engine)
+        recorder.incr("resolve.indexes_created", len(indexes))
+        if plans:
+            console.print(_plans_table(plans, explain_resolve_lookups(engine)))
+        elif explain:
+            console.print("[yellow]Query plans are only reported for SQLite targets.[/yellow]")
+
+        # Run the individual resolution tasks sequentially on the target DB
+        with Session(engine) as session:
+            tasks = [
+                AddResultVarTask(session, modules),
+                SymbolReferenceUpdateTask(session, modules),
+                PartRefUpdateTask(session, modules),
+                CalleeNameParseTask(session, modules),
+                CallReferenceUpdateTask(session, modules),
+            ]
+            for task in tasks:
+                with recorder.span(f"resolve.{type(task).__name__}"):
+                    task.execute()
+
+        if drop_indexes and indexes:
+            with recorder.span("resolve.drop_indexes"):
+                drop_resolve_indexes(engine, indexes)
+        if in_memory:
+            with recorder.span("resolve.write_back"):
+                copy_database(engine, target_engine)
+            engine.dispose()
+
+        # Update the local project state to reflect completion
+        with Session(state_engine) as session:
+            set_project_status(session, get_project_id(session), ProjectFSMStatus.RESOLVED)
+            session.commit()
+
+        if modules is None:
+            console.print("[green]Resolution completed.[/green]")
+        else:
+            console.print(f"[green]Resolution of {len(modules)} modules completed.[/green]")
+
+    recorder.write(forge_dir)
+    record_run(state_engine, recorder)
+    return recorder
+
+
 @app.callback(invoke_without_command=True)
 def resolve(
     db_url: str = typer.Option(
         ..., "--db-url", help="Target database URL", show_default=False
     ),
+    modules: list[str] = typer.Option(
+        None,
+        "--module",
+        help="Only resolve references hosted in this module; may be repeated",
+        show_default=False,
+    ),
+    in_memory: bool = typer.Option(
+        False,
+        "--in-memory",
+        help="Resolve against an in-memory copy of an SQLite target and write it back",
+    ),
+    drop_indexes: bool = typer.Option(
+        False,
+        "--drop-indexes",
+        help="Drop the indexes created for the resolution tasks afterwards",
+    ),
+    explain: bool = typer.Option(
+        False,
+        "--explain",
+        help="Print the query plans of the resolve lookups before and after indexing",
+    ),
+    show_metrics: bool = typer.Option(
+        False, "--metrics", help="Print a timing and throughput summary"
+    ),
 ) -> None:
     """Run all resolution tasks against the target database."""
 
-    project_root = Path.cwd()
-    forge_dir = project_root / ".forge"
-    state_db = forge_dir / "forge.sqlite3"
-
-    state_engine = create_engine(f"sqlite:///{state_db}")
-    target_engine = create_engine(db_url)
-
-    # Run the individual resolution tasks sequentially on the target DB
-    with Session(target_engine) as session:
-        tasks = [
-            AddResultVarTask(session),
-            SymbolReferenceUpdateTask(session),
-            PartRefUpdateTask(session),
-            CalleeNameParseTask(session),
-            CallReferenceUpdateTask(session),
-        ]
-        for task in tasks:
-            task.execute()
-
-    # Update the local project state to reflect completion
-    with Session(state_engine) as session:
-        project_state = session.query(ProjectState).one()
-        project_state.fsm_status = ProjectFSMStatus.RESOLVED
-        session.commit()
-
-    console.print("[green]Resolution completed.[/green]")
+    url = make_url(db_url)
+    if in_memory and url.get_backend_name() != "sqlite":
+        raise typer.BadParameter(
+            f"{url.render_as_string()} is not an SQLite database", param_hint="--in-memory"
+        )
+    recorder = run_resolve(
+        Path.cwd(),
+        db_url,
+        modules=modules or None,
+        in_memory=in_memory,
+        drop_indexes=drop_indexes,
+        explain=explain,
+    )
+    if show_metrics:
+        console.print(recorder.summary_table())
 
 
-__all__ = ["app"]
+__all__ = ["app", "run_resolve"]
@@ -1,9 +1,104 @@
-# src/forge/cli/commands/status.py
+"""Implementation of the ``forge status`` command.
+
+The command summarises the project state database: the pipeline stage the
+project is in, how many files are in each status, which files failed and how
+long the latest runs of each stage took.  Everything is answered with
+aggregate queries (``GROUP BY status`` over the status index) and from the
+run history, so the command is instant even for projects with tens of
+thousands of files.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
 
 import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from ...core.schema import Base, FileStatus, ProjectState
+from ...core.state import FAILED_STATUSES, failed_files, recent_runs, status_counts
+
+app = typer.Typer(help="Show project status")
+console = Console()
+
+
+def _files_table(counts: dict[FileStatus, int]) -> Table:
+    table = Table(title="Files")
+    table.add_column("Status")
+    table.add_column("Files", justify="right")
+    for status in FileStatus:
+        if counts.get(status):
+            table.add_row(status.value, str(counts[status]))
+    table.add_row("total", str(sum(counts.values())), style="bold")
+    return table
+
+
+def _runs_table(runs) -> Table:
+    table = Table(title="Recent runs")
+    table.add_column("Stage")
+    table.add_column("Started (UTC)")
+    table.add_column("Duration (s)", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Files/s", justify="right")
+    for run in runs:
+        table.add_row(
+            run.stage,
+            f"{run.started:%Y-%m-%d %H:%M:%S}",
+            f"{(run.finished - run.started).total_seconds():.2f}",
+            str(run.files_processed),
+            str(run.files_failed),
+            f"{run.throughput:.1f}" if run.throughput is not None else "",
+        )
+    return table
 
-app = typer.Typer()
 
 @app.callback(invoke_without_command=True)
-def status():
-    pass
\ No newline at end of file
+def status(
+    failures: int = typer.Option(
+        10, "--failures", min=0, help="Number of failed files to list"
+    ),
+    runs: int = typer.Option(
+        10, "--runs", min=0, help="Number of recent runs to list"
+    ),
+) -> None:
+    """Show the pipeline status of the project in the current directory."""
+
+    db_path = Path.cwd() / ".forge" / "forge.sqlite3"
+    if not db_path.exists():
+        console.print("[red]No Forge project found; run 'forge init' first.[/red]")
+        raise typer.Exit(code=1)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        name, fsm_status = session.execute(
+            select(ProjectState.project_name, ProjectState.fsm_status)
+        ).one()
+        counts = status_counts(session)
+        failed = failed_files(session, limit=failures) if failures else []
+        history = recent_runs(session, limit=runs) if runs else []
+
+    console.print(f"[bold]{name}[/bold]: {fsm_status.value}")
+    console.print(_files_table(counts))
+
+    if failed:
+        n_failed = sum(counts.get(s, 0) for s in FAILED_STATUSES)
+        shown = f" (showing {len(failed)})" if n_failed > len(failed) else ""
+        console.print(f"[red]{n_failed} failed files{shown}:[/red]")
+        for row in failed:
+            message = (row.error_message or "").strip().splitlines()
+            console.print(
+                f"  {escape(row.source_path)} ({row.status.value})"
+                + (f": {escape(message[0])}" if message else "")
+            )
+
+    if history:
+        console.print(_runs_table(history))
+
+
+__all__ = ["app"]
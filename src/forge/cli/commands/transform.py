@@ -10,31 +10,53 @@ The transformation step populates ``ModuleSemantics`` and
 utilities under ``forge.tasks.parse.transform``.  These helpers walk the AST and
 construct symbol tables, reference lists and other semantic data which is then
 serialised to JSON.  The command mirrors the real project and provides the
-``--max-workers`` parameter to control the level of concurrency.
+``--max-workers`` parameter to control the level of concurrency.  File records
+are committed in checkpoints as files complete, so an interrupted run resumes
+with the files it had not finished.
+
+Along with the file records, the modules each file defines and uses are
+recorded as the project's module dependency graph, which ``forge load`` uses
+to load modules before the files that use them.  ``--shard I/N`` transforms
+the files extracted by the same shard of ``forge extract``, in the shard's own
+state database and artifact directory.
 """
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import datetime as _dt
+import os
 import pickle
-import json
 
 import typer
-from pydantic import BaseModel, Field
 from rich.console import Console
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 from fparser.two.Fortran2003 import Module, Subroutine_Subprogram, Function_Subprogram
 
+from ...config.loader import load_config
+from ...core.cache import SEMANTICS, ArtifactCache
+from ...core.metrics import MetricsRecorder, current, recording
 from ...core.models.semantics import ModuleSemantics, SubprogramSemantics
+from ...core.shards import Shard, prepare_shard
 from ...core.schema import (
+    Base,
     FileRecord,
     FileStatus,
     ProjectFSMStatus,
-    ProjectState,
 )
+from ...core.state import (
+    Checkpointer,
+    get_project_id,
+    iter_file_records,
+    record_run,
+    set_project_status,
+    write_file_records,
+    write_module_graph,
+)
+from ...tasks.parse.load.reader import iter_file_semantics
 from ...tasks.parse.transform.scope import (
     SymbolTableTransformer,
     DerivedTypeDefinitionTableTransformer,
@@ -44,25 +66,271 @@ from ...tasks.parse.transform.scope import (
     SignatureTransformer,
     UsedModulesTransformer,
 )
-from ...tasks.parse.transform.utils import get_subprogram_part
+from ...tasks.parse.transform.utils import annotate_line_numbers, get_subprogram_part
+from ...tasks.parse.transform.writer import FileSemanticsWriter
+
+
+app = typer.Typer(help="Transform ASTs into JSON semantics")
+console = Console()
+
+#: Modules defined by a file and its ``(module_name, used_module)`` pairs.
+ModuleGraph = tuple[set[str], set[tuple[str | None, str]]]
+
 
+def _run(transformer, node):
+    """Apply a table *transformer* to *node*, timing it under its class name."""
 
-class FileSemantics(BaseModel):
-    """Semantic information extracted from a single source file."""
+    name = transformer.__qualname__.split(".")[0].removesuffix("Transformer")
+    with current().span(f"transform.{name}"):
+        return transformer(node)
 
-    modules: dict[str, ModuleSemantics] = Field(
-        default_factory=dict,
-        description="Mapping of module names to their semantics.",
+
+def _release(node) -> None:
+    """Drop the children of an AST *node* whose semantics have been written."""
+
+    content = getattr(node, "content", None)
+    if isinstance(content, list):
+        content.clear()
+
+
+def _module_semantics(mod: Module) -> ModuleSemantics:
+    return ModuleSemantics(
+        symbol_table=_run(SymbolTableTransformer.from_module, mod),
+        derived_types=_run(DerivedTypeDefinitionTableTransformer.from_module, mod),
+        references=_run(ReferenceTableTransformer.from_module, mod),
+        calls=_run(CallTableTransformer.from_module, mod),
+        used_modules=sorted(_run(UsedModulesTransformer.from_module, mod)),
     )
 
-    subprograms: dict[str, SubprogramSemantics] = Field(
-        default_factory=dict,
-        description="Mapping of subprogram names to their semantics.",
+
+def _subprogram_semantics(sp: Subroutine_Subprogram | Function_Subprogram) -> SubprogramSemantics:
+    return SubprogramSemantics(
+        symbol_table=_run(SymbolTableTransformer.from_subprogram, sp),
+        derived_types=_run(DerivedTypeDefinitionTableTransformer.from_subprogram, sp),
+        references=_run(ReferenceTableTransformer.from_subprogram, sp),
+        calls=_run(CallTableTransformer.from_subprogram, sp),
+        ios=_run(IOTableTransformer.from_subprogram, sp),
+        signature=_run(SignatureTransformer.from_subprogram, sp),
+        used_modules=sorted(_run(UsedModulesTransformer.from_subprogram, sp)),
     )
 
 
-app = typer.Typer(help="Transform ASTs into JSON semantics")
-console = Console()
+def _write_semantics(ast, writer: FileSemanticsWriter) -> ModuleGraph:
+    """Transform the program units of *ast* and stream them to *writer*.
+
+    Module level tables are produced in a first pass, subprograms in a second
+    one, matching the order of the sections in the output.  Each subprogram's
+    subtree is released once its entry has been written, and so is each module
+    once all of its subprograms have been, so that the AST shrinks while the
+    output grows.
+
+    Returns:
+        The module dependency graph of the file.
+    """
+
+    units = list(getattr(ast, "content", []))
+    recorder = current()
+    defined: set[str] = set()
+    uses: set[tuple[str | None, str]] = set()
+
+    for node in units:
+        if isinstance(node, Module):
+            name = str(node.content[0].items[1])
+            print(f"Processing module: {name}")
+            semantics = _module_semantics(node)
+            defined.add(name)
+            uses.update((name, used) for used in semantics.used_modules)
+            with recorder.span("transform.write"):
+                writer.write_module(name, semantics)
+
+    for node in units:
+        if isinstance(node, Module):
+            module_name = str(node.content[0].items[1])
+            subprograms = get_subprogram_part(node)
+        elif isinstance(node, (Subroutine_Subprogram, Function_Subprogram)):
+            module_name, subprograms = None, [node]
+        else:
+            continue
+        for sp in subprograms:
+            name = str(sp.content[0].items[1])
+            key = f"{module_name}::{name}" if module_name else name
+            semantics = _subprogram_semantics(sp)
+            uses.update((module_name, used) for used in semantics.used_modules)
+            with recorder.span("transform.write"):
+                writer.write_subprogram(key, semantics)
+            _release(sp)
+        _release(node)
+    return defined, uses
+
+
+def _read_module_graph(json_path: Path) -> ModuleGraph:
+    """Return the module dependency graph of an existing semantics file."""
+
+    defined: set[str] = set()
+    uses: set[tuple[str | None, str]] = set()
+    with open(json_path, encoding="utf-8") as f:
+        for section, key, entry in iter_file_semantics(f):
+            if section == "modules":
+                defined.add(key)
+                module_name = key
+            else:
+                module_name = key.split("::", 1)[0] if "::" in key else None
+            uses.update((module_name, used) for used in entry.get("used_modules", ()))
+    return defined, uses
+
+
+def run_transform(
+    project_root: Path,
+    max_workers: int = 4,
+    indent: int | None = None,
+    engine: Engine | None = None,
+    shard: Shard | None = None,
+) -> MetricsRecorder:
+    """Transform all extracted files of the project at *project_root*.
+
+    Args:
+        project_root: Root directory of the Forge project.
+        max_workers: Number of files transformed concurrently.
+        indent: Indentation of the JSON output; compact if ``None``.
+        engine: Engine of the state database; created on demand.
+        shard: Transform the files extracted for this shard, in its own state
+            database and artifact directory.
+
+    Returns:
+        The metrics recorded for the run.
+    """
+
+    with recording("transform") as recorder:
+        config = load_config(project_root)
+        cache = ArtifactCache.from_config(config.cache)
+        # Semantics written with another indentation are different artifacts
+        variant = f"indent={indent}"
+
+        forge_dir = project_root / ".forge"
+        if shard is not None:
+            forge_dir = prepare_shard(project_root, shard)
+        db_path = forge_dir / "forge.sqlite3"
+        json_root = forge_dir / "json"
+        json_root.mkdir(parents=True, exist_ok=True)
+
+        if engine is None:
+            engine = create_engine(f"sqlite:///{db_path}")
+            recorder.instrument_engine(engine, "state")
+        # Adds the module graph tables to state databases created before them
+        Base.metadata.create_all(engine)
+
+        # Gather all file records that have an extracted AST ready for processing
+        to_process: list[tuple[Path, str, Path, Path]] = []
+        ids: dict[Path, int] = {}
+        with Session(engine) as session:
+            project_id = get_project_id(session)
+            for rec in iter_file_records(
+                session,
+                project_id,
+                FileRecord.file_hash,
+                FileRecord.ast_path,
+                status=FileStatus.EXTRACTED,
+            ):
+                if not rec.ast_path:
+                    continue
+                ids[Path(rec.source_path)] = rec.id
+                ast_path = project_root / rec.ast_path
+                json_path = json_root / rec.source_path
+                json_path = json_path.with_suffix(Path(rec.source_path).suffix + ".json")
+                to_process.append((Path(rec.source_path), rec.file_hash, ast_path, json_path))
+
+        def _transform_file(args: tuple[Path, str, Path, Path]):
+            rel, file_hash, ast_path, json_path = args
+            with recorder.file(rel):
+                return _transform_one(rel, file_hash, ast_path, json_path)
+
+        def _transform_one(rel: Path, file_hash: str, ast_path: Path, json_path: Path):
+            try:
+                if cache is not None and cache.fetch(SEMANTICS, file_hash, json_path, variant):
+                    with recorder.span("transform.module_graph"):
+                        graph = _read_module_graph(json_path)
+                    return (rel, json_path, None, graph, True)
+
+                with recorder.span("transform.load_ast"), open(ast_path, "rb") as f:
+                    ast = pickle.load(f)
+                if ast is not None:
+                    with recorder.span("transform.line_numbers"):
+                        annotate_line_numbers(ast)
+
+                # The semantics are streamed to a temporary file and renamed
+                # into place, so a failed write never leaves a partial artifact
+                json_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = json_path.with_name(json_path.name + ".tmp")
+                try:
+                    with open(tmp_path, "w", encoding="utf-8") as f, FileSemanticsWriter(
+                        f, indent=indent
+                    ) as writer:
+                        graph = _write_semantics(ast, writer)
+                    os.replace(tmp_path, json_path)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                if cache is not None:
+                    cache.store(SEMANTICS, file_hash, json_path, variant)
+                return (rel, json_path, None, graph, False)
+            except Exception as exc:  # pragma: no cover - best effort
+                return (rel, None, str(exc), None, False)
+
+        def _persist(session: Session, batch: list[tuple]) -> None:
+            now = _dt.datetime.utcnow()
+            updates: list[dict] = []
+            graphs: dict[int, ModuleGraph] = {}
+            for rel, json_path, error, graph in batch:
+                if graph is not None:
+                    graphs[ids[rel]] = graph
+                values = {"id": ids[rel]}
+                if error is None and json_path is not None:
+                    values["status"] = FileStatus.TRANSFORMED
+                    values["json_path"] = str(json_path.relative_to(project_root))
+                    values["last_processed"] = now
+                    values["error_message"] = None
+                else:
+                    values["status"] = FileStatus.FAILED_TRANSFORM
+                    values["error_message"] = error
+                updates.append(values)
+            write_file_records(session, updates=updates)
+            write_module_graph(session, graphs)
+
+        processed = failed = cache_hits = 0
+        with Checkpointer(engine, _persist, span="transform.persist") as checkpoint:
+            if to_process:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(_transform_file, args) for args in to_process]
+                    try:
+                        for future in as_completed(futures):
+                            *res, cached = future.result()
+                            checkpoint.add(tuple(res))
+                            processed += 1
+                            failed += res[2] is not None
+                            cache_hits += cached
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+        if cache is not None:
+            with recorder.span("transform.cache_prune"):
+                cache.prune()
+        recorder.incr("files.cache_hits", cache_hits)
+        recorder.incr("files.failed", failed)
+        recorder.incr("state.checkpoints", checkpoint.checkpoints)
+
+        if processed and not failed:
+            with Session(engine) as session:
+                set_project_status(session, project_id, ProjectFSMStatus.TRANSFORMED)
+                session.commit()
+
+        console.print(
+            f"[green]Processed {processed} files ({cache_hits} from cache).[/green]"
+        )
+
+    recorder.write(forge_dir)
+    record_run(engine, recorder, files=processed)
+    return recorder
 
 
 @app.callback(invoke_without_command=True)
@@ -72,121 +340,31 @@ def transform(
         min=1,
         help="Maximum number of worker threads used for transformation",
         show_default=True,
-    )
+    ),
+    indent: int = typer.Option(
+        None,
+        "--indent",
+        min=0,
+        help="Indent the JSON output by this many spaces; compact by default",
+    ),
+    shard: Shard = typer.Option(
+        None,
+        "--shard",
+        parser=Shard.parse,
+        metavar="I/N",
+        help="Only transform the files extracted for shard I of N, e.g. 2/8",
+        show_default=False,
+    ),
+    show_metrics: bool = typer.Option(
+        False, "--metrics", help="Print a timing and throughput summary"
+    ),
 ) -> None:
     """Convert extracted ASTs to a JSON based semantic representation."""
 
-    project_root = Path.cwd()
-    forge_dir = project_root / ".forge"
-    db_path = forge_dir / "forge.sqlite3"
-    json_root = forge_dir / "json"
-    json_root.mkdir(parents=True, exist_ok=True)
-
-    engine = create_engine(f"sqlite:///{db_path}")
-
-    # Gather all file records that have an extracted AST ready for processing
-    with Session(engine) as session:
-        project_state = session.query(ProjectState).one()
-        records = (
-            session.query(FileRecord)
-            .filter_by(project_id=project_state.id, status=FileStatus.EXTRACTED)
-            .all()
-        )
-
-    to_process: list[tuple[Path, Path, Path]] = []
-    for rec in records:
-        if not rec.ast_path:
-            continue
-        ast_path = project_root / rec.ast_path
-        json_path = json_root / rec.source_path
-        json_path = json_path.with_suffix(Path(rec.source_path).suffix + ".json")
-        to_process.append((Path(rec.source_path), ast_path, json_path))
-
-    def _transform_file(args: tuple[Path, Path, Path]):
-        rel, ast_path, json_path = args
-        try:
-            with open(ast_path, "rb") as f:
-                ast = pickle.load(f)
-
-            semantics = FileSemantics()
-
-            def handle_module(mod: Module) -> None:
-                name = str(mod.content[0].items[1])
-                print(f"Processing module: {name}")
-                modulesem = ModuleSemantics(
-                    symbol_table=SymbolTableTransformer.from_module(mod),
-                    derived_types=DerivedTypeDefinitionTableTransformer.from_module(mod),
-                    references=ReferenceTableTransformer.from_module(mod),
-                    calls=CallTableTransformer.from_module(mod),
-                    used_modules=sorted(UsedModulesTransformer.from_module(mod)),
-                )
-                semantics.modules[name] = modulesem
-                
-                for sp in get_subprogram_part(mod):
-                    handle_subprogram(sp, name)
-
-            def handle_subprogram(
-                sp: Subroutine_Subprogram | Function_Subprogram, module_name: str | None = None
-            ) -> None:
-                name = str(sp.content[0].items[1])
-                key = f"{module_name}::{name}" if module_name else name
-                subsem = SubprogramSemantics(
-                    symbol_table=SymbolTableTransformer.from_subprogram(sp),
-                    derived_types=DerivedTypeDefinitionTableTransformer.from_subprogram(sp),
-                    references=ReferenceTableTransformer.from_subprogram(sp),
-                    calls=CallTableTransformer.from_subprogram(sp),
-                    ios=IOTableTransformer.from_subprogram(sp),
-                    signature=SignatureTransformer.from_subprogram(sp),
-                    used_modules=sorted(UsedModulesTransformer.from_subprogram(sp)),
-                )
-                semantics.subprograms[key] = subsem
-
-            for node in getattr(ast, "content", []):
-                if isinstance(node, Module):
-                    handle_module(node)
-                elif isinstance(node, (Subroutine_Subprogram, Function_Subprogram)):
-                    handle_subprogram(node)
-
-            json_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(json_path, "w") as f:
-                json.dump(semantics.model_dump(), f, indent=4)
-            return (rel, json_path, None)
-        except Exception as exc:  # pragma: no cover - best effort
-            return (rel, None, str(exc))
-
-    results: list[tuple[Path, Path | None, str | None]] = []
-    if to_process:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for res in executor.map(_transform_file, to_process):
-                results.append(res)
-
-    # Persist results to the database
-    with Session(engine) as session:
-        project_state = session.query(ProjectState).one()
-
-        for rel, json_path, error in results:
-            record = (
-                session.query(FileRecord)
-                .filter_by(project_id=project_state.id, source_path=str(rel))
-                .one()
-            )
-
-            if error is None and json_path is not None:
-                record.status = FileStatus.TRANSFORMED
-                record.json_path = str(json_path.relative_to(project_root))
-                record.last_processed = _dt.datetime.utcnow()
-                record.error_message = None
-            else:
-                record.status = FileStatus.FAILED_TRANSFORM
-                record.error_message = error
-
-        if results and all(err is None for *_rest, err in results):
-            project_state.fsm_status = ProjectFSMStatus.TRANSFORMED
-
-        session.commit()
-
-    console.print(f"[green]Processed {len(results)} files.[/green]")
+    recorder = run_transform(Path.cwd(), max_workers=max_workers, indent=indent, shard=shard)
+    if show_metrics:
+        console.print(recorder.summary_table())
 
 
-__all__ = ["app"]
+__all__ = ["app", "run_transform"]
 
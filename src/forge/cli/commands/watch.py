@@ -0,0 +1,291 @@
+"""Implementation of the ``forge watch`` command.
+
+The command keeps the semantics database in sync with the sources while they
+are being edited.  It watches the configured source directories (see
+:class:`~forge.tasks.watch.SourceWatcher`) and, for every debounced batch of
+changes, runs one incremental cycle:
+
+1. ``extract`` and ``transform`` the added and modified files only;
+2. remove the rows loaded for the previous version of these files, and for
+   removed files, from the target database and ``load`` the new versions;
+3. ``resolve`` only the modules defined in the changed files and the modules
+   that use them.
+
+All stages run in-process, so the parser tables stay warm, and the state and
+target database engines (and their connection pools) are shared by all
+cycles.  On start-up, files that changed since they were last loaded are
+processed in a first catch-up cycle.  The latency of every cycle is printed
+and recorded in ``.forge/metrics/watch-*.json``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import datetime as _dt
+import time
+
+import typer
+from rich.console import Console
+from sqlalchemy import create_engine, delete
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ...config.loader import load_config
+from ...core.metrics import instrument_engine, recording
+from ...core.schema import FileRecord, FileStatus
+from ...core.state import file_rows, get_project_id, record_run
+from ...tasks.parse.load.reader import iter_file_semantics
+from ...tasks.parse.load.unload import unload_modules
+from ...tasks.resolve.handles import QueryHandle
+from ...tasks.watch import Changes, SourceWatcher
+from .extract import run_extract
+from .load import run_load
+from .resolve import run_resolve
+from .transform import run_transform
+
+app = typer.Typer(help="Keep the database in sync with the sources")
+console = Console()
+
+
+@dataclass
+class CycleReport:
+    """Outcome of one incremental cycle."""
+
+    modified: int
+    removed: int
+    failed: list[str]
+    resolved_modules: int
+    seconds: float
+
+
+def _unit_names(json_path: Path) -> tuple[set[str], set[str]]:
+    """Return the program units a semantics file defines entries for.
+
+    Returns:
+        The names of the modules and of the external subprograms, i.e. those
+        keyed without a host module.
+    """
+
+    modules: set[str] = set()
+    subprograms: set[str] = set()
+    if not json_path.is_file():
+        return modules, subprograms
+    with open(json_path, encoding="utf-8") as f:
+        for section, key, _entry in iter_file_semantics(f):
+            if section == "modules":
+                modules.add(key)
+            elif "::" in key:
+                modules.add(key.split("::", 1)[0])
+            else:
+                subprograms.add(key)
+    return modules, subprograms
+
+
+def pending_changes(
+    project_root: Path, state_engine: Engine, snapshot: dict[Path, float]
+) -> Changes:
+    """Return the files of *snapshot* that are not loaded in their current version.
+
+    Files without a record, files that did not reach ``LOADED`` and files
+    modified since they were processed count as modified; records of files
+    missing from *snapshot* count as removed.
+    """
+
+    with Session(state_engine) as session:
+        rows = file_rows(
+            session, get_project_id(session), FileRecord.status, FileRecord.last_modified
+        )
+    changes = Changes()
+    for path, mtime in snapshot.items():
+        row = rows.get(str(path.relative_to(project_root)))
+        if (
+            row is None
+            or row.status != FileStatus.LOADED
+            or row.last_modified != _dt.datetime.utcfromtimestamp(mtime)
+        ):
+            changes.modified[path] = mtime
+    known = {str(p.relative_to(project_root)) for p in snapshot}
+    changes.removed = {project_root / p for p in rows if p not in known}
+    return changes
+
+
+def run_cycle(
+    project_root: Path,
+    changes: Changes,
+    state_engine: Engine,
+    target_engine: Engine,
+    max_workers: int = 4,
+) -> CycleReport:
+    """Bring the target database up to date with *changes*."""
+
+    start = time.perf_counter()
+    with recording("watch") as recorder:
+        modified = {str(p.relative_to(project_root)) for p in changes.modified}
+        removed = {str(p.relative_to(project_root)) for p in changes.removed}
+
+        with Session(state_engine) as session:
+            project_id = get_project_id(session)
+            before = file_rows(session, project_id, FileRecord.json_path)
+        old_names = {
+            path: _unit_names(project_root / row.json_path)
+            for path, row in before.items()
+            if row.json_path and (path in modified or path in removed)
+        }
+
+        if changes.modified:
+            with recorder.span("watch.extract"):
+                run_extract(
+                    project_root,
+                    max_workers=max_workers,
+                    files=changes.modified,
+                    engine=state_engine,
+                )
+            with recorder.span("watch.transform"):
+                run_transform(project_root, max_workers=max_workers, engine=state_engine)
+
+        with Session(state_engine) as session:
+            after = file_rows(session, project_id, FileRecord.status, FileRecord.json_path)
+            ready = {
+                p for p in modified if p in after and after[p].status == FileStatus.TRANSFORMED
+            }
+            # Files that could not be read, e.g. because they were removed
+            # since they were seen, have no record and count as failed
+            failed = sorted(
+                p
+                for p in modified
+                if p not in after or after[p].status.name.startswith("FAILED")
+            )
+
+            # Files that failed keep the rows of their last good version
+            stale: set[str] = set()
+            stale_subprograms: set[str] = set()
+            for path in ready | removed:
+                modules, subprograms = old_names.get(path, (set(), set()))
+                stale |= modules
+                stale_subprograms |= subprograms
+            new_names: set[str] = set()
+            new_subprograms: set[str] = set()
+            for path in ready:
+                modules, subprograms = _unit_names(project_root / after[path].json_path)
+                new_names |= modules
+                new_subprograms |= subprograms
+
+            if removed:
+                for path in removed:
+                    if before[path].json_path:
+                        (project_root / before[path].json_path).unlink(missing_ok=True)
+                session.execute(
+                    delete(FileRecord).where(
+                        FileRecord.id.in_([before[path].id for path in removed])
+                    )
+                )
+                session.commit()
+
+        # Units new to a file may still be loaded from the file that defined
+        # them before, so they are unloaded along with the stale ones
+        with recorder.span("watch.unload"), Session(target_engine) as session:
+            unload_modules(session, stale | new_names, stale_subprograms | new_subprograms)
+            session.commit()
+
+        if ready:
+            with recorder.span("watch.load"):
+                run_load(project_root, state_engine=state_engine, target_engine=target_engine)
+
+        changed = stale | new_names
+        with Session(target_engine) as session:
+            affected = changed | QueryHandle(session).modules_using(changed)
+
+        if affected:
+            with recorder.span("watch.resolve"):
+                run_resolve(
+                    project_root,
+                    modules=affected,
+                    state_engine=state_engine,
+                    target_engine=target_engine,
+                )
+
+        recorder.incr("files.modified", len(modified))
+        recorder.incr("files.removed", len(removed))
+        recorder.incr("files.failed", len(failed))
+        recorder.incr("modules.resolved", len(affected))
+    recorder.write(project_root / ".forge")
+    record_run(state_engine, recorder, files=len(changes))
+
+    return CycleReport(
+        modified=len(modified),
+        removed=len(removed),
+        failed=failed,
+        resolved_modules=len(affected),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _report(number: int, report: CycleReport) -> None:
+    console.print(
+        f"Cycle {number}: {report.modified} changed, {report.removed} removed, "
+        f"{report.resolved_modules} modules resolved in {report.seconds:.2f}s"
+    )
+    for path in report.failed:
+        console.print(f"[red]  {path} failed; its previous version is kept[/red]")
+
+
+@app.callback(invoke_without_command=True)
+def watch(
+    db_url: str = typer.Option(
+        ..., "--db-url", help="Target database URL", show_default=False
+    ),
+    interval: float = typer.Option(
+        1.0, "--interval", min=0.05, help="Seconds between two scans while polling"
+    ),
+    debounce: float = typer.Option(
+        0.5, "--debounce", min=0.0, help="Seconds the sources have to stay unchanged"
+    ),
+    max_workers: int = typer.Option(
+        4, "--max-workers", min=1, help="Maximum number of files processed concurrently"
+    ),
+    poll: bool = typer.Option(
+        False, "--poll", help="Always poll, even if native notifications are available"
+    ),
+    max_cycles: int = typer.Option(
+        None, "--max-cycles", min=0, hidden=True, help="Stop after this many cycles"
+    ),
+) -> None:
+    """Watch the source directories and keep the database up to date."""
+
+    project_root = Path.cwd()
+    config = load_config(project_root)
+
+    state_engine = create_engine(f"sqlite:///{project_root / '.forge' / 'forge.sqlite3'}")
+    target_engine = create_engine(db_url)
+    instrument_engine(state_engine, "state")
+    instrument_engine(target_engine, "target")
+
+    watcher = SourceWatcher(
+        project_root, config.sources, interval=interval, debounce=debounce, native=not poll
+    )
+    cycles = 0
+
+    def _done() -> bool:
+        return max_cycles is not None and cycles >= max_cycles
+
+    try:
+        changes = pending_changes(project_root, state_engine, watcher.snapshot)
+        if changes and not _done():
+            cycles += 1
+            _report(cycles, run_cycle(project_root, changes, state_engine, target_engine, max_workers))
+
+        mode = "notifications" if watcher.native else f"polling every {interval:g}s"
+        console.print(f"Watching {', '.join(config.sources.source_dirs)} ({mode}); press Ctrl+C to stop.")
+        while not _done():
+            changes = watcher.wait()
+            cycles += 1
+            _report(cycles, run_cycle(project_root, changes, state_engine, target_engine, max_workers))
+    except KeyboardInterrupt:
+        console.print("Stopped watching.")
+    finally:
+        state_engine.dispose()
+        target_engine.dispose()
+
+
+__all__ = ["app", "pending_changes", "run_cycle"]
@@ -0,0 +1,68 @@
+"""Lazily imported sub-commands.
+
+Importing a command module pulls in its dependencies (fparser, SQLAlchemy,
+pydantic, fpyevolve_core, ...), which takes seconds on a cold cache.
+:class:`LazyGroup` registers every sub-command by the name of the module that
+implements it and imports the module only when the command is actually
+invoked, so ``forge --help``, ``forge status`` and shell completion do not pay
+for the commands they do not run.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+import typer
+import typer.main
+from typer.core import TyperCommand, TyperGroup
+
+if TYPE_CHECKING:
+    import click
+
+
+class _LazyCommand(TyperCommand):
+    """Stand-in for a sub-command whose module has not been imported yet.
+
+    It carries the help text shown in the command listing of the parent
+    group; :meth:`load` imports the module and builds the real command.
+    """
+
+    def __init__(self, name: str, module: str, help: str) -> None:
+        super().__init__(name=name, help=help, short_help=help)
+        self.module = module
+
+    def load(self) -> click.Command:
+        app = import_module(self.module).app
+        # Built like a group added with ``Typer.add_typer``
+        command = typer.main.get_group(app)
+        command.name = self.name
+        command.help = command.short_help = self.help
+        return command
+
+
+class LazyGroup(TyperGroup):
+    """A Typer group whose sub-commands are imported on first use.
+
+    Subclasses list their sub-commands in :attr:`lazy_commands`; each entry
+    maps the command name to the module exposing the command's Typer ``app``
+    and the one-line help shown by ``--help``.
+    """
+
+    lazy_commands: dict[str, tuple[str, str]] = {}
+
+    def __init__(self, **attrs: Any) -> None:
+        super().__init__(**attrs)
+        for name, (module, help) in self.lazy_commands.items():
+            self.commands.setdefault(name, _LazyCommand(name, module, help))
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        name, command, rest = super().resolve_command(ctx, args)
+        if isinstance(command, _LazyCommand):
+            command = self.commands[command.name] = command.load()
+        return name, command, rest
+
+
+__all__ = ["LazyGroup"]
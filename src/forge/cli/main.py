@@ -14,27 +14,42 @@ from __future__ import annotations
 
 import typer
 
-# Import the individual command modules.  Each module exposes its own ``app``
-# object which we register on the main application.  The modules may contain
-# additional subcommands; using ``add_typer`` keeps things nicely namespaced and
-# lazily imported.
-from .commands import clean, extract, init, load, resolve, status, transform
+from .lazy import LazyGroup
+
+
+class ForgeGroup(LazyGroup):
+    """Top level command group.
+
+    The name given here becomes the command name used on the CLI, e.g.
+    ``forge init``.  Each command module exposes its own ``app`` object and is
+    only imported when its command runs, so that ``forge --help`` does not
+    import fparser, SQLAlchemy or fpyevolve_core.
+    """
+
+    lazy_commands = {
+        "init": ("forge.cli.commands.init", "Initialise a new Forge project"),
+        "status": ("forge.cli.commands.status", "Show project status"),
+        "extract": ("forge.cli.commands.extract", "Parse source files"),
+        "transform": ("forge.cli.commands.transform", "Transform ASTs to JSON"),
+        "load": ("forge.cli.commands.load", "Load data into a database"),
+        "resolve": ("forge.cli.commands.resolve", "Resolve symbols"),
+        "merge": ("forge.cli.commands.merge", "Merge shard state into the project"),
+        "clean": ("forge.cli.commands.clean", "Remove generated artefacts"),
+        "watch": (
+            "forge.cli.commands.watch",
+            "Watch sources and keep the database up to date",
+        ),
+    }
 
 
 # ``no_args_is_help`` ensures ``forge`` displays the help message when invoked
 # without any arguments.
-app = typer.Typer(no_args_is_help=True, help="Forge command line interface")
-
-
-# Register subcommands.  The name provided here becomes the command name used
-# on the CLI, e.g. ``forge init``.
-app.add_typer(init.app, name="init", help="Initialise a new Forge project")
-app.add_typer(status.app, name="status", help="Show project status")
-app.add_typer(extract.app, name="extract", help="Parse source files")
-app.add_typer(transform.app, name="transform", help="Transform ASTs to JSON")
-app.add_typer(load.app, name="load", help="Load data into a database")
-app.add_typer(resolve.app, name="resolve", help="Resolve symbols")
-app.add_typer(clean.app, name="clean", help="Remove generated artefacts")
+app = typer.Typer(cls=ForgeGroup, no_args_is_help=True, help="Forge command line interface")
+
+
+@app.callback()
+def forge() -> None:
+    """Forge command line interface."""
 
 
 def main() -> None:
@@ -13,6 +13,7 @@ from .models import (
     ProjectModel,
     SourcesModel,
     ParserModel,
+    CacheModel,
 )
 
 # Expose key components for easy access from other parts of the application.
@@ -23,4 +24,5 @@ __all__ = [
     "ProjectModel",
     "SourcesModel",
     "ParserModel",
+    "CacheModel",
 ]
\ No newline at end of file
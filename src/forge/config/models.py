@@ -39,6 +39,11 @@ class SourcesModel(BaseModel):
         default=[],
         description="Glob patterns for excluding files or directories."
     )
+    scan_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Threads used to walk source directories; raise on network filesystems."
+    )
 
 class ParserModel(BaseModel):
     """
@@ -50,10 +55,30 @@ class ParserModel(BaseModel):
     )
 
 
+class CacheModel(BaseModel):
+    """
+    Configuration corresponding to the [cache] table
+    """
+    enabled: bool = Field(
+        False,
+        description="Whether extract/transform consult the shared artifact cache."
+    )
+    directory: str = Field(
+        "~/.cache/forge",
+        description="Directory holding cached artifacts; may live on a shared filesystem."
+    )
+    max_size_mb: int = Field(
+        2048,
+        ge=0,
+        description="Size bound of the cache in megabytes, enforced by LRU eviction."
+    )
+
+
 class ForgeConfig(BaseModel):
     """
     Top-level configuration model representing the structure of the entire forge.toml file.
     """
     project: ProjectModel
     sources: SourcesModel
-    parser: ParserModel = Field(default_factory=lambda: ParserModel(encoding="utf-8"))
\ No newline at end of file
+    parser: ParserModel = Field(default_factory=lambda: ParserModel(encoding="utf-8"))
+    cache: CacheModel = Field(default_factory=CacheModel)
\ No newline at end of file
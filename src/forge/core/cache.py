@@ -0,0 +1,155 @@
+"""Content-addressed artifact cache shared across project checkouts.
+
+Artifacts produced by ``forge extract`` (pickled ASTs) and ``forge transform``
+(JSON semantics) depend only on the content of the source file and on the
+versions of the parser and transformers that produced them.  The cache stores
+them under a key derived from exactly these inputs so that identical files in
+different checkouts (e.g. CI builds of many branches) are parsed only once.
+
+The cache directory may be shared between processes and hosts (e.g. on NFS):
+entries are written to a temporary file and atomically renamed into place, and
+a reader that loses a race against eviction simply treats the entry as a miss.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from ..config.models import CacheModel
+
+logger = logging.getLogger(__name__)
+
+#: Bump whenever the transformers under ``forge.tasks.parse.transform`` change
+#: their output, so that stale semantics are not served from the cache.
+TRANSFORMER_VERSION = "1"
+
+#: Artifact kinds stored in the cache.
+AST = "ast"
+SEMANTICS = "semantics"
+
+
+@lru_cache(maxsize=None)
+def parser_version() -> str:
+    """Return the installed fparser version used to key AST artifacts."""
+
+    try:
+        return version("fparser")
+    except PackageNotFoundError:  # pragma: no cover - best effort fallback
+        return "unknown"
+
+
+def _atomic_copy(src: Path, dest: Path) -> None:
+    """Copy *src* to *dest* so that readers never observe a partial file."""
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".tmp-", suffix=dest.suffix)
+    try:
+        with os.fdopen(fd, "wb") as tmp, open(src, "rb") as f:
+            shutil.copyfileobj(f, tmp, length=1024 * 1024)
+        os.replace(tmp_name, dest)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class ArtifactCache:
+    """Size-bounded, LRU-evicted store of artifacts keyed by content hash."""
+
+    def __init__(self, root: Path, max_size: int) -> None:
+        self.root = root
+        self.max_size = max_size
+
+    @classmethod
+    def from_config(cls, config: CacheModel) -> ArtifactCache | None:
+        """Return the cache described by *config*, or ``None`` if disabled."""
+
+        if not config.enabled:
+            return None
+        root = Path(config.directory).expanduser()
+        return cls(root, config.max_size_mb * 1024 * 1024)
+
+    def key(self, kind: str, file_hash: str, variant: str = "") -> str:
+        """Return the cache key of the *kind* artifact for *file_hash*.
+
+        *variant* distinguishes artifacts of the same content that differ in
+        their output options, e.g. the indentation of JSON semantics.
+        """
+
+        parts = [kind, file_hash, parser_version()]
+        if kind == SEMANTICS:
+            parts.append(TRANSFORMER_VERSION)
+        if variant:
+            parts.append(variant)
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry(self, kind: str, file_hash: str, variant: str = "") -> Path:
+        key = self.key(kind, file_hash, variant)
+        return self.root / kind / key[:2] / key
+
+    def fetch(self, kind: str, file_hash: str, dest: Path, variant: str = "") -> bool:
+        """Copy a cached artifact to *dest*; return ``False`` on a cache miss."""
+
+        entry = self._entry(kind, file_hash, variant)
+        try:
+            _atomic_copy(entry, dest)
+            # Refresh the modification time which serves as LRU timestamp;
+            # access times are unreliable on ``noatime`` and network mounts.
+            os.utime(entry)
+        except FileNotFoundError:
+            return False
+        except OSError as exc:  # pragma: no cover - best effort
+            logger.warning("Failed to read cache entry %s: %s", entry, exc)
+            return False
+        return True
+
+    def store(self, kind: str, file_hash: str, src: Path, variant: str = "") -> None:
+        """Add the artifact at *src* to the cache."""
+
+        entry = self._entry(kind, file_hash, variant)
+        if entry.exists():
+            return
+        try:
+            _atomic_copy(src, entry)
+        except OSError as exc:  # pragma: no cover - best effort
+            logger.warning("Failed to write cache entry %s: %s", entry, exc)
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the size bound holds.
+
+        Returns:
+            The number of evicted entries.
+        """
+
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.startswith(".tmp-"):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        evicted = 0
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        return evicted
+
+
+__all__ = ["ArtifactCache", "AST", "SEMANTICS", "TRANSFORMER_VERSION", "parser_version"]
@@ -0,0 +1,60 @@
+"""Scheduling helpers for the module dependency graph.
+
+Fortran requires a module to be compiled before the program units that
+``use`` it, and the same order matters when loading semantics: a use of a
+module that is already in the target database is linked to it right away.
+:func:`topological_waves` splits a dependency graph into waves such that every
+node only depends on nodes of earlier waves, so the nodes of one wave can be
+processed concurrently.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, Iterable, Mapping, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+def topological_waves(dependencies: Mapping[K, Iterable[K]]) -> list[list[K]]:
+    """Order the nodes of a dependency graph in waves (Kahn's algorithm).
+
+    Args:
+        dependencies: The nodes that each node depends on.  Dependencies that
+            are not keys of the mapping themselves are ignored, as are
+            self-dependencies.
+
+    Returns:
+        The nodes in waves; the nodes of a wave only depend on nodes of
+        earlier waves.  Within a wave, nodes keep the order of the mapping.
+        Nodes on a dependency cycle, or depending on one, cannot be ordered
+        and form the last wave.
+    """
+
+    pending: dict[K, int] = {}
+    users: dict[K, list[K]] = {node: [] for node in dependencies}
+    for node, deps in dependencies.items():
+        deps = {dep for dep in deps if dep in users and dep != node}
+        pending[node] = len(deps)
+        for dep in deps:
+            users[dep].append(node)
+
+    waves: list[list[K]] = []
+    wave = [node for node, count in pending.items() if count == 0]
+    while wave:
+        waves.append(wave)
+        for node in wave:
+            del pending[node]
+        ready: set[K] = set()
+        for node in wave:
+            for user in users[node]:
+                pending[user] -= 1
+                if pending[user] == 0:
+                    ready.add(user)
+        wave = [node for node in pending if node in ready]
+
+    if pending:
+        waves.append(list(pending))
+    return waves
+
+
+__all__ = ["topological_waves"]
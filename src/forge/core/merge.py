@@ -0,0 +1,256 @@
+"""Merging of shard state databases into the main state database.
+
+Shards (see :mod:`forge.core.shards`) record their files in state databases
+of their own.  :func:`merge_shard` folds one of them into the main state
+database with a handful of set based statements on the shard database
+``ATTACH``-ed to the main one, so merging takes about as long as copying the
+rows; nothing is parsed or transformed again.
+
+A file recorded both in the shard and in the main database keeps the record
+that was processed last (``last_processed``; records never processed successfully
+lose).  The artifacts of the records taken from the shard are hard-linked
+from the shard directory into the main ``.forge`` directory and the records
+are rewritten to point at the links, so the shard directory can be removed
+afterwards.  Artifacts of main records that were replaced and are no longer
+referenced are deleted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import shutil
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .metrics import current
+from .schema import ProjectFSMStatus
+from .shards import STATE_DB
+
+#: Columns copied from a shard's file records, besides ``project_id``.
+_FILE_COLUMNS = (
+    "source_path",
+    "file_hash",
+    "status",
+    "ast_path",
+    "json_path",
+    "last_modified",
+    "last_processed",
+    "error_message",
+)
+
+#: Project states in pipeline order, up to the stages shards run.
+_STAGES = [ProjectFSMStatus.INITIALIZED, ProjectFSMStatus.EXTRACTED, ProjectFSMStatus.TRANSFORMED]
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merging one shard."""
+
+    files: int
+    """File records taken from the shard."""
+
+    kept: int
+    """File records of the shard that lost against newer main records."""
+
+    artifacts: int
+    """Artifacts linked into the main ``.forge`` directory."""
+
+    status: ProjectFSMStatus
+    """Pipeline state of the shard."""
+
+
+def _link(src: Path, dest: Path) -> None:
+    """Make *dest* a hard link to *src*, replacing *dest* atomically."""
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".merge")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+
+
+def _rebase(path: str | None, prefix: str, target: str) -> str | None:
+    if path is not None and path.startswith(prefix):
+        return target + path[len(prefix):]
+    return path
+
+
+def merge_shard(engine: Engine, project_root: Path, shard_dir: Path) -> MergeResult:
+    """Merge the state database and artifacts of *shard_dir* into the main state.
+
+    Args:
+        engine: Engine of the main state database.
+        project_root: Root directory of the Forge project.
+        shard_dir: Directory of the shard, e.g. ``.forge/shards/1-of-4``.
+
+    Returns:
+        What was merged.
+
+    Raises:
+        FileNotFoundError: If *shard_dir* has no state database.
+    """
+
+    shard_db = shard_dir / STATE_DB
+    if not shard_db.is_file():
+        raise FileNotFoundError(f"{shard_db} does not exist")
+
+    # Artifact paths are relative to the project root; those inside the shard
+    # directory move to the same place below the main ``.forge`` directory
+    prefix = str(shard_dir.resolve().relative_to(project_root.resolve())) + os.sep
+    target = ".forge" + os.sep
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ATTACH DATABASE ? AS shard", (str(shard_db),))
+        try:
+            result = _merge(conn, project_root, prefix, target)
+            conn.commit()
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql("DETACH DATABASE shard")
+    return result
+
+
+def _merge(conn: Connection, project_root: Path, prefix: str, target: str) -> MergeResult:
+    recorder = current()
+    project_id = conn.execute(text("SELECT id FROM project_state")).scalar_one()
+    status = ProjectFSMStatus(
+        conn.execute(text("SELECT fsm_status FROM shard.project_state")).scalar_one()
+    )
+
+    # Records of the shard that win against the main database; timestamps are
+    # stored as ISO strings, which compare chronologically
+    conn.execute(text("DROP TABLE IF EXISTS temp.merged"))
+    conn.execute(
+        text(
+            """
+            CREATE TEMP TABLE merged AS
+            SELECT s.id AS shard_id, f.id AS main_id, s.ast_path, s.json_path,
+                   f.ast_path AS old_ast_path, f.json_path AS old_json_path
+            FROM shard.file_records AS s
+            LEFT JOIN main.file_records AS f
+                ON f.project_id = :project_id AND f.source_path = s.source_path
+            WHERE f.id IS NULL
+               OR coalesce(s.last_processed, '') > coalesce(f.last_processed, '')
+            """
+        ),
+        {"project_id": project_id},
+    )
+    total = conn.execute(text("SELECT count(*) FROM shard.file_records")).scalar_one()
+    rows = conn.execute(
+        text("SELECT ast_path, json_path, old_ast_path, old_json_path FROM temp.merged")
+    ).all()
+
+    # Link the artifacts before the records point at them
+    artifacts = 0
+    with recorder.span("merge.link"):
+        for path in {p for row in rows for p in row[:2] if p}:
+            rebased = _rebase(path, prefix, target)
+            src = project_root / path
+            if rebased != path and src.exists():
+                _link(src, project_root / rebased)
+                artifacts += 1
+
+    with recorder.span("merge.records"):
+        columns = ", ".join(_FILE_COLUMNS)
+        values = ", ".join(
+            f"CASE WHEN substr(s.{c}, 1, :length) = :prefix "
+            f"THEN :target || substr(s.{c}, :length + 1) ELSE s.{c} END"
+            if c in ("ast_path", "json_path")
+            else f"s.{c}"
+            for c in _FILE_COLUMNS
+        )
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _FILE_COLUMNS[1:])
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO main.file_records (project_id, {columns})
+                SELECT :project_id, {values}
+                FROM shard.file_records AS s
+                JOIN temp.merged AS m ON m.shard_id = s.id
+                WHERE true  -- disambiguates ON CONFLICT from a join constraint
+                ON CONFLICT (project_id, source_path) DO UPDATE SET {updates}
+                """
+            ),
+            {
+                "project_id": project_id,
+                "prefix": prefix,
+                "length": len(prefix),
+                "target": target,
+            },
+        )
+
+        # The module graph of the files taken from the shard
+        for table, graph_columns in (
+            ("module_definitions", "name"),
+            ("module_uses", "module_name, used_module"),
+        ):
+            conn.execute(
+                text(
+                    f"DELETE FROM main.{table} WHERE file_id IN "
+                    "(SELECT main_id FROM temp.merged WHERE main_id IS NOT NULL)"
+                )
+            )
+            selected = ", ".join(f"g.{c.strip()}" for c in graph_columns.split(","))
+            conn.execute(
+                text(
+                    f"""
+                    INSERT INTO main.{table} (file_id, {graph_columns})
+                    SELECT f.id, {selected}
+                    FROM shard.{table} AS g
+                    JOIN temp.merged AS m ON m.shard_id = g.file_id
+                    JOIN shard.file_records AS s ON s.id = g.file_id
+                    JOIN main.file_records AS f
+                        ON f.project_id = :project_id AND f.source_path = s.source_path
+                    """
+                ),
+                {"project_id": project_id},
+            )
+
+        conn.execute(
+            text(
+                """
+                INSERT INTO main.run_history
+                    (project_id, run_id, stage, started, finished,
+                     files_processed, files_failed, throughput)
+                SELECT :project_id, r.run_id, r.stage, r.started, r.finished,
+                       r.files_processed, r.files_failed, r.throughput
+                FROM shard.run_history AS r
+                WHERE r.run_id NOT IN (SELECT run_id FROM main.run_history)
+                """
+            ),
+            {"project_id": project_id},
+        )
+
+    # Artifacts of replaced main records that nothing refers to anymore
+    superseded = {p for row in rows for p in row[2:] if p}
+    if superseded:
+        referenced = {
+            p
+            for row in conn.execute(text("SELECT ast_path, json_path FROM main.file_records"))
+            for p in row
+            if p
+        }
+        for path in superseded - referenced:
+            (project_root / path).unlink(missing_ok=True)
+
+    recorder.incr("merge.files", len(rows))
+    recorder.incr("merge.artifacts", artifacts)
+    return MergeResult(files=len(rows), kept=total - len(rows), artifacts=artifacts, status=status)
+
+
+def merged_status(statuses: list[ProjectFSMStatus]) -> ProjectFSMStatus | None:
+    """Return the pipeline state all merged shards have reached, if any."""
+
+    stages = [s for s in statuses if s in _STAGES]
+    if not stages:
+        return None
+    return min(stages, key=_STAGES.index)
+
+
+__all__ = ["MergeResult", "merge_shard", "merged_status"]
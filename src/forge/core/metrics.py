@@ -0,0 +1,236 @@
+"""Lightweight instrumentation of the Forge pipeline stages.
+
+A :class:`MetricsRecorder` collects timing spans, counters and per-file
+durations for one command invocation ("run").  Commands activate a recorder
+with :func:`recording`; code deeper in the call stack reports to the active
+recorder through :func:`current` without having to thread it through every
+signature.  When no recorder is active, :func:`current` returns a recorder
+that discards everything.
+
+At the end of a run the collected data is written to
+``.forge/metrics/<run>.json`` and can optionally be rendered as a rich table.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+import datetime as _dt
+import json
+import sys
+import threading
+import time
+from typing import Iterator
+
+from rich.table import Table
+
+try:  # ``resource`` is only available on Unix-like systems
+    import resource
+except ImportError:  # pragma: no cover - platform specific
+    resource = None
+
+
+def peak_rss_kb() -> int | None:
+    """Return the peak resident set size of this process and its children in KiB."""
+
+    if resource is None:  # pragma: no cover - platform specific
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ``ru_maxrss`` is reported in bytes on macOS and in KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class MetricsRecorder:
+    """Collect spans, counters and per-file timings of a single run."""
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self.started = _dt.datetime.utcnow()
+        self.run_id = f"{stage}-{self.started:%Y%m%dT%H%M%S%f}"
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.counters: dict[str, int] = {}
+        self.spans: dict[str, dict[str, float]] = {}
+        self.files: dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    # collection
+    def incr(self, name: str, value: int = 1) -> None:
+        """Add *value* to the counter *name*."""
+
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_span(self, name: str, seconds: float) -> None:
+        """Account *seconds* to the span *name*."""
+
+        with self._lock:
+            span = self.spans.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            span["count"] += 1
+            span["total"] += seconds
+            span["max"] = max(span["max"], seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and account it to the span *name*."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, time.perf_counter() - start)
+
+    def add_file(self, path: str | Path, seconds: float) -> None:
+        """Record the time spent on a single source file."""
+
+        with self._lock:
+            self.files[str(path)] = self.files.get(str(path), 0.0) + seconds
+
+    @contextmanager
+    def file(self, path: str | Path) -> Iterator[None]:
+        """Time the enclosed block as work on the source file *path*."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_file(path, time.perf_counter() - start)
+
+    def instrument_engine(self, engine, prefix: str = "db") -> None:
+        """Count the queries and commits issued through a SQLAlchemy *engine*."""
+
+        from sqlalchemy import event
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _count_query(conn, cursor, statement, parameters, context, executemany):
+            self.incr(f"{prefix}.queries")
+
+        @event.listens_for(engine, "commit")
+        def _count_commit(conn):
+            self.incr(f"{prefix}.commits")
+
+    # ------------------------------------------------------------------
+    # reporting
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        durations = sorted(self.files.values())
+        slowest = sorted(self.files.items(), key=lambda item: item[1], reverse=True)
+        top = max(1, len(slowest) // 100) if slowest else 0
+        return {
+            "run_id": self.run_id,
+            "stage": self.stage,
+            "started": self.started.isoformat(),
+            "elapsed": self.elapsed,
+            "peak_rss_kb": peak_rss_kb(),
+            "counters": dict(sorted(self.counters.items())),
+            "spans": dict(sorted(self.spans.items())),
+            "files": {
+                "count": len(durations),
+                "throughput": len(durations) / self.elapsed if self.elapsed else 0.0,
+                "p50": durations[len(durations) // 2] if durations else None,
+                "p99": durations[min(len(durations) - 1, len(durations) * 99 // 100)]
+                if durations
+                else None,
+                "slowest": [{"path": p, "seconds": s} for p, s in slowest[:top]],
+                "timings": dict(sorted(self.files.items())),
+            },
+        }
+
+    def write(self, forge_dir: Path) -> Path:
+        """Write the collected metrics to ``<forge_dir>/metrics/<run>.json``."""
+
+        metrics_dir = forge_dir / "metrics"
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        path = metrics_dir / f"{self.run_id}.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        return path
+
+    def summary_table(self) -> Table:
+        """Render the collected metrics as a rich table."""
+
+        data = self.to_dict()
+        table = Table(title=f"forge {self.stage} ({data['elapsed']:.2f}s)")
+        table.add_column("Metric")
+        table.add_column("Count", justify="right")
+        table.add_column("Total [s]", justify="right")
+        table.add_column("Max [s]", justify="right")
+        for name, span in data["spans"].items():
+            table.add_row(name, str(span["count"]), f"{span['total']:.3f}", f"{span['max']:.3f}")
+        for name, value in data["counters"].items():
+            table.add_row(name, str(value), "", "")
+        files = data["files"]
+        if files["count"]:
+            table.add_row(
+                "files",
+                str(files["count"]),
+                f"{sum(files['timings'].values()):.3f}",
+                f"{files['slowest'][0]['seconds']:.3f}",
+            )
+            table.add_row("files/s", f"{files['throughput']:.1f}", "", "")
+        if data["peak_rss_kb"] is not None:
+            table.add_row("peak RSS [MiB]", f"{data['peak_rss_kb'] / 1024:.1f}", "", "")
+        return table
+
+
+class _NullRecorder(MetricsRecorder):
+    """Recorder used when no run is active; discards all measurements."""
+
+    def incr(self, name: str, value: int = 1) -> None:
+        pass
+
+    def add_span(self, name: str, seconds: float) -> None:
+        pass
+
+    def add_file(self, path: str | Path, seconds: float) -> None:
+        pass
+
+
+_NULL = _NullRecorder("null")
+_active: MetricsRecorder | None = None
+
+
+def current() -> MetricsRecorder:
+    """Return the recorder of the active run, or a no-op recorder."""
+
+    return _active if _active is not None else _NULL
+
+
+def instrument_engine(engine, prefix: str = "db") -> None:
+    """Count the queries and commits of a long-lived *engine* in the active recorder.
+
+    Unlike :meth:`MetricsRecorder.instrument_engine`, the counts go to whichever
+    recorder is active when a statement is executed, so an engine that is
+    reused across several runs is instrumented only once.
+    """
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        current().incr(f"{prefix}.queries")
+
+    @event.listens_for(engine, "commit")
+    def _count_commit(conn):
+        current().incr(f"{prefix}.commits")
+
+
+@contextmanager
+def recording(stage: str) -> Iterator[MetricsRecorder]:
+    """Activate a fresh :class:`MetricsRecorder` for the enclosed block."""
+
+    global _active
+    previous = _active
+    _active = MetricsRecorder(stage)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+__all__ = ["MetricsRecorder", "current", "instrument_engine", "peak_rss_kb", "recording"]
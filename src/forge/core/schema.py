@@ -8,6 +8,7 @@ from sqlalchemy import (
     Integer,
     String,
     DateTime,
+    Float,
     Enum as SQLAlchemyEnum,
     Text,
     ForeignKey,
@@ -88,7 +89,8 @@ class ProjectState(Base):
         "FileRecord",
         back_populates="project",
         cascade="all, delete-orphan",
-        lazy="joined"
+        # Projects have tens of thousands of files; load them only on access
+        lazy="select"
     )
 
     def __repr__(self):
@@ -130,4 +132,77 @@ class FileRecord(Base):
     )
 
     def __repr__(self):
-        return f"<FileRecord(path='{self.source_path}', status='{self.status.value}')>"
\ No newline at end of file
+        return f"<FileRecord(path='{self.source_path}', status='{self.status.value}')>"
+
+class ModuleDefinition(Base):
+    """
+    SQLAlchemy model: A module defined by a source file.
+    """
+    __tablename__ = 'module_definitions'
+
+    id = Column(Integer, primary_key=True)
+    file_id = Column(
+        Integer, ForeignKey('file_records.id', ondelete='CASCADE'), nullable=False
+    )
+    name = Column(Text, nullable=False, doc="Module name")
+
+    __table_args__ = (
+        Index('ix_module_definitions_file_id', 'file_id'),
+        Index('ix_module_definitions_name', 'name'),
+    )
+
+    def __repr__(self):
+        return f"<ModuleDefinition(name='{self.name}')>"
+
+
+class ModuleUse(Base):
+    """
+    SQLAlchemy model: A module used by the program units of a source file.
+
+    Together with :class:`ModuleDefinition` this forms the module dependency
+    graph of the project, recorded by ``forge transform``.
+    """
+    __tablename__ = 'module_uses'
+
+    id = Column(Integer, primary_key=True)
+    file_id = Column(
+        Integer, ForeignKey('file_records.id', ondelete='CASCADE'), nullable=False
+    )
+    module_name = Column(
+        Text, nullable=True, doc="Using module; NULL for subprograms outside of modules"
+    )
+    used_module = Column(Text, nullable=False, doc="Name of the used module")
+
+    __table_args__ = (
+        Index('ix_module_uses_file_id', 'file_id'),
+        Index('ix_module_uses_used_module', 'used_module'),
+    )
+
+    def __repr__(self):
+        return f"<ModuleUse(module='{self.module_name}', uses='{self.used_module}')>"
+
+
+class RunRecord(Base):
+    """
+    SQLAlchemy model: Summary of one run of a pipeline stage.
+    """
+    __tablename__ = 'run_history'
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(
+        Integer, ForeignKey('project_state.id', ondelete='CASCADE'), nullable=False
+    )
+    run_id = Column(String(64), nullable=False, doc="Identifier of the run's metrics file")
+    stage = Column(String(32), nullable=False, doc="Pipeline stage, e.g. 'extract'")
+    started = Column(DateTime, nullable=False, doc="Start time of the run")
+    finished = Column(DateTime, nullable=False, doc="End time of the run")
+    files_processed = Column(Integer, nullable=False, default=0, doc="Files processed by the run")
+    files_failed = Column(Integer, nullable=False, default=0, doc="Files that failed")
+    throughput = Column(Float, nullable=True, doc="Processed files per second")
+
+    __table_args__ = (
+        Index('ix_run_history_stage_started', 'stage', 'started'),
+    )
+
+    def __repr__(self):
+        return f"<RunRecord(stage='{self.stage}', started='{self.started}')>"
@@ -0,0 +1,128 @@
+"""Deterministic partitioning of a project into shards.
+
+Very large code bases are extracted and transformed on several machines at
+once.  ``--shard I/N`` restricts a command to the source files whose path
+hashes to shard ``I`` of ``N``; the partition only depends on the relative
+source path, so it is the same on every host and in every run.
+
+Each shard keeps its own state database and artifacts under
+``.forge/shards/<I>-of-<N>``, so shards running on different hosts against a
+shared file system never write to the same SQLite database.  Paths recorded
+in a shard's state database are relative to the project root, like those of
+the main state database, so the fragments can be merged into it afterwards.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+import hashlib
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from .schema import Base, ProjectState
+
+#: Directory below ``.forge`` holding the state fragments of all shards.
+SHARDS_DIR = "shards"
+
+#: File name of a state database.
+STATE_DB = "forge.sqlite3"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Shard ``index`` (1-based) of a partition into ``count`` shards."""
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            raise ValueError(f"invalid shard {self.index}/{self.count}")
+
+    @classmethod
+    def parse(cls, spec: str) -> Shard:
+        """Parse a shard specification of the form ``I/N``.
+
+        Raises:
+            ValueError: If *spec* is malformed or ``I`` is not in ``1..N``.
+        """
+
+        index, sep, count = spec.partition("/")
+        if not sep or not index.strip().isdigit() or not count.strip().isdigit():
+            raise ValueError(f"expected I/N, e.g. 1/4, got {spec!r}")
+        return cls(int(index), int(count))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    @property
+    def name(self) -> str:
+        """Directory name of the shard, e.g. ``2-of-8``."""
+
+        return f"{self.index}-of-{self.count}"
+
+    def contains(self, source_path: str | PurePath) -> bool:
+        """Whether the file at *source_path*, relative to the project root, belongs to this shard."""
+
+        return shard_index(source_path, self.count) == self.index
+
+    def directory(self, forge_dir: Path) -> Path:
+        """Directory holding the state database and artifacts of this shard."""
+
+        return forge_dir / SHARDS_DIR / self.name
+
+
+def shard_index(source_path: str | PurePath, count: int) -> int:
+    """Return the 1-based shard of *source_path* in a partition into *count* shards."""
+
+    key = PurePath(source_path).as_posix().encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def prepare_shard(project_root: Path, shard: Shard) -> Path:
+    """Create the state database of *shard* unless it exists.
+
+    The project is registered in the new database under the name and Forge
+    version of the main state database.
+
+    Returns:
+        The directory of the shard.
+
+    Raises:
+        FileNotFoundError: If the project has not been initialised.
+    """
+
+    forge_dir = project_root / ".forge"
+    directory = shard.directory(forge_dir)
+    db_path = directory / STATE_DB
+    if db_path.exists():
+        return directory
+
+    main_db = forge_dir / STATE_DB
+    if not main_db.exists():
+        raise FileNotFoundError(f"{main_db} does not exist; run 'forge init' first")
+    engine = create_engine(f"sqlite:///{main_db}")
+    try:
+        with Session(engine) as session:
+            name, version = session.execute(
+                select(ProjectState.project_name, ProjectState.forge_version)
+            ).one()
+    finally:
+        engine.dispose()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.execute(insert(ProjectState).values(project_name=name, forge_version=version))
+            session.commit()
+    finally:
+        engine.dispose()
+    return directory
+
+
+__all__ = ["SHARDS_DIR", "STATE_DB", "Shard", "prepare_shard", "shard_index"]
@@ -0,0 +1,55 @@
+"""In-memory snapshots of SQLite databases.
+
+``forge resolve --in-memory`` runs the resolution tasks, which issue millions
+of small queries, against a copy of the target database held in memory
+instead of against the file.  The copy is taken and written back with the
+SQLite online backup API, which copies the database page by page without
+going through SQL.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+
+def _require_sqlite(engine: Engine) -> None:
+    if engine.dialect.name != "sqlite":
+        raise ValueError(f"{engine.url.render_as_string()} is not an SQLite database")
+
+
+def copy_database(source: Engine, target: Engine) -> None:
+    """Replace the content of the SQLite database of *target* with that of *source*.
+
+    Raises:
+        ValueError: If either engine is not connected to SQLite.
+    """
+
+    _require_sqlite(source)
+    _require_sqlite(target)
+    with source.connect() as src, target.connect() as dst:
+        src.connection.driver_connection.backup(dst.connection.driver_connection)
+
+
+def memory_snapshot(engine: Engine) -> Engine:
+    """Copy the SQLite database of *engine* into a new in-memory database.
+
+    All connections of the returned engine share the same in-memory
+    database, which is discarded when the engine is disposed of.
+
+    Raises:
+        ValueError: If *engine* is not connected to SQLite.
+    """
+
+    _require_sqlite(engine)
+    snapshot = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    copy_database(engine, snapshot)
+    return snapshot
+
+
+__all__ = ["copy_database", "memory_snapshot"]
@@ -0,0 +1,349 @@
+"""Set based access to the project state database.
+
+The pipeline commands process thousands of files per run.  Looking up and
+updating their :class:`~forge.core.schema.FileRecord` rows one ORM query at a
+time makes the bookkeeping at the end of a run a noticeable part of it, so the
+helpers in this module fetch the rows of a project with a single query and
+write changes back with executemany-style bulk ``INSERT`` and ``UPDATE``
+statements.  The project itself is accessed through :func:`get_project_id` and
+:func:`set_project_status`, which never touch the file records, and the
+records a command works on are streamed with :func:`iter_file_records`.
+
+Every command run is summarised in the run history (:func:`record_run`), and
+``forge status`` reports the project with aggregate queries only
+(:func:`status_counts`, :func:`failed_files` and :func:`recent_runs`).
+
+Long running commands commit their results through a :class:`Checkpointer`
+every few hundred files or seconds rather than once at the very end, so that
+an interrupted run loses at most one checkpoint worth of work and a restarted
+command resumes where the previous one stopped.
+
+``forge transform`` also records which modules every file defines and uses;
+:func:`file_waves` turns that module dependency graph into the order in which
+``forge load`` processes the files.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Collection, Generic, Iterable, Iterator, Mapping, TypeVar
+import datetime as _dt
+import logging
+import time
+
+from sqlalchemy import Row, delete, func, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .graph import topological_waves
+from .metrics import MetricsRecorder, current
+from .schema import (
+    FileRecord,
+    FileStatus,
+    ModuleDefinition,
+    ModuleUse,
+    ProjectFSMStatus,
+    ProjectState,
+    RunRecord,
+)
+
+#: File statuses of files that failed a stage.
+FAILED_STATUSES = (FileStatus.FAILED_EXTRACT, FileStatus.FAILED_TRANSFORM, FileStatus.FAILED_LOAD)
+
+#: Commit pending results once this many have accumulated ...
+CHECKPOINT_FILES = 500
+
+#: ... or once this many seconds have passed since the last commit.
+CHECKPOINT_SECONDS = 30.0
+
+#: Number of file records fetched per round trip while streaming.
+STREAM_BATCH_SIZE = 1000
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def get_project_id(session: Session) -> int:
+    """Return the primary key of the project, without loading its files."""
+
+    return session.scalars(select(ProjectState.id)).one()
+
+
+def set_project_status(session: Session, project_id: int, status: ProjectFSMStatus) -> None:
+    """Move the project to *status*; the caller commits."""
+
+    session.execute(
+        update(ProjectState).where(ProjectState.id == project_id).values(fsm_status=status)
+    )
+
+
+def iter_file_records(
+    session: Session,
+    project_id: int,
+    *columns,
+    status: FileStatus | None = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> Iterator[Row]:
+    """Stream the requested *columns* of the file records of a project.
+
+    Rows are fetched *batch_size* at a time from a server-side cursor, so
+    memory use does not grow with the number of files.
+
+    Args:
+        session: Session bound to the state database.
+        project_id: Primary key of the :class:`ProjectState`.
+        *columns: ``FileRecord`` attributes to fetch in addition to
+            ``source_path`` and ``id``.
+        status: Only yield records in this status.
+        batch_size: Number of rows fetched per round trip.
+    """
+
+    stmt = select(FileRecord.source_path, FileRecord.id, *columns).where(
+        FileRecord.project_id == project_id
+    )
+    if status is not None:
+        stmt = stmt.where(FileRecord.status == status)
+    yield from session.execute(stmt.execution_options(yield_per=batch_size))
+
+
+def file_rows(session: Session, project_id: int, *columns) -> dict[str, Row]:
+    """Return the requested *columns* of all file records of a project.
+
+    Args:
+        session: Session bound to the state database.
+        project_id: Primary key of the :class:`ProjectState`.
+        *columns: ``FileRecord`` attributes to fetch in addition to ``id``.
+
+    Returns:
+        Rows keyed by ``source_path``.
+    """
+
+    return {row.source_path: row for row in iter_file_records(session, project_id, *columns)}
+
+
+def write_file_records(
+    session: Session,
+    inserts: Iterable[dict[str, Any]] = (),
+    updates: Iterable[dict[str, Any]] = (),
+) -> None:
+    """Insert and update file records in bulk.
+
+    Args:
+        session: Session bound to the state database; the caller commits.
+        inserts: Column values of new records.
+        updates: Column values of existing records, each including the
+            primary key ``id``.  Only the given columns are updated.
+    """
+
+    inserts = list(inserts)
+    updates = list(updates)
+    if inserts:
+        session.execute(insert(FileRecord), inserts)
+    if updates:
+        session.execute(update(FileRecord), updates)
+
+
+def write_module_graph(
+    session: Session,
+    graphs: Mapping[int, tuple[Iterable[str], Iterable[tuple[str | None, str]]]],
+) -> None:
+    """Replace the module dependency graph recorded for some files.
+
+    Args:
+        session: Session bound to the state database; the caller commits.
+        graphs: For each file record id, the names of the modules the file
+            defines and its ``(module_name, used_module)`` pairs.
+            ``module_name`` is ``None`` for subprograms outside of modules.
+    """
+
+    if not graphs:
+        return
+    ids = list(graphs)
+    session.execute(delete(ModuleDefinition).where(ModuleDefinition.file_id.in_(ids)))
+    session.execute(delete(ModuleUse).where(ModuleUse.file_id.in_(ids)))
+    definitions = [
+        {"file_id": file_id, "name": name}
+        for file_id, (defined, _uses) in graphs.items()
+        for name in defined
+    ]
+    uses = [
+        {"file_id": file_id, "module_name": module_name, "used_module": used}
+        for file_id, (_defined, used_modules) in graphs.items()
+        for module_name, used in used_modules
+    ]
+    if definitions:
+        session.execute(insert(ModuleDefinition), definitions)
+    if uses:
+        session.execute(insert(ModuleUse), uses)
+
+
+def file_waves(session: Session, file_ids: Collection[int]) -> list[list[int]]:
+    """Order files so that modules are processed before the files using them.
+
+    A file depends on the files among *file_ids* that define a module it
+    uses.  Files without a recorded module graph have no dependencies.
+
+    Returns:
+        The ids of *file_ids* in waves, see
+        :func:`~forge.core.graph.topological_waves`.
+    """
+
+    # The graph of a project is small; filtering it here avoids binding
+    # thousands of ids
+    dependencies: dict[int, set[int]] = {file_id: set() for file_id in file_ids}
+    owners: dict[str, int] = {}
+    for file_id, name in session.execute(select(ModuleDefinition.file_id, ModuleDefinition.name)):
+        if file_id in dependencies:
+            owners[name] = file_id
+    for file_id, used in session.execute(select(ModuleUse.file_id, ModuleUse.used_module)):
+        if file_id in dependencies and used in owners:
+            dependencies[file_id].add(owners[used])
+    return topological_waves(dependencies)
+
+
+def status_counts(session: Session) -> dict[FileStatus, int]:
+    """Return the number of files in each status.
+
+    The state database holds a single project, so the counts are taken over
+    all file records, which lets SQLite answer from the status index alone.
+    """
+
+    stmt = select(FileRecord.status, func.count()).group_by(FileRecord.status)
+    return {status: count for status, count in session.execute(stmt)}
+
+
+def failed_files(session: Session, limit: int | None = None) -> list[Row]:
+    """Return ``source_path``, ``status`` and ``error_message`` of failed files."""
+
+    stmt = (
+        select(FileRecord.source_path, FileRecord.status, FileRecord.error_message)
+        .where(FileRecord.status.in_(FAILED_STATUSES))
+        .order_by(FileRecord.source_path)
+        .limit(limit)
+    )
+    return list(session.execute(stmt))
+
+
+def record_run(engine: Engine, recorder: MetricsRecorder, files: int | None = None) -> None:
+    """Append the run measured by *recorder* to the run history.
+
+    Args:
+        engine: Engine of the state database.
+        recorder: Metrics of the finished run.
+        files: Number of files the run processed; defaults to the number of
+            files *recorder* has timings for.
+    """
+
+    elapsed = recorder.elapsed
+    files = len(recorder.files) if files is None else files
+    # State databases created before the run history was introduced lack it
+    RunRecord.__table__.create(engine, checkfirst=True)
+    with Session(engine) as session:
+        session.execute(
+            insert(RunRecord).values(
+                project_id=select(ProjectState.id).scalar_subquery(),
+                run_id=recorder.run_id,
+                stage=recorder.stage,
+                started=recorder.started,
+                finished=recorder.started + _dt.timedelta(seconds=elapsed),
+                files_processed=files,
+                files_failed=recorder.counters.get("files.failed", 0),
+                throughput=files / elapsed if elapsed else None,
+            )
+        )
+        session.commit()
+
+
+def recent_runs(session: Session, limit: int = 10, stage: str | None = None) -> list[RunRecord]:
+    """Return the latest runs, most recent first."""
+
+    stmt = select(RunRecord).order_by(RunRecord.started.desc()).limit(limit)
+    if stage is not None:
+        stmt = stmt.where(RunRecord.stage == stage)
+    return list(session.scalars(stmt))
+
+
+class Checkpointer(Generic[T]):
+    """Commit the results of a long running command in batches.
+
+    Args:
+        engine: Engine of the state database.
+        write: Called with a fresh session and the pending results; the
+            changes it makes are committed afterwards.
+        span: Name of the metrics span each checkpoint is timed under.
+        every: Number of pending results that triggers a checkpoint.
+        interval: Seconds since the last checkpoint that trigger one.
+
+    Used as a context manager, the results added so far are committed on exit
+    even if the command fails, since every one of them is complete.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        write: Callable[[Session, list[T]], None],
+        span: str = "state.checkpoint",
+        every: int = CHECKPOINT_FILES,
+        interval: float = CHECKPOINT_SECONDS,
+    ) -> None:
+        self.engine = engine
+        self.write = write
+        self.span = span
+        self.every = every
+        self.interval = interval
+        self.checkpoints = 0
+        self._pending: list[T] = []
+        self._last = time.monotonic()
+
+    def __enter__(self) -> Checkpointer[T]:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        try:
+            self.flush()
+        except Exception:  # pragma: no cover - best effort
+            logger.warning("Could not save the results of the interrupted run", exc_info=True)
+
+    def add(self, result: T) -> None:
+        """Queue *result* and commit the queue if a checkpoint is due."""
+
+        self._pending.append(result)
+        if (
+            len(self._pending) >= self.every
+            or time.monotonic() - self._last >= self.interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit all pending results now."""
+
+        if self._pending:
+            with current().span(self.span), Session(self.engine) as session:
+                self.write(session, self._pending)
+                session.commit()
+            self._pending = []
+            self.checkpoints += 1
+        self._last = time.monotonic()
+
+
+__all__ = [
+    "CHECKPOINT_FILES",
+    "CHECKPOINT_SECONDS",
+    "FAILED_STATUSES",
+    "STREAM_BATCH_SIZE",
+    "Checkpointer",
+    "failed_files",
+    "file_rows",
+    "file_waves",
+    "get_project_id",
+    "iter_file_records",
+    "recent_runs",
+    "record_run",
+    "set_project_status",
+    "status_counts",
+    "write_file_records",
+    "write_module_graph",
+]
@@ -0,0 +1,190 @@
+"""Discovery of the Fortran source files belonging to a project.
+
+Each configured source directory is walked exactly once with :func:`os.scandir`.
+Include patterns are glob patterns relative to the source directory (``**``
+matches any number of directories) and exclude patterns are ``fnmatch``
+patterns relative to the project root; both are compiled into a single regular
+expression up front.  Directories that an exclude pattern matches, or whose
+whole content it matches (e.g. ``src/vendor/*``), are pruned without being
+listed.  Large or network-mounted trees can be scanned with a thread pool that
+fans out over subdirectories.  The modification time of every matching file is
+taken from the directory entry while scanning, so that callers do not need to
+``stat`` the files a second time.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+import fnmatch
+import os
+import re
+from typing import Callable, Pattern
+
+from ...config.models import SourcesModel
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one path segment of a glob pattern into a regex."""
+
+    out: list[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = segment.find("]", i + 1 if i < n and segment[i] in "!]" else i)
+            if j == -1:
+                out.append(re.escape(c))
+                continue
+            body = segment[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def translate_glob(pattern: str) -> str:
+    """Translate a recursive glob *pattern* into an anchored regex."""
+
+    parts = pattern.replace(os.sep, "/").split("/")
+    out: list[str] = []
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if part == "**":
+            out.append(".*" if last else "(?:[^/]+/)*")
+        else:
+            out.append(_translate_segment(part) + ("" if last else "/"))
+    return "(?s:" + "".join(out) + r")\Z"
+
+
+def _compile(patterns: list[str], translate: Callable[[str], str]) -> Pattern[str] | None:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{translate(p)})" for p in patterns))
+
+
+class SourceMatcher:
+    """Precompiled include/exclude matchers of a ``[sources]`` table."""
+
+    def __init__(self, sources: SourcesModel) -> None:
+        self._include = _compile(sources.include_patterns, translate_glob)
+        self._exclude = _compile(
+            [os.path.normcase(p) for p in sources.exclude_patterns],
+            fnmatch.translate,
+        )
+
+    def includes(self, rel_to_source_dir: str) -> bool:
+        return self._include is not None and self._include.match(rel_to_source_dir) is not None
+
+    def excludes(self, rel_to_root: str) -> bool:
+        return (
+            self._exclude is not None
+            and self._exclude.match(os.path.normcase(rel_to_root)) is not None
+        )
+
+    def prunes(self, rel_dir_to_root: str) -> bool:
+        return self.excludes(rel_dir_to_root) or self.excludes(rel_dir_to_root + "/")
+
+
+def _scan(
+    directory: str, rel_base: str, rel_root: str, matcher: SourceMatcher
+) -> tuple[list[tuple[str, float]], list[tuple[str, str, str]]]:
+    """List one directory.
+
+    Returns the matching files (relative to the project root) with their
+    modification times and the subdirectories still to visit as
+    ``(path, rel_base, rel_root)`` tuples.
+    """
+
+    files: list[tuple[str, float]] = []
+    subdirs: list[tuple[str, str, str]] = []
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return files, subdirs
+    with it:
+        for entry in it:
+            # Like ``glob``, wildcards never match hidden files or directories
+            if entry.name.startswith("."):
+                continue
+            base_rel = f"{rel_base}{entry.name}"
+            root_rel = f"{rel_root}{entry.name}"
+            if entry.is_dir():
+                if not matcher.prunes(root_rel):
+                    subdirs.append((entry.path, base_rel + "/", root_rel + "/"))
+            elif matcher.includes(base_rel) and not matcher.excludes(root_rel):
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:  # e.g. a dangling symbolic link
+                    continue
+                files.append((root_rel, mtime))
+    return files, subdirs
+
+
+def discover_source_files(
+    project_root: Path, sources: SourcesModel, workers: int | None = None
+) -> dict[Path, float]:
+    """Return the source files of a project with their modification times.
+
+    Args:
+        project_root: Path to the Forge project root directory.
+        sources: The ``[sources]`` configuration table.
+        workers: Number of threads scanning directories concurrently; defaults
+            to ``sources.scan_workers``.
+
+    Returns:
+        ``st_mtime`` of every matching source file, keyed by its absolute
+        path, in sorted path order.
+    """
+
+    matcher = SourceMatcher(sources)
+    workers = sources.scan_workers if workers is None else workers
+
+    roots: list[tuple[str, str, str]] = []
+    for src_dir in sources.source_dirs:
+        base = os.path.normpath(project_root / src_dir)
+        rel_root = os.path.relpath(base, project_root).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root + "/"
+        roots.append((base, "", rel_root))
+
+    found: dict[str, float] = {}
+    if workers <= 1:
+        stack = list(reversed(roots))
+        while stack:
+            files, subdirs = _scan(*stack.pop(), matcher)
+            found.update(files)
+            stack.extend(reversed(subdirs))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(_scan, *root, matcher) for root in roots}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    found.update(files)
+                    for subdir in subdirs:
+                        pending.add(executor.submit(_scan, *subdir, matcher))
+
+    return {project_root / rel: found[rel] for rel in sorted(found)}
+
+
+def collect_source_files(
+    project_root: Path, sources: SourcesModel, workers: int | None = None
+) -> list[Path]:
+    """Return the sorted, de-duplicated source files of a project.
+
+    See :func:`discover_source_files` for the arguments.
+    """
+
+    return list(discover_source_files(project_root, sources, workers))
+
+
+__all__ = ["SourceMatcher", "collect_source_files", "discover_source_files", "translate_glob"]
@@ -4,6 +4,9 @@ from fparser.two.utils import FortranSyntaxError
 import logging
 import time
 from fparser.two.Fortran2003 import Module, Subroutine_Subprogram, Function_Subprogram, Program
+from typing import Callable, Iterable
+
+from .split import scan_program_units, shift_line_numbers, stitch_program_units, unit_sources
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +55,10 @@ def extract_from_fortran_string(
                 logger.error("Final attempt failed with syntax error: %s", exc)
                 return None
                 
+        except MemoryError:
+            # Retrying cannot help and the caller may need to recycle the process
+            raise
+
         except Exception as exc:
             last_exception = exc
             logger.warning("Error processing Fortran code (attempt %d/%d): %s", 
@@ -76,6 +83,53 @@ def extract_from_fortran_string(
                 MAX_RETRIES, last_exception)
     return None
 
+def extract_unit_from_fortran_string(
+        fortran_string: str,
+        line_offset: int,
+    ) -> Program | None:
+    """Parse an excerpt of a file that starts after *line_offset* lines."""
+    ast = extract_from_fortran_string(fortran_string)
+    if ast is not None:
+        shift_line_numbers(ast, line_offset)
+    return ast
+
+def extract_units_from_fortran_string(
+        fortran_string: str,
+        map_func: Callable[..., Iterable] = map,
+        min_lines: int = 0,
+    ) -> tuple[Program | None, list[str]]:
+    """Parse a Fortran source unit by unit and stitch the results together.
+
+    Sources with at least *min_lines* lines and more than one top-level
+    program unit are split with :func:`~.split.scan_program_units`; each unit
+    is parsed on its own, so a syntax error only loses the offending unit.
+    Other sources are parsed as a whole.
+
+    Args:
+        fortran_string:   Fortran source code.
+        map_func:         ``map``-like callable used to parse the units, e.g. the
+                          ``map`` method of a process pool executor.
+        min_lines:        Minimum number of lines of a source worth splitting.
+    Returns:
+        The AST (``None`` if nothing could be parsed) and descriptions of the
+        units that failed to parse.
+    """
+    units = None
+    if fortran_string.count("\n") >= min_lines:
+        units = scan_program_units(fortran_string)
+    if not units or len(units) < 2:
+        return extract_from_fortran_string(fortran_string), []
+
+    asts = list(
+        map_func(
+            extract_unit_from_fortran_string,
+            unit_sources(fortran_string, units),
+            [unit.start for unit in units],
+        )
+    )
+    failed = [unit.describe() for unit, ast in zip(units, asts) if ast is None]
+    return stitch_program_units([ast for ast in asts if ast is not None]), failed
+
 def pickup_module_ast(ast: Program) -> Module:
     """Extract the first module from a program AST.
     
@@ -0,0 +1,75 @@
+"""Content fingerprints of source files.
+
+``forge extract`` decides whether a file has to be parsed again by comparing
+the SHA-256 digest of its content with the one recorded for it.  The digest is
+computed over the raw bytes of the file, read in large chunks into a reused
+buffer, so that unchanged files are never decoded and no copy of their
+content is made.  Files are hashed by a thread pool: :mod:`hashlib` releases
+the GIL while hashing, and on network filesystems most of the time is spent
+waiting for reads anyway.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import os
+from typing import Iterable, NamedTuple
+
+#: Size of the reads a file is hashed in.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+#: Threads used to hash files; hashing is mostly bound by I/O.
+HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class Fingerprint(NamedTuple):
+    """Digest and line count of a source file's raw bytes."""
+
+    digest: str
+    """Hex encoded SHA-256 digest of the raw bytes."""
+
+    lines: int
+    """Number of line feeds in the file."""
+
+
+def fingerprint_file(path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> Fingerprint:
+    """Hash the raw bytes of the file at *path*."""
+
+    digest = hashlib.sha256()
+    lines = 0
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            digest.update(view[:n])
+            lines += buffer.count(b"\n", 0, n)
+    return Fingerprint(digest.hexdigest(), lines)
+
+
+def fingerprint_files(
+    paths: Iterable[Path], workers: int = HASH_WORKERS
+) -> dict[Path, Fingerprint]:
+    """Hash many files concurrently.
+
+    Files that cannot be read, e.g. because they were removed since they were
+    discovered, are left out of the result.
+    """
+
+    def _fingerprint(path: Path) -> Fingerprint | None:
+        try:
+            return fingerprint_file(path)
+        except OSError:
+            return None
+
+    paths = list(paths)
+    if workers <= 1 or len(paths) <= 1:
+        results = map(_fingerprint, paths)
+        return {p: fp for p, fp in zip(paths, results) if fp is not None}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_fingerprint, paths)
+        return {p: fp for p, fp in zip(paths, results) if fp is not None}
+
+
+__all__ = ["Fingerprint", "HASH_CHUNK_SIZE", "HASH_WORKERS", "fingerprint_file", "fingerprint_files"]
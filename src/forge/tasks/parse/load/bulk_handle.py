@@ -22,6 +22,8 @@ from fpyevolve_core.db.schema.fortrans import (
 )
 from fpyevolve_core.keys.fortran import ModuleKey, SubprogramKey
 
+from ....core.metrics import current
+
 from fpyevolve_core.models.fortran import (
     FortranDeclaredEntity,
     FortranDerivedTypeDefinition,
@@ -45,6 +47,7 @@ class BulkHandle:
         if not rows_list:
             return
         self._session.add_all(rows_list)
+        current().incr(f"rows.{rows_list[0].__tablename__}", len(rows_list))
     
     def commit(self) -> None:
         self._session.commit()
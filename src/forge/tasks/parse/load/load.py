@@ -1,6 +1,8 @@
 from typing import Iterable, Mapping, Sequence
+from sqlalchemy import select, update
 from sqlalchemy.orm.session import Session
 
+from fpyevolve_core.db.schema.fortrans import FortranModule, FortranUse
 from fpyevolve_core.keys.fortran import ModuleKey, SubprogramKey
 from fpyevolve_core.models.fortran import (
     FortranDeclaredEntity,
@@ -39,6 +41,30 @@ def load_uses(session: Session, hosts: Iterable[ModuleKey | SubprogramKey], uses
         handle.add_uses(source_module_id, source_subprogram_id, targets)
 
 
+def relink_uses(session: Session) -> int:
+    """Point uses recorded by module name at modules that now exist.
+
+    Returns:
+        The number of uses that were linked.
+    """
+
+    target_id = (
+        select(FortranModule.id)
+        .where(FortranModule.name == FortranUse.target_module_name)
+        .scalar_subquery()
+    )
+    result = session.execute(
+        update(FortranUse)
+        .where(
+            FortranUse.target_module_id.is_(None),
+            FortranUse.target_module_name.in_(select(FortranModule.name)),
+        )
+        .values(target_module_id=target_id, target_module_name=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
 def load_signatures_from_subprogram(
     session: Session,
     subprogram_ids: Iterable[SubprogramKey],
@@ -48,8 +74,7 @@ def load_signatures_from_subprogram(
     query_handle = QueryHandle(session)
     for sp_id, signature in zip(subprogram_ids, signatures):
         sp_id = query_handle.subprogram_id(sp_id)
-    handle = BulkHandle(session)
-    handle.add_signatures(sp_id, signature)
+        bulk_handle.add_signatures(sp_id, signature)
 
 
 def load_symbol_table_from_module(
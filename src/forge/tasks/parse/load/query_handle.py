@@ -46,22 +46,25 @@ class QueryHandle:
         self.session = session
 
     # basic lookup helpers -------------------------------------------------
-    def module_id(self, mod: ModuleKey) -> int:
+    def module_id(self, mod: ModuleKey) -> int | None:
+        # External subprograms have no host module; their keys have no module name
+        if not mod.module_name:
+            return None
         row = self.session.query(FortranModule).filter_by(name=mod.module_name).one()
         return row.id
 
     def subprogram_id(self, sp: SubprogramKey) -> int:
-        row = (
-            self.session.query(FortranSubprogram)
-            .join(FortranModule, FortranSubprogram.module_id == FortranModule.id)
-            .filter(
-                FortranModule.name == sp.module_name,
-                FortranSubprogram.name == sp.subprogram_name,
-                FortranSubprogram.type == SubprogramType(sp.subprogram_type),
-            )
-            .one()
+        q = self.session.query(FortranSubprogram).filter(
+            FortranSubprogram.name == sp.subprogram_name,
+            FortranSubprogram.type == SubprogramType(sp.subprogram_type),
         )
-        return row.id
+        if sp.module_name:
+            q = q.join(FortranModule, FortranSubprogram.module_id == FortranModule.id).filter(
+                FortranModule.name == sp.module_name
+            )
+        else:
+            q = q.filter(FortranSubprogram.module_id.is_(None))
+        return q.one().id
 
     def module_ids(self, names: Iterable[str]) -> dict[str, int]:
         name_set = set(names)
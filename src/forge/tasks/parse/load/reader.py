@@ -0,0 +1,130 @@
+"""Incremental reader for the JSON semantics written by ``forge transform``.
+
+Decoding a semantics document with ``json.loads`` and validating it as a whole
+keeps the text, the decoded dicts and the validated models of the entire file
+in memory at once.  :func:`iter_file_semantics` walks the two top-level
+objects of the document itself and decodes one module or subprogram entry at
+a time, reading the file in chunks, so that memory use is bounded by the
+largest single entry rather than by the size of the file.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterator, TextIO
+
+from ..transform.writer import SECTIONS
+
+#: Number of characters read from the underlying stream at once.
+CHUNK_SIZE = 256 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Buffer:
+    """Sliding window over a text stream."""
+
+    def __init__(self, fp: TextIO, chunk_size: int) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, at_least: int = 0) -> None:
+        """Drop the consumed prefix and read at least one more chunk."""
+
+        chunk = self.fp.read(max(self.chunk_size, at_least))
+        if not chunk:
+            self.eof = True
+        self.text = self.text[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or ``""`` at the end."""
+
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) or self.eof:
+                return self.text[self.pos : self.pos + 1]
+            self.fill()
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the JSON string or object starting at the current position.
+
+        Truncated strings and objects never decode successfully, so a decoding
+        error before the end of the stream just means more input is needed.
+        Growing the window by at least its own size keeps retries linear.
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, self.pos = _DECODER.raw_decode(self.text, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill(len(self.text) - self.pos)
+
+
+def iter_file_semantics(
+    fp: TextIO, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str, str, dict]]:
+    """Yield the entries of a semantics document one at a time.
+
+    Args:
+        fp: Text stream positioned at the start of the document.
+        chunk_size: Number of characters to read at once.
+
+    Yields:
+        ``(section, key, entry)`` tuples, where *section* is ``"modules"`` or
+        ``"subprograms"`` and *entry* is the decoded JSON object, in document
+        order.
+
+    Raises:
+        ValueError: If the document is not a valid semantics document.
+    """
+
+    buffer = _Buffer(fp, chunk_size)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+    else:
+        while True:
+            section = buffer.value()
+            buffer.expect(":")
+            if section not in SECTIONS:
+                raise ValueError(f"Unexpected section {section!r}")
+            buffer.expect("{")
+            if buffer.peek() == "}":
+                buffer.pos += 1
+            else:
+                while True:
+                    key = buffer.value()
+                    buffer.expect(":")
+                    entry = buffer.value()
+                    if not isinstance(key, str) or not isinstance(entry, dict):
+                        raise ValueError(f"Malformed entry in section {section!r}")
+                    yield section, key, entry
+                    if buffer.peek() != ",":
+                        break
+                    buffer.pos += 1
+                buffer.expect("}")
+            if buffer.peek() != ",":
+                break
+            buffer.pos += 1
+        buffer.expect("}")
+    if buffer.peek():
+        raise ValueError("Unexpected data after the end of the document")
+
+
+__all__ = ["CHUNK_SIZE", "iter_file_semantics"]
@@ -0,0 +1,133 @@
+"""Merging of SQLite databases loaded in parallel into the target database.
+
+SQLite serialises writers, so ``forge load --workers N`` has each worker load
+its files into a database file of its own and merges the files into the
+target afterwards.  :func:`merge_database` copies every table of a shard with
+one ``INSERT ... SELECT`` on the ``ATTACH``-ed shard database.
+
+Integer primary keys of the shard collide with those already in the target,
+so they are moved past the largest key of the target table (the *offset* of
+the table) and foreign keys are moved by the offset of the table they refer
+to.  Rows of tables with a natural key, e.g. modules identified by their
+name, that already exist in the target are not copied; references to them
+are mapped to the existing rows instead.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Mapping, Sequence
+
+from sqlalchemy import Integer, MetaData, Table
+from sqlalchemy.engine import Connection, Engine
+
+
+def _integer_key(table: Table) -> str | None:
+    """Return the name of the integer primary key of *table*, if it has one."""
+
+    columns = list(table.primary_key.columns)
+    if len(columns) == 1 and isinstance(columns[0].type, Integer):
+        return columns[0].name
+    return None
+
+
+def merge_database(
+    engine: Engine,
+    path: Path,
+    metadata: MetaData,
+    natural_keys: Mapping[str, Sequence[str]] | None = None,
+) -> dict[str, int]:
+    """Copy all rows of the SQLite database at *path* into *engine*'s database.
+
+    Args:
+        engine: Engine of the target database; must be SQLite.
+        path: Database file holding the tables of *metadata*.
+        metadata: Tables to copy; they are copied in dependency order.
+        natural_keys: Columns identifying the rows of a table, keyed by table
+            name.  Rows whose natural key exists in the target are not copied.
+
+    Returns:
+        The number of rows copied per table.
+    """
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ATTACH DATABASE ? AS shard", (str(path),))
+        try:
+            counts = _merge(conn, metadata, natural_keys or {})
+            conn.commit()
+        finally:
+            conn.rollback()
+            for table in natural_keys or {}:
+                conn.exec_driver_sql(f'DROP TABLE IF EXISTS temp."idmap_{table}"')
+            conn.exec_driver_sql("DETACH DATABASE shard")
+    return counts
+
+
+def _merge(
+    conn: Connection, metadata: MetaData, natural_keys: Mapping[str, Sequence[str]]
+) -> dict[str, int]:
+    quote = conn.dialect.identifier_preparer.quote
+    # Shifts of the integer keys of the tables copied so far, and the tables
+    # whose keys are translated through an id map instead
+    offsets: dict[str, int] = {}
+    mapped: set[str] = set()
+    counts: dict[str, int] = {}
+
+    for table in metadata.sorted_tables:
+        name = quote(table.name)
+        key = _integer_key(table)
+        joins: list[str] = []
+        where = ""
+
+        if key is not None:
+            offsets[table.name] = conn.exec_driver_sql(
+                f"SELECT coalesce(max({quote(key)}), 0) FROM main.{name}"
+            ).scalar_one()
+        if key is not None and table.name in natural_keys:
+            idmap = quote(f"idmap_{table.name}")
+            match = " AND ".join(
+                f"m.{quote(c)} IS s.{quote(c)}" for c in natural_keys[table.name]
+            )
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS temp.{idmap}")
+            conn.exec_driver_sql(
+                f"CREATE TEMP TABLE {idmap} AS "
+                f"SELECT s.{quote(key)} AS old, m.{quote(key)} AS existing "
+                f"FROM shard.{name} AS s LEFT JOIN main.{name} AS m ON {match}"
+            )
+            conn.exec_driver_sql(
+                f"CREATE INDEX temp.{quote(f'idmap_{table.name}_old')} ON {idmap} (old)"
+            )
+            mapped.add(table.name)
+            joins.append(f"JOIN temp.{idmap} AS k ON k.old = s.{quote(key)}")
+            where = "WHERE k.existing IS NULL"
+
+        values = []
+        for column in table.columns:
+            ref = next(iter(column.foreign_keys), None)
+            target = ref.column.table.name if ref is not None else None
+            if column.name == key:
+                values.append(f"s.{quote(key)} + {offsets[table.name]}")
+            elif target in mapped:
+                alias = f"j{len(joins)}"
+                idmap = quote(f"idmap_{target}")
+                joins.append(
+                    f"LEFT JOIN temp.{idmap} AS {alias} ON {alias}.old = s.{quote(column.name)}"
+                )
+                values.append(
+                    f"coalesce({alias}.existing, s.{quote(column.name)} + {offsets[target]})"
+                )
+            elif target in offsets:
+                values.append(f"s.{quote(column.name)} + {offsets[target]}")
+            else:
+                values.append(f"s.{quote(column.name)}")
+
+        columns = ", ".join(quote(c.name) for c in table.columns)
+        result = conn.exec_driver_sql(
+            f"INSERT INTO main.{name} ({columns}) "
+            f"SELECT {', '.join(values)} FROM shard.{name} AS s {' '.join(joins)} {where}"
+        )
+        counts[table.name] = result.rowcount
+    return counts
+
+
+__all__ = ["merge_database"]
@@ -0,0 +1,103 @@
+"""Removal of previously loaded modules from the semantics database.
+
+``forge load`` only ever adds rows.  When the source of a module changes, the
+rows loaded for its previous version have to be removed before the new version
+is loaded, and the rows of other modules pointing at them have to be detached
+so that the next ``resolve`` can point them at the new rows.
+"""
+
+from __future__ import annotations
+
+from typing import Collection
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm.session import Session
+
+from fpyevolve_core.db.schema.fortrans import (
+    FortranCall,
+    FortranDerivedType,
+    FortranIOCall,
+    FortranModule,
+    FortranSubprogram,
+    FortranSubprogramSignature,
+    FortranSymbol,
+    FortranSymbolReference,
+    FortranUse,
+)
+
+from ....core.metrics import current
+
+
+def unload_modules(
+    session: Session, names: Collection[str], external_subprograms: Collection[str] = ()
+) -> None:
+    """Delete the modules *names* together with everything loaded for them.
+
+    *external_subprograms* names subprograms loaded without a host module,
+    which are deleted the same way.  References and
+    calls of other modules that were resolved to the deleted symbols and
+    subprograms are reset to unresolved, and their uses of the deleted
+    modules are kept by name.  The caller commits.
+    """
+
+    if not names and not external_subprograms:
+        return
+    external = list(external_subprograms)
+    modules = select(FortranModule.id).where(FortranModule.name.in_(names))
+    hosted = or_(
+        FortranSubprogram.module_id.in_(modules),
+        and_(FortranSubprogram.module_id.is_(None), FortranSubprogram.name.in_(external)),
+    )
+    subprograms = select(FortranSubprogram.id).where(hosted)
+    owned = or_(
+        FortranSymbol.module_id.in_(modules), FortranSymbol.subprogram_id.in_(subprograms)
+    )
+    symbols = select(FortranSymbol.id).where(owned)
+
+    # Detach rows of other modules
+    session.execute(
+        update(FortranSymbolReference)
+        .where(FortranSymbolReference.symbol_id.in_(symbols))
+        .values(symbol_id=None)
+    )
+    session.execute(
+        update(FortranCall).where(FortranCall.callee_id.in_(subprograms)).values(callee_id=None)
+    )
+    target_name = (
+        select(FortranModule.name)
+        .where(FortranModule.id == FortranUse.target_module_id)
+        .scalar_subquery()
+    )
+    session.execute(
+        update(FortranUse)
+        .where(FortranUse.target_module_id.in_(modules))
+        .values(target_module_name=target_name, target_module_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    # Delete the rows of the modules themselves, children first
+    statements = [
+        delete(FortranSymbolReference).where(FortranSymbolReference.subprogram_id.in_(subprograms)),
+        delete(FortranCall).where(FortranCall.caller_id.in_(subprograms)),
+        delete(FortranIOCall).where(FortranIOCall.subprogram_id.in_(subprograms)),
+        delete(FortranSubprogramSignature).where(
+            FortranSubprogramSignature.subprogram_id.in_(subprograms)
+        ),
+        delete(FortranUse).where(
+            or_(
+                FortranUse.source_module_id.in_(modules),
+                FortranUse.source_subprogram_id.in_(subprograms),
+            )
+        ),
+        delete(FortranSymbol).where(owned),
+        delete(FortranDerivedType).where(FortranDerivedType.module_id.in_(modules)),
+        delete(FortranSubprogram).where(hosted),
+        delete(FortranModule).where(FortranModule.name.in_(names)),
+    ]
+    for statement in statements:
+        session.execute(statement.execution_options(synchronize_session=False))
+    current().incr("rows.unloaded_modules", len(names))
+    current().incr("rows.unloaded_subprograms", len(external))
+
+
+__all__ = ["unload_modules"]
@@ -0,0 +1,213 @@
+"""Supervised process pool for running untrusted, potentially runaway work.
+
+Some source files make the parser run for a very long time or allocate an
+unreasonable amount of memory.  :class:`SupervisedPool` runs every task in a
+worker process whose address space can be capped with ``RLIMIT_AS``; tasks
+that exceed their time budget get their worker killed, and workers that die
+or hit the memory cap are replaced, so one pathological file costs one worker
+restart instead of the whole run.
+
+Unlike :class:`concurrent.futures.ProcessPoolExecutor`, a dead or killed
+worker never breaks the pool: the offending task is reported as failed and
+all other tasks keep being processed.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from multiprocessing.connection import Connection, wait
+import multiprocessing as mp
+import time
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+try:  # ``resource`` is only available on Unix-like systems
+    import resource
+except ImportError:  # pragma: no cover - platform specific
+    resource = None
+
+
+#: Marker sent by a worker whose task ran out of memory.
+_MEMORY = "\0memory"
+
+
+def _limit_memory(limit: int) -> None:
+    if resource is None:  # pragma: no cover - platform specific
+        return
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _worker_main(conn: Connection, func: Callable[..., Any], memory_limit: int | None) -> None:
+    """Run tasks received over *conn* until told to stop."""
+
+    if memory_limit is not None:
+        _limit_memory(memory_limit)
+    while True:
+        try:
+            args = conn.recv()
+        except (EOFError, OSError):
+            return
+        if args is None:
+            return
+        try:
+            conn.send((True, func(*args)))
+        except MemoryError:
+            # The heap of this process may be left in a bad state; report the
+            # failure and let the supervisor start a fresh worker.
+            conn.send((False, _MEMORY))
+            return
+        except Exception as exc:
+            conn.send((False, str(exc)))
+
+
+class _Worker:
+    """A worker process together with the task it is currently running."""
+
+    def __init__(self, ctx, func: Callable[..., Any], memory_limit: int | None) -> None:
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child, func, memory_limit), daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.key: Hashable | None = None
+        self.started = 0.0
+        self.completed = 0
+
+    def submit(self, key: Hashable, args: tuple) -> None:
+        self.key = key
+        self.started = time.monotonic()
+        self.conn.send(args)
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class SupervisedPool:
+    """Run a function over many inputs in killable worker processes.
+
+    Args:
+        func: Module level function executed in the workers.
+        workers: Maximum number of concurrent worker processes.
+        timeout: Wall-clock seconds a single task may take before its worker
+            is killed.  ``None`` disables the limit.
+        memory_limit: Maximum address space of each worker in bytes.  ``None``
+            disables the limit.
+        max_tasks_per_worker: Replace a worker after this many tasks, which
+            bounds memory growth through fragmentation.  ``None`` keeps
+            workers for the whole run.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        workers: int,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
+        max_tasks_per_worker: int | None = None,
+    ) -> None:
+        self.func = func
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_tasks_per_worker = max_tasks_per_worker
+        methods = mp.get_all_start_methods()
+        # Forked workers start instantly and inherit the warm parser tables
+        self._ctx = mp.get_context("fork" if "fork" in methods else "spawn")
+
+    def _describe_memory(self) -> str:
+        if self.memory_limit is None:
+            return "ran out of memory"
+        return f"exceeded the memory limit of {self.memory_limit // (1024 * 1024)} MiB"
+
+    def _describe_death(self, worker: _Worker) -> str:
+        reason = f"worker process died (exit code {worker.process.exitcode})"
+        if self.memory_limit is not None:
+            reason += f"; it may have {self._describe_memory()}"
+        return reason
+
+    def imap_unordered(
+        self, tasks: Iterable[tuple[Hashable, tuple]]
+    ) -> Iterator[tuple[Hashable, Any, str | None]]:
+        """Run ``func(*args)`` for every ``(key, args)`` pair of *tasks*.
+
+        Yields:
+            ``(key, result, error)`` tuples in completion order.  ``error`` is
+            ``None`` on success and a human readable reason otherwise.
+        """
+
+        queue = deque(tasks)
+        idle: list[_Worker] = []
+        busy: dict[Connection, _Worker] = {}
+
+        try:
+            while queue or busy:
+                while queue and (idle or len(busy) < self.workers):
+                    if idle:
+                        worker = idle.pop()
+                    else:
+                        worker = _Worker(self._ctx, self.func, self.memory_limit)
+                    key, args = queue.popleft()
+                    worker.submit(key, args)
+                    busy[worker.conn] = worker
+
+                wait_for = None
+                if self.timeout is not None:
+                    deadline = min(w.started for w in busy.values()) + self.timeout
+                    wait_for = max(0.0, deadline - time.monotonic())
+
+                for conn in wait(list(busy), timeout=wait_for):
+                    worker = busy.pop(conn)
+                    try:
+                        ok, payload = conn.recv()
+                    except (EOFError, OSError):
+                        worker.process.join()
+                        error = self._describe_death(worker)
+                        worker.kill()
+                        yield worker.key, None, error
+                        continue
+
+                    worker.completed += 1
+                    if not ok and payload == _MEMORY:
+                        worker.kill()
+                        yield worker.key, None, self._describe_memory()
+                        continue
+                    if (
+                        self.max_tasks_per_worker is not None
+                        and worker.completed >= self.max_tasks_per_worker
+                    ):
+                        worker.stop()
+                    else:
+                        idle.append(worker)
+                    yield (worker.key, payload, None) if ok else (worker.key, None, payload)
+
+                if self.timeout is not None:
+                    now = time.monotonic()
+                    for conn, worker in list(busy.items()):
+                        if now - worker.started >= self.timeout:
+                            del busy[conn]
+                            worker.kill()
+                            yield worker.key, None, f"timed out after {self.timeout:g}s"
+        finally:
+            for worker in idle:
+                worker.stop()
+            for worker in busy.values():
+                worker.kill()
+
+
+__all__ = ["SupervisedPool"]
@@ -0,0 +1,232 @@
+"""Split free-form Fortran sources into independently parsable program units.
+
+A file holding dozens of modules or hundreds of external subprograms would
+otherwise be parsed as one job and dominate the critical path of a run.  The
+pre-scanner in this module finds the boundaries of the top-level program units
+(``module``, ``program``, ``subroutine``, ``function`` and ``block data``) with
+a cheap line based scan, so that the units can be parsed in parallel and the
+resulting ASTs stitched back into a single :class:`~fparser.two.Fortran2003.Program`.
+
+The scanner is deliberately conservative: whenever the layout of a file is not
+fully understood (fixed-form source, preprocessor directives, ``include``
+lines, submodules, statements outside any unit, several unit boundaries on one
+line, ...) it returns ``None`` and the file is parsed as a whole.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+
+from fparser.common.sourceinfo import get_source_info_str
+from fparser.two.Fortran2003 import Program
+from fparser.two.utils import Base
+
+_PREFIX = (
+    r"(?:(?:pure|impure|elemental|recursive|non_recursive|module|integer|real|"
+    r"double\s*precision|double\s*complex|complex|character|logical|type|class)"
+    r"\s*(?:\([^()]*(?:\([^()]*\)[^()]*)*\))?\s*(?:\*\s*\w+)?\s+)*"
+)
+_SUBPROGRAM = re.compile(_PREFIX + r"(subroutine|function)\s+(\w+)\s*(?:\(|$|result\b|bind\b)")
+_MODULE = re.compile(r"module\s+(?!procedure\b)(\w+)$")
+_PROGRAM = re.compile(r"program\s+(\w+)$")
+_BLOCK_DATA = re.compile(r"block\s*data\b\s*(\w*)$")
+_END = re.compile(
+    r"end\s*(?:(module|program|subroutine|function|block\s*data)\b\s*\w*)?$"
+)
+_UNSUPPORTED = re.compile(r"(?:submodule\b|include\s|end\s*procedure\b)")
+_LABEL = re.compile(r"^\d+\s+")
+
+
+@dataclass(frozen=True)
+class ProgramUnit:
+    """Location of a top-level program unit within a source file.
+
+    ``start`` and ``end`` are zero-based, inclusive physical line indices.
+    """
+
+    kind: str
+    name: str
+    start: int
+    end: int
+
+    def describe(self) -> str:
+        label = f"{self.kind} {self.name}" if self.name else self.kind
+        return f"{label} (lines {self.start + 1}-{self.end + 1})"
+
+
+def _strip_line(line: str, quote: str | None) -> tuple[str, str | None]:
+    """Remove comments and the contents of character literals from *line*.
+
+    Returns the code of the line and the quote character of a literal that is
+    continued on the next line, if any.
+    """
+
+    out: list[str] = []
+    for c in line:
+        if quote is not None:
+            if c == quote:
+                quote = None
+            continue
+        if c in "'\"":
+            quote = c
+            out.append("''")
+        elif c == "!":
+            break
+        else:
+            out.append(c)
+    return "".join(out), quote
+
+
+def _statements(lines: list[str]):
+    """Yield ``(first_line, last_line, statement)`` of each logical line."""
+
+    buffer: list[str] = []
+    first = 0
+    quote: str | None = None
+    for index, raw in enumerate(lines):
+        if raw.lstrip().startswith("#"):
+            raise ValueError("preprocessor directive")
+        code, quote = _strip_line(raw, quote)
+        code = code.strip()
+        if not buffer:
+            if not code:
+                continue
+            first = index
+        elif not code:
+            # Comment and blank lines may appear within a continuation
+            continue
+        elif code.startswith("&"):
+            code = code[1:]
+        if code.endswith("&"):
+            buffer.append(code[:-1])
+            continue
+        buffer.append(code)
+        yield first, index, " ".join(buffer).strip()
+        buffer = []
+    if buffer:
+        raise ValueError("unterminated continuation")
+
+
+def _classify(statement: str) -> tuple[str, str] | None:
+    """Return ``("start", kind name)`` / ``("end", "")`` for unit boundaries."""
+
+    statement = _LABEL.sub("", statement)
+    if _UNSUPPORTED.match(statement):
+        raise ValueError("unsupported statement")
+    if _END.match(statement):
+        return "end", ""
+    match = _SUBPROGRAM.match(statement)
+    if match:
+        return "start", f"{match.group(1)} {match.group(2)}"
+    for kind, pattern in (("module", _MODULE), ("program", _PROGRAM), ("block data", _BLOCK_DATA)):
+        match = pattern.match(statement)
+        if match:
+            return "start", f"{kind} {match.group(1)}"
+    return None
+
+
+def scan_program_units(text: str) -> list[ProgramUnit] | None:
+    """Find the top-level program units of a free-form Fortran source.
+
+    Args:
+        text: Fortran source code.
+
+    Returns:
+        The units in source order, or ``None`` if the file cannot be split
+        safely and has to be parsed as a whole.
+    """
+
+    if not get_source_info_str(text, ignore_encoding=True).is_free:
+        return None
+
+    lines = text.lower().splitlines()
+    units: list[ProgramUnit] = []
+    depth = 0
+    current: tuple[str, str, int] | None = None
+    try:
+        for first, last, statement in _statements(lines):
+            parts = [s.strip() for s in statement.split(";") if s.strip()]
+            kinds = [_classify(part) for part in parts]
+            if depth == 0 and kinds[0] is None:
+                # Statements outside of any unit, e.g. a main program without
+                # a PROGRAM statement
+                return None
+            if len(parts) > 1 and any(k is not None for k in kinds):
+                return None
+            for boundary in kinds:
+                if boundary is None:
+                    continue
+                what, label = boundary
+                if what == "start":
+                    if depth == 0:
+                        kind, _sep, name = label.rpartition(" ")
+                        current = (kind, name, first)
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth < 0:
+                        return None
+                    if depth == 0 and current is not None:
+                        units.append(ProgramUnit(current[0], current[1], current[2], last))
+                        current = None
+    except ValueError:
+        return None
+
+    if depth != 0:
+        return None
+    return units
+
+
+def unit_sources(text: str, units: list[ProgramUnit]) -> list[str]:
+    """Return the source of each unit.
+
+    The excerpt of a unit starts at line ``unit.start`` of *text*; see
+    :func:`shift_line_numbers`.
+    """
+
+    lines = text.splitlines()
+    return ["\n".join(lines[unit.start : unit.end + 1]) + "\n" for unit in units]
+
+
+def shift_line_numbers(ast: Base, offset: int) -> None:
+    """Add *offset* to the line spans recorded in *ast*.
+
+    Units are parsed from excerpts of their file; shifting the spans by the
+    line the excerpt starts at makes them refer to the whole file again.
+    """
+
+    if not offset:
+        return
+    seen: set[int] = set()
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        item = getattr(node, "item", None)
+        span = getattr(item, "span", None)
+        if span is not None and id(item) not in seen:
+            seen.add(id(item))
+            item.span = (span[0] + offset, span[1] + offset)
+        stack.extend(c for c in node.children if isinstance(c, Base))
+
+
+def stitch_program_units(asts: list[Program]) -> Program | None:
+    """Combine the ASTs of separately parsed units into a single program."""
+
+    if not asts:
+        return None
+    program = asts[0]
+    for other in asts[1:]:
+        for child in other.content:
+            child.parent = program
+            program.content.append(child)
+    return program
+
+
+__all__ = [
+    "ProgramUnit",
+    "scan_program_units",
+    "shift_line_numbers",
+    "stitch_program_units",
+    "unit_sources",
+]
@@ -6,13 +6,14 @@ from fparser.two.Fortran2003 import (
 )
 from .process_array_spec import process_array_spec
 from fpyevolve_core.models.fortran.attr_spec import AttrSpec
+from ..utils import construct
 
 def process_attr_specs(attr_specs: Attr_Spec_List) -> AttrSpec:
     """Process attribute specification list and return attribute dictionary"""
     attrs = {}
 
     if not attr_specs or not hasattr(attr_specs, 'items'):
-        return AttrSpec(**attrs)
+        return construct(AttrSpec, **attrs)
         
     for item in attr_specs.items:
         if isinstance(item, (Dimension_Attr_Spec, Dimension_Component_Attr_Spec)):
@@ -32,4 +33,4 @@ def process_attr_specs(attr_specs: Attr_Spec_List) -> AttrSpec:
     if attrs.get('additional_keywords') is None:
         attrs['additional_keywords'] = []
             
-    return AttrSpec(**attrs)
+    return construct(AttrSpec, **attrs)
@@ -4,7 +4,7 @@ from fpyevolve_core.models.fortran import SubroutineCall, SymbolReferenceRead
 from fparser.two.Fortran2003 import Call_Stmt
 
 from .reference_entry import from_expression
-from ..utils import get_line_number, get_name_from_node
+from ..utils import construct, get_line_number, get_name_from_node
 
 
 def from_call_stmt(call_stmt: Call_Stmt) -> SubroutineCall:
@@ -13,7 +13,8 @@ def from_call_stmt(call_stmt: Call_Stmt) -> SubroutineCall:
     line_no = get_line_number(call_stmt)
 
     if call_stmt is None:
-        return SubroutineCall(
+        return construct(
+            SubroutineCall,
             name="",
             line=-1,
             resolved_subroutine="",
@@ -34,7 +35,8 @@ def from_call_stmt(call_stmt: Call_Stmt) -> SubroutineCall:
                 if isinstance(ref, SymbolReferenceRead):
                     actual_args.append(ref)
 
-    return SubroutineCall(
+    return construct(
+        SubroutineCall,
         name=name,
         line=line_no,
         resolved_subroutine="",
@@ -4,7 +4,7 @@ from fpyevolve_core.models.fortran import FortranDeclaredEntity
 from ..attrs.process_array_spec import process_array_spec
 from ..attrs.process_type_spec import process_type_spec
 from ..attrs.process_attr_specs import process_attr_specs
-from ..utils import get_line_number
+from ..utils import construct, get_line_number
 
 def from_entity_decl(entity_decl: Entity_Decl, line_no: int, type_name: str, attrs: AttrSpec) -> FortranDeclaredEntity:
     """
@@ -36,7 +36,8 @@ def from_entity_decl(entity_decl: Entity_Decl, line_no: int, type_name: str, att
     else:
         initial_value = None
         
-    return FortranDeclaredEntity(
+    return construct(
+        FortranDeclaredEntity,
         name=name,
         line_declared=line_no,
         type_declared=type_name,
@@ -75,7 +76,7 @@ def from_type_declaration_stmt(type_declaration_stmt: Type_Declaration_Stmt) ->
     if attr_specs:
         attrs = process_attr_specs(attr_specs)
     else:
-        attrs = AttrSpec()
+        attrs = construct(AttrSpec)
     
     # Create a new container for the declarations
     entities = {}
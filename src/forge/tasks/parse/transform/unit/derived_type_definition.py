@@ -4,7 +4,7 @@ from fpyevolve_core.models.fortran import FortranDeclaredComponent, FortranDeriv
 from ..attrs.process_array_spec import process_array_spec
 from ..attrs.process_type_spec import process_type_spec
 from ..attrs.process_attr_specs import process_attr_specs
-from ..utils import get_line_number, get_name_from_node, get_component_part
+from ..utils import construct, get_line_number, get_name_from_node, get_component_part
 
 def from_component_decl(component_decl: Component_Decl, line_no: int, type_name: str, attrs: AttrSpec) -> FortranDeclaredComponent:
     """
@@ -25,12 +25,12 @@ def from_component_decl(component_decl: Component_Decl, line_no: int, type_name:
     """
     name, dimension_spec, char_length, initial_value = component_decl.items
     
-    # Create a copy of attrs to avoid modifying the original
-    attrs_dict = attrs.model_dump()
-    
-    # Process array dimensions if present and not already in attributes
+    # Process array dimensions if present and not already in attributes;
+    # every component gets its own deep copy of the attributes of the statement
+    update = {}
     if dimension_spec and not attrs.array_spec:
-        attrs_dict['array_spec'] = process_array_spec(dimension_spec)
+        update['array_spec'] = process_array_spec(dimension_spec)
+    attrs = attrs.model_copy(update=update, deep=True)
     
     # Process initial value if present
     if initial_value:
@@ -38,11 +38,12 @@ def from_component_decl(component_decl: Component_Decl, line_no: int, type_name:
     else:
         initial_value = None
         
-    return FortranDeclaredComponent(
+    return construct(
+        FortranDeclaredComponent,
         name=str(name), 
         line_declared=line_no, 
         type_declared=type_name, 
-        attributes=AttrSpec(**attrs_dict), 
+        attributes=attrs, 
         initial_value=initial_value
     )
 
@@ -77,7 +78,7 @@ def from_data_component_def_stmt(data_component_def_stmt: Data_Component_Def_Stm
     if attr_specs:
         attrs = process_attr_specs(attr_specs)
     else:
-        attrs = AttrSpec()
+        attrs = construct(AttrSpec)
     
     # Process single component declaration
     if isinstance(component_decls, Component_Decl):
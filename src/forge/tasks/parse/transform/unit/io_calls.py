@@ -12,7 +12,7 @@ from fparser.two.Fortran2003 import (
 )
 from fpyevolve_core.models.fortran import IOCall, SymbolReferenceRead, SymbolReferenceWrite
 from .reference_entry import from_expression, from_designator
-from ..utils import get_line_number, is_iterable, get_name_from_node
+from ..utils import construct, get_line_number, is_iterable, get_name_from_node
 
 
 def from_open_stmt(stmt: Open_Stmt) -> IOCall:
@@ -32,7 +32,7 @@ def from_open_stmt(stmt: Open_Stmt) -> IOCall:
                     for r in expr_refs or []:
                         if isinstance(r, SymbolReferenceRead):
                             refs.append(r)
-    return IOCall(operation="open", line=line_no, args=refs)
+    return construct(IOCall, operation="open", line=line_no, args=refs)
 
 
 def from_close_stmt(stmt: Close_Stmt) -> IOCall:
@@ -48,7 +48,7 @@ def from_close_stmt(stmt: Close_Stmt) -> IOCall:
                     for r in expr_refs or []:
                         if isinstance(r, SymbolReferenceRead):
                             refs.append(r)
-    return IOCall(operation="close", line=line_no, args=refs)
+    return construct(IOCall, operation="close", line=line_no, args=refs)
 
 
 def from_read_stmt(stmt: Read_Stmt) -> IOCall:
@@ -70,7 +70,7 @@ def from_read_stmt(stmt: Read_Stmt) -> IOCall:
         if item_list:
             for item in item_list.items:
                 refs.extend(from_designator(item, line_no))
-    return IOCall(operation="read", line=line_no, args=refs)
+    return construct(IOCall, operation="read", line=line_no, args=refs)
 
 
 def from_write_stmt(stmt: Write_Stmt) -> IOCall:
@@ -97,7 +97,7 @@ def from_write_stmt(stmt: Write_Stmt) -> IOCall:
                 for r in expr_refs or []:
                     if isinstance(r, SymbolReferenceRead):
                         refs.append(r)
-    return IOCall(operation="write", line=line_no, args=refs)
+    return construct(IOCall, operation="write", line=line_no, args=refs)
 
 
 def from_print_stmt(stmt: Print_Stmt) -> IOCall:
@@ -111,7 +111,7 @@ def from_print_stmt(stmt: Print_Stmt) -> IOCall:
                 for r in expr_refs or []:
                     if isinstance(r, SymbolReferenceRead):
                         refs.append(r)
-    return IOCall(operation="print", line=line_no, args=refs)
+    return construct(IOCall, operation="print", line=line_no, args=refs)
 
 
 def from_mpi_call_stmt(stmt: Call_Stmt) -> IOCall | None:
@@ -127,4 +127,4 @@ def from_mpi_call_stmt(stmt: Call_Stmt) -> IOCall | None:
             for r in expr_refs or []:
                 if isinstance(r, SymbolReferenceRead):
                     refs.append(r)
-    return IOCall(operation=name.lower(), line=line_no, args=refs)
+    return construct(IOCall, operation=name.lower(), line=line_no, args=refs)
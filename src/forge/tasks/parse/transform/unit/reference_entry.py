@@ -21,7 +21,7 @@ from fpyevolve_core.models.fortran import (
     SymbolReferenceWrite,
 )
 from typing import Literal
-from ..utils import is_iterable, get_name_from_node, get_line_number
+from ..utils import is_iterable, get_name_from_node, get_line_number, construct
 from collections import deque
 
 IGNORED_NODES = (
@@ -41,15 +41,14 @@ def _make_ref(name: str,
               access: Literal["read","write"],
               is_part: bool,
               comps: list[str]):
-    kwargs = {
-        "name": name,
-        "line": line,
-        "is_part_ref": is_part,
-        "component_name": comps or None     # 空列表 -> None
-    }
-    if access == "read":
-        return SymbolReferenceRead(**kwargs)
-    return SymbolReferenceWrite(**kwargs)
+    model = SymbolReferenceRead if access == "read" else SymbolReferenceWrite
+    return construct(
+        model,
+        name=name,
+        line=line,
+        is_part_ref=is_part,
+        component_name=comps or None,     # 空列表 -> None
+    )
 
 # ----------------------------------------------------------
 # 2. 公共收集函数
@@ -1,17 +1,20 @@
 from .get_specification_part import get_specification_part
 from .get_subprograms import get_subprogram_part
 from .get_component_part import get_component_part
-from .get_line_number import get_line_number
+from .get_line_number import annotate_line_numbers, get_line_number
 from .get_name_from_node import get_name_from_node
 from .is_iterable import is_iterable
 from .get_execution_part import get_execution_part
+from .construct import construct
 
 __all__ = [
     "get_specification_part",
     "get_subprogram_part",
     "get_component_part",
+    "annotate_line_numbers",
     "get_line_number",
     "get_name_from_node",
     "is_iterable",
-    "get_execution_part"
+    "get_execution_part",
+    "construct",
 ]
\ No newline at end of file
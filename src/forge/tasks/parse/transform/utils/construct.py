@@ -0,0 +1,50 @@
+import os
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+#: Environment variable enabling the cross-check of trusted construction.
+CHECK_ENV = "FORGE_CHECK_MODELS"
+
+_check = os.environ.get(CHECK_ENV, "") not in ("", "0")
+
+
+def set_model_check(enabled: bool) -> bool:
+    """
+    Enable or disable cross-checking :func:`construct` against validation.
+
+    Returns the previous setting.
+    """
+    global _check
+    previous, _check = _check, enabled
+    return previous
+
+
+def construct(model: type[M], **fields) -> M:
+    """
+    Build a transformer output model from trusted fields without validation.
+
+    The transformers create millions of small models from values they have
+    produced themselves, so pydantic validation is pure overhead there.  Fields
+    must already have their final types (nested values as model instances);
+    omitted fields get their defaults.
+
+    When ``FORGE_CHECK_MODELS`` is set (as it is in the test-suite), every
+    model is also built with validation and both results are compared, so a
+    transformer passing values that validation would reject or coerce fails
+    loudly.  The trusted model is returned either way, so checked runs hand
+    downstream code the same objects production does.
+    """
+    if not _check:
+        return model.model_construct(**fields)
+
+    trusted = model.model_construct(**fields)
+    validated = model(**fields)
+    if trusted.model_dump(mode="json") != validated.model_dump(mode="json"):
+        raise AssertionError(
+            f"Trusted construction of {model.__name__} diverges from validation: "
+            f"{trusted!r} != {validated!r}"
+        )
+    return trusted
@@ -1,17 +1,69 @@
+from fparser.two.utils import Base
+
 from .is_iterable import is_iterable
 
+#: Attribute under which the resolved line number is memoized on AST nodes.
+#: fparser nodes are unhashable, so the cache lives on the nodes themselves.
+LINE_ATTR = "_forge_line"
+
+
+def annotate_line_numbers(ast: Base) -> None:
+    """
+    Resolve the line number of every node of an AST in a single pass.
+
+    A node without a source span inherits the line number of its first child,
+    exactly as :func:`get_line_number` would compute it; afterwards every
+    :func:`get_line_number` call on the tree is a single attribute lookup.
+    """
+    stack = [(ast, False)]
+    while stack:
+        node, visited = stack.pop()
+        children = node.children if is_iterable(node) else ()
+        if not visited:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children if isinstance(child, Base))
+            continue
+
+        item = getattr(node, 'item', None)
+        if hasattr(item, 'span'):
+            line = item.span[0]
+        elif children and isinstance(children[0], Base):
+            line = getattr(children[0], LINE_ATTR)
+        else:
+            line = -1
+        setattr(node, LINE_ATTR, line)
+
+
 def get_line_number(ast_node: object) -> int:
     """
     Get the line number of an AST node.
+
+    Uses the value memoized by :func:`annotate_line_numbers` (or by an earlier
+    call) when available.
     """
+    line = getattr(ast_node, LINE_ATTR, None)
+    if line is not None:
+        return line
+
+    visited = []
+    line = -1
     current_node = ast_node
     while current_node:
+        cached = getattr(current_node, LINE_ATTR, None)
+        if cached is not None:
+            line = cached
+            break
+        if isinstance(current_node, Base):
+            visited.append(current_node)
         if hasattr(current_node, 'item') and hasattr(current_node.item, 'span'):
-            return current_node.item.span[0]
+            line = current_node.item.span[0]
+            break
         else:
             if is_iterable(current_node):
                 current_node = current_node.children[0]
             else:
                 current_node = None
-        
-    return -1
+
+    for node in visited:
+        setattr(node, LINE_ATTR, line)
+    return line
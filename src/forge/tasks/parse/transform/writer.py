@@ -0,0 +1,119 @@
+"""Incremental serialisation of per-file semantics.
+
+``forge transform`` used to collect the semantics of a whole file in one
+model, convert it to dicts with ``model_dump()`` and only then serialise it,
+keeping up to three copies of the output alive at once.
+:class:`FileSemanticsWriter` instead serialises every module and subprogram
+as soon as it has been produced, so that only one entry is held in memory at
+a time.
+
+The document written maps module names to
+:class:`~forge.core.models.semantics.ModuleSemantics` and subprogram keys to
+:class:`~forge.core.models.semantics.SubprogramSemantics`.  Subprograms of a
+module are keyed ``<module>::<name>``, external subprograms by their name::
+
+    {"modules": {"<name>": {...}, ...}, "subprograms": {"<key>": {...}, ...}}
+
+Entries have to be written section by section: all modules first, then all
+subprograms.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TextIO
+
+from pydantic import BaseModel
+
+#: Top-level keys of the document, in the order they are written.
+SECTIONS = ("modules", "subprograms")
+
+
+class FileSemanticsWriter:
+    """Write the semantics of one source file entry by entry.
+
+    Args:
+        fp: Text stream the document is written to.
+        indent: Indentation width.  ``None`` (the default) produces compact
+            output without any whitespace between tokens.
+
+    Example::
+
+        with open(path, "w", encoding="utf-8") as f, FileSemanticsWriter(f) as writer:
+            writer.write_module("m", module_semantics)
+            writer.write_subprogram("m::s", subprogram_semantics)
+    """
+
+    def __init__(self, fp: TextIO, indent: int | None = None) -> None:
+        self.fp = fp
+        self.indent = indent
+        self._section = -1
+        self._entries = 0
+        self._closed = False
+        fp.write("{")
+
+    def __enter__(self) -> FileSemanticsWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+
+    def _newline(self, depth: int) -> str:
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * depth)
+
+    def _enter_section(self, index: int) -> None:
+        if index < self._section:
+            raise ValueError(f"{SECTIONS[index]} must be written before {SECTIONS[self._section]}")
+        while self._section < index:
+            if self._section >= 0:
+                self._end_section()
+            self._section += 1
+            self._entries = 0
+            sep = ": " if self.indent is not None else ":"
+            if self._section > 0:
+                self.fp.write(",")
+            self.fp.write(f"{self._newline(1)}{json.dumps(SECTIONS[self._section])}{sep}{{")
+
+    def _end_section(self) -> None:
+        self.fp.write((self._newline(1) if self._entries else "") + "}")
+
+    def _write(self, section: str, key: str, semantics: BaseModel) -> None:
+        if self._closed:
+            raise ValueError("writer is closed")
+        self._enter_section(SECTIONS.index(section))
+        body = semantics.model_dump_json(indent=self.indent)
+        if self.indent is not None:
+            # Entries are nested two levels deep
+            body = body.replace("\n", self._newline(2))
+        sep = ": " if self.indent is not None else ":"
+        self.fp.write(f"{',' if self._entries else ''}{self._newline(2)}{json.dumps(key)}{sep}{body}")
+        self._entries += 1
+
+    def write_module(self, name: str, semantics: BaseModel) -> None:
+        """Append the semantics of module *name*."""
+
+        self._write("modules", name, semantics)
+
+    def write_subprogram(self, key: str, semantics: BaseModel) -> None:
+        """Append the semantics of the subprogram stored under *key*."""
+
+        self._write("subprograms", key, semantics)
+
+    def close(self) -> None:
+        """Write the remaining sections and terminate the document.
+
+        The underlying stream is left open.
+        """
+
+        if self._closed:
+            return
+        self._enter_section(len(SECTIONS) - 1)
+        self._end_section()
+        self.fp.write(self._newline(0) + "}")
+        self._closed = True
+
+
+__all__ = ["FileSemanticsWriter", "SECTIONS"]
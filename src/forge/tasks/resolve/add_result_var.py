@@ -8,7 +8,7 @@ class AddResultVarTask(BaseOfflineTask):
     """Add implicit function result variables named after the function."""
 
     def execute(self) -> None:
-        for sp_id, decl in self.query_handle.iter_result_symbols():
+        for sp_id, decl in self.query_handle.iter_result_symbols(self.modules):
             if decl.name.lower() == sp_id.subprogram_name.lower():
                 continue
             if self.query_handle.find_symbol_decl(
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Collection
 from sqlalchemy.orm.session import Session
 from .handles import CommandHandle, QueryHandle
 
@@ -6,7 +7,14 @@ class BaseOfflineTask(ABC):
     def __init__(
         self,
         session: Session,
+        modules: Collection[str] | None = None,
     ) -> None:
+        """Create a task working on *session*.
+
+        If *modules* is given, only references, calls and results hosted in
+        the named modules are resolved.
+        """
+        self.modules = modules
         self.query_handle = QueryHandle(session)
         self.command_handle = CommandHandle(session)
     
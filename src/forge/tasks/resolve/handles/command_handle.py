@@ -1,3 +1,6 @@
+from typing import Iterable, Tuple
+
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm.session import Session
 from sqlalchemy.orm.query import Query
 from fpyevolve_core.keys.fortran import ModuleKey, SubprogramKey, ModuleDeclKey, SubprogramDeclKey
@@ -55,31 +58,14 @@ class CommandHandle:
             )
         return query
 
-    def update_symbol_reference(
+    def _resolved_symbol_id(
         self,
-        host: SubprogramKey | ModuleKey,
-        ref: SymbolReferenceRead | SymbolReferenceWrite,
+        name: str,
         resolved: SubprogramDeclKey | ModuleDeclKey | None,
-    ) -> None:
-        # Build the query to find the records to update
-        
-        q = self.session.query(FortranSymbolReference)
-        q = self._host_filter(q, host)
-        q = q.filter(
-            FortranSymbolReference.name == ref.name,
-            FortranSymbolReference.line == ref.line,
-            FortranSymbolReference.reference_type == SymbolReferenceType(ref.reference_type),
-        )
-        
-        # Get the IDs of records to update
-        record_ids = [record.id for record in q.all()]
-        
-        if not record_ids:
-            return
-        
-        # Update the symbol_id to point to the resolved symbol
+    ) -> int | None:
+        """Return the id of the symbol a reference to *name* was resolved to."""
         if isinstance(resolved, SubprogramDeclKey):
-            resolved_symbol = self.session.query(FortranSymbol).join(
+            resolved_symbol = self.session.query(FortranSymbol.id).join(
                 FortranSubprogram, FortranSymbol.subprogram_id == FortranSubprogram.id
             ).join(
                 FortranModule, FortranSubprogram.module_id == FortranModule.id
@@ -90,21 +76,50 @@ class CommandHandle:
                 FortranSymbol.name == resolved.declaration_name,
             ).first()
         elif isinstance(resolved, ModuleDeclKey):
-            resolved_symbol = self.session.query(FortranSymbol).join(
+            resolved_symbol = self.session.query(FortranSymbol.id).join(
                 FortranModule, FortranSymbol.module_id == FortranModule.id
             ).filter(
                 FortranModule.name == resolved.module_name,
-                FortranSymbol.name == ref.name
+                FortranSymbol.name == name
             ).first()
         else:
-            return
-        
-        if resolved_symbol:
-            self.session.query(FortranSymbolReference).filter(
-                FortranSymbolReference.id.in_(record_ids)
-            ).update({FortranSymbolReference.symbol_id: resolved_symbol.id})
-        
+            return None
+        return resolved_symbol.id if resolved_symbol else None
+
+    def update_symbol_references(
+        self,
+        updates: Iterable[Tuple[int, str, SubprogramDeclKey | ModuleDeclKey | None]],
+    ) -> int:
+        """Point the read and write references to a name in a subprogram at their symbol.
+
+        *updates* holds ``(subprogram_id, name, resolved)`` triples; all
+        references to ``name`` in the subprogram are updated together, with
+        one ``executemany`` for the whole batch.
+
+        Returns:
+            The number of ``(subprogram, name)`` pairs that were updated.
+        """
+        rows = []
+        for subprogram_id, name, resolved in updates:
+            symbol_id = self._resolved_symbol_id(name, resolved)
+            if symbol_id is not None:
+                rows.append({"b_subprogram_id": subprogram_id, "b_name": name, "b_symbol_id": symbol_id})
+        if not rows:
+            return 0
+
+        table = FortranSymbolReference.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.subprogram_id == bindparam("b_subprogram_id"),
+                table.c.name == bindparam("b_name"),
+                table.c.reference_type.in_((SymbolReferenceType.READ, SymbolReferenceType.WRITE)),
+            )
+            .values(symbol_id=bindparam("b_symbol_id"))
+        )
+        self.session.execute(stmt, rows)
         self.session.commit()
+        return len(rows)
 
     def update_resolved_call_reference(
         self,
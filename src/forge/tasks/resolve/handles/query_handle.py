@@ -26,7 +26,7 @@ from fpyevolve_core.models.fortran import (
 )
 from fpyevolve_core.models.fortran.attr_spec import AttrSpec, ArraySpec
 import json
-from typing import Iterable, Tuple, Optional
+from typing import Collection, Iterable, Tuple, Optional
 
 def _parse_array_spec(raw: str | None) -> ArraySpec | None:
     if not raw:
@@ -38,6 +38,12 @@ def _parse_additional_keywords(raw: str | None) -> list[str] | None:
         return None
     return json.loads(raw)
 
+def _in_modules(query, modules: Collection[str] | None):
+    """Restrict *query*, which joins ``FortranModule``, to the named *modules*."""
+    if modules is None:
+        return query
+    return query.filter(FortranModule.name.in_(modules))
+
 class QueryHandle:
     """SQLite/SQLAlchemy backend implementing the symbol query interfaces."""
 
@@ -115,6 +121,27 @@ class QueryHandle:
         """Alias for target_modules_used_by_subprogram for interface compatibility."""
         return self.target_modules_used_by_subprogram(sp)
 
+    def modules_using(self, names: Collection[str]) -> set[str]:
+        """Names of the modules that use any of the modules *names*.
+
+        Uses both at module level and inside subprograms are taken into account.
+        """
+        if not names:
+            return set()
+        src_mod = aliased(FortranModule)
+        tgt_mod = aliased(FortranModule)
+        q = (
+            self.session.query(src_mod.name)
+            .select_from(FortranUse)
+            .join(src_mod, FortranUse.source_module_id == src_mod.id)
+            .outerjoin(tgt_mod, FortranUse.target_module_id == tgt_mod.id)
+            .filter(
+                tgt_mod.name.in_(names) | FortranUse.target_module_name.in_(names)
+            )
+            .distinct()
+        )
+        return {name for (name,) in q}
+
     def visible_modules(self, host: ModuleKey | SubprogramKey) -> set[ModuleKey]:
         """Get all visible modules for a given host."""
         mods = self.target_modules_used_by_module(ModuleKey(host.module_name))
@@ -299,40 +326,43 @@ class QueryHandle:
         return None
 
     # ---------- 实现 3 个迭代器 --------------------------------------------
-    def iter_symbol_references(
+    def iter_symbol_reference_names(
         self,
-    ) -> Iterable[Tuple[SubprogramKey | ModuleKey, SymbolReferenceRead | SymbolReferenceWrite]]:
+        modules: Collection[str] | None = None,
+    ) -> Iterable[Tuple[int, SubprogramKey, str]]:
+        """Distinct ``(host, name)`` pairs of the read and write references.
+
+        A subprogram usually references the same name on many lines, and
+        resolving a reference depends on its host and name only.  Yields the
+        id and key of the host subprogram along with the referenced name.
+        """
         q = (
-            self.session.query(FortranSymbolReference).join(
-                FortranSubprogram, FortranSymbolReference.subprogram_id == FortranSubprogram.id
-            ).join(
-                FortranModule, FortranSubprogram.module_id == FortranModule.id
-            ).filter(FortranSymbolReference.reference_type.in_((SymbolReferenceType.READ, SymbolReferenceType.WRITE)))
-            .yield_per(2000)
-        )
-        for row in q:
-            
-            if row.name == "Cpools":
-                pass
-            
-            host = (
-                SubprogramKey(
-                    module_name=row.subprogram.module.name,
-                    subprogram_type=row.subprogram.type.value,
-                    subprogram_name=row.subprogram.name,
-                )
-                if row.subprogram
-                else ModuleKey(module_name=row.subprogram.module.name if row.subprogram else "")
+            self.session.query(
+                FortranSubprogram.id,
+                FortranModule.name,
+                FortranSubprogram.type,
+                FortranSubprogram.name,
+                FortranSymbolReference.name,
             )
-            ref_cls = (
-                SymbolReferenceRead
-                if row.reference_type == SymbolReferenceType.READ
-                else SymbolReferenceWrite
+            .select_from(FortranSymbolReference)
+            .join(FortranSubprogram, FortranSymbolReference.subprogram_id == FortranSubprogram.id)
+            .join(FortranModule, FortranSubprogram.module_id == FortranModule.id)
+            .filter(FortranSymbolReference.reference_type.in_((SymbolReferenceType.READ, SymbolReferenceType.WRITE)))
+            .distinct()
+            .order_by(FortranSubprogram.id, FortranSymbolReference.name)
+        )
+        q = _in_modules(q, modules)
+        for sp_id, module_name, sp_type, sp_name, name in q:
+            host = SubprogramKey(
+                module_name=module_name,
+                subprogram_type=sp_type.value,
+                subprogram_name=sp_name,
             )
-            yield host, ref_cls(name=row.name, line=row.line, resolved_symbol=row.symbol.name if row.symbol else "")
+            yield sp_id, host, name
 
     def iter_call_references(
         self,
+        modules: Collection[str] | None = None,
     ) -> Iterable[Tuple[SubprogramKey, SubroutineCall]]:
         q = (
             self.session.query(FortranCall).join(
@@ -342,6 +372,7 @@ class QueryHandle:
             ).filter(FortranCall.call_type == SubprogramType.SUBROUTINE)
             .yield_per(2000)
         )
+        q = _in_modules(q, modules)
         for row in q:
             host = SubprogramKey(
                 module_name=row.caller.module.name,
@@ -353,6 +384,7 @@ class QueryHandle:
 
     def iter_unresolved_call_names(
         self,
+        modules: Collection[str] | None = None,
     ) -> Iterable[Tuple[SubprogramKey, SubroutineCall]]:
         q = (
             self.session.query(FortranCall)
@@ -364,6 +396,7 @@ class QueryHandle:
             )
             .yield_per(2000)
         )
+        q = _in_modules(q, modules)
         for row in q:
             host = SubprogramKey(
                 module_name=row.caller.module.name,
@@ -380,6 +413,7 @@ class QueryHandle:
 
     def iter_part_refs(
         self,
+        modules: Collection[str] | None = None,
     ) -> Iterable[Tuple[SubprogramKey | ModuleKey, SymbolReferenceRead | SymbolReferenceWrite]]:
         q = (
             self.session.query(FortranSymbolReference).join(
@@ -389,6 +423,7 @@ class QueryHandle:
             ).filter(FortranSymbolReference.is_part_ref == True)
             .yield_per(2000)
         )
+        q = _in_modules(q, modules)
         for row in q:
             host = (
                 SubprogramKey(
@@ -408,6 +443,7 @@ class QueryHandle:
 
     def iter_result_symbols(
         self,
+        modules: Collection[str] | None = None,
     ) -> Iterable[Tuple[SubprogramKey, FortranDeclaredEntity]]:
         q = (
             self.session.query(
@@ -426,6 +462,7 @@ class QueryHandle:
             .filter(FortranSubprogramSignature.result.is_(True))
             .yield_per(2000)
         )
+        q = _in_modules(q, modules)
         for sig_row, sp_row, mod_row, sym_row in q:
             decl = FortranDeclaredEntity(
                 name=sym_row.name,
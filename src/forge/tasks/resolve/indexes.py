@@ -0,0 +1,163 @@
+"""Indexes supporting the lookups of the resolution tasks.
+
+The queries of :class:`~forge.tasks.resolve.handles.QueryHandle` and
+:class:`~forge.tasks.resolve.handles.CommandHandle` look up modules by name,
+subprograms and symbols by their host and name, uses by their source,
+references by host, name, line and type and calls by caller, line and type.
+The fpyevolve schema does not guarantee indexes on these columns, and without
+them every such query scans its table.  ``forge resolve`` creates the missing
+indexes before the tasks run; see :func:`create_resolve_indexes`.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect
+from sqlalchemy.engine import Engine
+
+from fpyevolve_core.db.schema.fortrans import (
+    FortranCall,
+    FortranModule,
+    FortranSubprogram,
+    FortranSubprogramSignature,
+    FortranSymbol,
+    FortranSymbolReference,
+    FortranUse,
+)
+
+#: Indexes used by the resolution tasks, by name.
+RESOLVE_INDEXES = {
+    "ix_forge_module_name": (FortranModule.name,),
+    "ix_forge_subprogram_host": (
+        FortranSubprogram.module_id,
+        FortranSubprogram.name,
+        FortranSubprogram.type,
+    ),
+    "ix_forge_symbol_host": (
+        FortranSymbol.module_id,
+        FortranSymbol.subprogram_id,
+        FortranSymbol.name,
+    ),
+    "ix_forge_symbol_subprogram": (FortranSymbol.subprogram_id, FortranSymbol.name),
+    "ix_forge_use_module": (FortranUse.source_module_id, FortranUse.source_subprogram_id),
+    "ix_forge_use_subprogram": (FortranUse.source_subprogram_id,),
+    "ix_forge_reference_host": (
+        FortranSymbolReference.subprogram_id,
+        FortranSymbolReference.name,
+        FortranSymbolReference.line,
+        FortranSymbolReference.reference_type,
+    ),
+    "ix_forge_call_caller": (FortranCall.caller_id, FortranCall.line, FortranCall.call_type),
+    "ix_forge_signature_subprogram": (FortranSubprogramSignature.subprogram_id,),
+}
+
+
+def _index(name: str) -> Index:
+    """Build the index *name* of :data:`RESOLVE_INDEXES`.
+
+    The index is defined on a detached copy of its table, so that it is not
+    added to the fpyevolve metadata and created along with the schema.
+    """
+
+    columns = [attribute.property.columns[0] for attribute in RESOLVE_INDEXES[name]]
+    table = Table(
+        columns[0].table.name, MetaData(), *(Column(c.name) for c in columns)
+    )
+    return Index(name, *table.columns)
+
+
+def _existing_indexes(engine: Engine) -> dict[str, list[dict]]:
+    """Return the indexes of the tables of :data:`RESOLVE_INDEXES`, by table."""
+
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        tables = {_index(name).table.name for name in RESOLVE_INDEXES}
+        return {table: inspector.get_indexes(table) for table in tables}
+
+
+def missing_resolve_indexes(engine: Engine) -> list[str]:
+    """Return the names of the indexes of :data:`RESOLVE_INDEXES` missing from the database.
+
+    An entry is present if an index of any name leads with its columns, in
+    order; such an index serves the lookup just as well.
+    """
+
+    existing = _existing_indexes(engine)
+    missing = []
+    for name in RESOLVE_INDEXES:
+        table = _index(name).table
+        columns = [c.name for c in table.columns]
+        if not any(
+            ix["column_names"][: len(columns)] == columns for ix in existing[table.name]
+        ):
+            missing.append(name)
+    return missing
+
+
+def create_resolve_indexes(engine: Engine) -> list[str]:
+    """Create the indexes of :data:`RESOLVE_INDEXES` missing from the database.
+
+    Returns:
+        The names of the indexes created.
+    """
+
+    created = missing_resolve_indexes(engine)
+    with engine.begin() as conn:
+        for name in created:
+            _index(name).create(conn)
+    return created
+
+
+def drop_resolve_indexes(engine: Engine, names: list[str] | None = None) -> None:
+    """Drop the indexes *names* of :data:`RESOLVE_INDEXES`, by default all that exist.
+
+    Only indexes created under the names of :data:`RESOLVE_INDEXES` are
+    dropped by default; indexes of other names that cover the same columns
+    are left alone.
+    """
+
+    if names is None:
+        existing = {
+            ix["name"] for indexes in _existing_indexes(engine).values() for ix in indexes
+        }
+        names = [name for name in RESOLVE_INDEXES if name in existing]
+    with engine.begin() as conn:
+        for name in names:
+            _index(name).drop(conn)
+
+
+def explain_resolve_lookups(engine: Engine) -> dict[str, str]:
+    """Return the SQLite query plan of the lookup each resolve index serves.
+
+    The lookup of an index is an equality match on all of its columns.  The
+    plans show whether SQLite scans the table or searches an index, so
+    comparing them before and after :func:`create_resolve_indexes` reports
+    what the indexes change.
+
+    Returns:
+        The plan of each lookup, keyed by index name; empty unless the
+        database is SQLite.
+    """
+
+    if engine.dialect.name != "sqlite":
+        return {}
+    plans = {}
+    with engine.connect() as conn:
+        quote = conn.dialect.identifier_preparer.quote
+        for name in RESOLVE_INDEXES:
+            table = _index(name).table
+            where = " AND ".join(f"{quote(c.name)} = ?" for c in table.columns)
+            rows = conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN SELECT * FROM {quote(table.name)} WHERE {where}",
+                tuple(None for _ in table.columns),
+            )
+            plans[name] = "; ".join(row[-1] for row in rows)
+    return plans
+
+
+__all__ = [
+    "RESOLVE_INDEXES",
+    "create_resolve_indexes",
+    "drop_resolve_indexes",
+    "explain_resolve_lookups",
+    "missing_resolve_indexes",
+]
@@ -19,6 +19,6 @@ class CalleeNameParseTask(BaseOfflineTask):
         return None
 
     def execute(self) -> None:
-        for host, call in self.query_handle.iter_unresolved_call_names():
+        for host, call in self.query_handle.iter_unresolved_call_names(self.modules):
             resolved = self.resolve(host, call)
             self.command_handle.update_resolved_call_reference(host, call, resolved)
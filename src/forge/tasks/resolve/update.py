@@ -5,38 +5,51 @@ from fpyevolve_core.models.fortran import (
     SubroutineCall,
     FunctionCall,
 )
+from ...core.metrics import current
 from .base import BaseOfflineTask
 
+#: Number of resolved ``(host, name)`` pairs written with one ``executemany``.
+UPDATE_BATCH_SIZE = 500
+
 class SymbolReferenceUpdateTask(BaseOfflineTask):
-    """Update resolved symbol references in the database."""
+    """Update resolved symbol references in the database.
+
+    References are resolved once per host subprogram and name rather than
+    once per line, and the results are written in batches of
+    :data:`UPDATE_BATCH_SIZE` pairs.
+    """
 
     def resolve(
         self,
         host: SubprogramKey | ModuleKey,
-        ref: SymbolReferenceRead | SymbolReferenceWrite,
+        name: str,
     ) -> SubprogramDeclKey | ModuleDeclKey | None:
         
         if isinstance(host, SubprogramKey):
-            decl = self.query_handle.find_symbol_decl(ModuleKey(host.module_name), host, ref.name)
+            decl = self.query_handle.find_symbol_decl(ModuleKey(host.module_name), host, name)
             if decl:
                 return decl
 
-        decl = self.query_handle.find_symbol_decl(ModuleKey(host.module_name), None, ref.name)
+        decl = self.query_handle.find_symbol_decl(ModuleKey(host.module_name), None, name)
         if decl:
             return decl
 
         for mod in self.query_handle.visible_modules(host):
-            decl = self.query_handle.find_symbol_decl(mod, None, ref.name)
+            decl = self.query_handle.find_symbol_decl(mod, None, name)
             if decl:
                 return decl
 
         return None
 
     def execute(self) -> None:
-        for host, ref in self.query_handle.iter_symbol_references():
-            
-            resolved = self.resolve(host, ref)
-            self.command_handle.update_symbol_reference(host, ref, resolved)
+        # The pairs are read up front; they are far fewer than the references
+        groups = list(self.query_handle.iter_symbol_reference_names(self.modules))
+        current().incr("resolve.symbol_names", len(groups))
+        for start in range(0, len(groups), UPDATE_BATCH_SIZE):
+            self.command_handle.update_symbol_references(
+                (sp_id, name, self.resolve(host, name))
+                for sp_id, host, name in groups[start:start + UPDATE_BATCH_SIZE]
+            )
 
 class CallReferenceUpdateTask(BaseOfflineTask):
     """Update resolved subroutine call targets."""
@@ -57,7 +70,7 @@ class CallReferenceUpdateTask(BaseOfflineTask):
         return None
 
     def execute(self) -> None:
-        for host_sp, call in self.query_handle.iter_call_references():
+        for host_sp, call in self.query_handle.iter_call_references(self.modules):
             resolved = self.resolve(host_sp, call)
             self.command_handle.update_resolved_call_reference(host_sp, call, resolved)
 
@@ -90,7 +103,7 @@ class PartRefUpdateTask(BaseOfflineTask):
         return SymbolReferenceRead(name=part_ref.name, line=part_ref.line, resolved_symbol="")
 
     def execute(self) -> None:
-        for host, part_ref in self.query_handle.iter_part_refs():
+        for host, part_ref in self.query_handle.iter_part_refs(self.modules):
             resolved = self.resolve(host, part_ref)
             if isinstance(resolved, FunctionCall):
                 if isinstance(host, SubprogramKey):
@@ -0,0 +1,143 @@
+"""Detection of changed source files for ``forge watch``.
+
+:class:`SourceWatcher` keeps a snapshot of the modification times of all
+source files of a project (as returned by
+:func:`~forge.tasks.parse.discover.discover_source_files`) and reports the
+difference to the previous snapshot once the tree has been quiet for a
+debounce period, so that an editor saving several files at once, or a
+``git checkout``, results in a single batch of changes.
+
+Change detection always compares snapshots, so include and exclude patterns
+are applied exactly as in ``forge extract``.  When the optional ``watchfiles``
+package is installed, its native file system notifications (inotify, FSEvents,
+...) are used to wake up instead of rescanning the tree every poll interval.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import time
+from typing import Callable, Iterator
+
+from ..config.models import SourcesModel
+from .parse.discover import discover_source_files
+
+try:  # optional, native file system notifications
+    import watchfiles
+except ImportError:  # pragma: no cover - depends on the environment
+    watchfiles = None
+
+
+@dataclass
+class Changes:
+    """Source files that changed between two snapshots."""
+
+    modified: dict[Path, float] = field(default_factory=dict)
+    """Modification times of added or modified files."""
+
+    removed: set[Path] = field(default_factory=set)
+    """Files that no longer exist or no longer match the patterns."""
+
+    def __bool__(self) -> bool:
+        return bool(self.modified or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.modified) + len(self.removed)
+
+
+def diff_snapshots(before: dict[Path, float], after: dict[Path, float]) -> Changes:
+    """Return the changes that turn snapshot *before* into *after*."""
+
+    return Changes(
+        modified={p: m for p, m in after.items() if before.get(p) != m},
+        removed={p for p in before if p not in after},
+    )
+
+
+class SourceWatcher:
+    """Report batches of changed source files of a project.
+
+    Args:
+        project_root: Root directory of the Forge project.
+        sources: The ``[sources]`` configuration table.
+        interval: Seconds between two scans while polling.
+        debounce: Seconds the tree has to stay unchanged before a batch of
+            changes is reported.
+        native: Use ``watchfiles`` notifications if the package is available.
+        snapshot: Initial snapshot; the tree is scanned if ``None``.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        sources: SourcesModel,
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        native: bool = True,
+        snapshot: dict[Path, float] | None = None,
+    ) -> None:
+        self.project_root = project_root
+        self.sources = sources
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshot = self.scan() if snapshot is None else snapshot
+        self._events: Iterator | None = None
+        if native and watchfiles is not None:
+            dirs = [project_root / d for d in sources.source_dirs if (project_root / d).is_dir()]
+            if dirs:
+                self._events = watchfiles.watch(
+                    *dirs,
+                    debounce=int(debounce * 1000),
+                    rust_timeout=int(interval * 1000),
+                    yield_on_timeout=True,
+                )
+
+    @property
+    def native(self) -> bool:
+        """Whether native notifications are used instead of polling."""
+
+        return self._events is not None
+
+    def scan(self) -> dict[Path, float]:
+        return discover_source_files(self.project_root, self.sources)
+
+    def _sleep(self) -> None:
+        if self._events is not None:
+            next(self._events)
+        else:
+            time.sleep(self.interval)
+
+    def wait(self, should_stop: Callable[[], bool] = lambda: False) -> Changes:
+        """Block until files have changed and the tree has settled.
+
+        Args:
+            should_stop: Polled between scans; when it returns ``True`` the
+                changes seen so far (possibly none) are returned.
+
+        Returns:
+            The changes relative to the previous snapshot, which is replaced.
+        """
+
+        while True:
+            current = self.scan()
+            if current != self.snapshot:
+                break
+            if should_stop():
+                return Changes()
+            self._sleep()
+
+        # Debounce: wait until two consecutive scans agree
+        while not should_stop():
+            time.sleep(self.debounce)
+            settled = self.scan()
+            if settled == current:
+                break
+            current = settled
+
+        changes = diff_snapshots(self.snapshot, current)
+        self.snapshot = current
+        return changes
+
+
+__all__ = ["Changes", "SourceWatcher", "diff_snapshots"]
@@ -0,0 +1,62 @@
+"""Import-time guards for the command line entry point."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import subprocess
+import sys
+
+import pytest
+
+import forge
+
+#: Upper bound for importing the CLI entry point, in seconds.  Typer and
+#: Click alone take about 60 ms; anything near the budget means a heavy
+#: dependency slipped back into the import chain.
+IMPORT_BUDGET = 0.5
+
+#: Modules only the commands that need them may import.
+HEAVY_MODULES = ("fparser", "fpyevolve_core", "pydantic", "sqlalchemy")
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Run *statement* with ``-X importtime``; return cumulative µs per module."""
+
+    src = Path(forge.__path__[0]).parent
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(src), os.environ.get("PYTHONPATH", "")])}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import forge.cli.main",
+        # Rendering the help lists every command without importing any of them
+        "from typer.main import get_command; from forge.cli.main import app; "
+        "get_command(app).main(['--help'], standalone_mode=False)",
+    ],
+)
+def test_cli_does_not_import_heavy_dependencies(statement: str) -> None:
+    times = _import_times(statement)
+    assert "forge.cli.main" in times
+    assert not [m for m in HEAVY_MODULES if m in times]
+
+
+def test_cli_import_time_budget() -> None:
+    times = _import_times("import forge.cli.main")
+    assert times["forge.cli.main"] / 1e6 < IMPORT_BUDGET
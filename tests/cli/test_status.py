@@ -0,0 +1,29 @@
+from typer.testing import CliRunner
+
+from forge.cli.main import app
+
+
+def test_status_without_project(tmp_path, monkeypatch):
+    """``forge status`` fails outside of a Forge project."""
+
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(app, ["status"])
+    assert result.exit_code == 1
+
+
+def test_status_reports_files_and_runs(tmp_path, monkeypatch):
+    """``forge status`` summarises file states, failures and recent runs."""
+
+    runner = CliRunner()
+    monkeypatch.chdir(tmp_path)
+    assert runner.invoke(app, ["init"]).exit_code == 0
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.f90").write_text("module a\nend module a\n")
+    assert runner.invoke(app, ["extract"]).exit_code == 0
+
+    result = runner.invoke(app, ["status"])
+    assert result.exit_code == 0
+    assert "EXTRACTED" in result.output
+    assert "extract" in result.output
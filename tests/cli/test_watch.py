@@ -0,0 +1,52 @@
+"""Tests for the change detection behind ``forge watch``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+
+from forge.config.models import SourcesModel
+from forge.tasks.watch import Changes, SourceWatcher, diff_snapshots
+
+
+def _write(path: Path, text: str, mtime: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_diff_snapshots() -> None:
+    a, b, c = Path("a.f90"), Path("b.f90"), Path("c.f90")
+    changes = diff_snapshots({a: 1.0, b: 2.0}, {a: 1.0, b: 3.0, c: 4.0})
+    assert changes.modified == {b: 3.0, c: 4.0}
+    assert changes.removed == set()
+    assert len(changes) == 2
+
+    changes = diff_snapshots({a: 1.0, b: 2.0}, {a: 1.0})
+    assert changes.modified == {}
+    assert changes.removed == {b}
+    assert not diff_snapshots({a: 1.0}, {a: 1.0})
+    assert not Changes()
+
+
+def test_source_watcher_polls_for_changes(tmp_path: Path) -> None:
+    sources = SourcesModel(source_dirs=["src"])
+    _write(tmp_path / "src" / "a.f90", "module a\nend module a\n", 1_000.0)
+    _write(tmp_path / "src" / "b.f90", "module b\nend module b\n", 1_000.0)
+
+    watcher = SourceWatcher(tmp_path, sources, interval=0.01, debounce=0.01, native=False)
+    assert not watcher.native
+    assert set(watcher.snapshot) == {tmp_path / "src" / "a.f90", tmp_path / "src" / "b.f90"}
+
+    # Nothing changed: the watcher gives up once asked to stop
+    assert not watcher.wait(should_stop=lambda: True)
+
+    _write(tmp_path / "src" / "a.f90", "module a\ncontains\nend module a\n", 2_000.0)
+    (tmp_path / "src" / "b.f90").unlink()
+    _write(tmp_path / "src" / "c.txt", "not a source file", 2_000.0)
+    changes = watcher.wait()
+    assert changes.modified == {tmp_path / "src" / "a.f90": 2_000.0}
+    assert changes.removed == {tmp_path / "src" / "b.f90"}
+
+    # The snapshot moved on
+    assert not watcher.wait(should_stop=lambda: True)
@@ -0,0 +1,151 @@
+"""Tests for the incremental cycles of ``forge watch``."""
+
+from __future__ import annotations
+
+import datetime as _dt
+from pathlib import Path
+import shutil
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from typer.testing import CliRunner
+
+from forge.cli.commands.watch import pending_changes, run_cycle
+from forge.cli.main import app
+from forge.core.schema import FileRecord, FileStatus
+from forge.tasks.watch import Changes
+from fpyevolve_core.db.schema.fortrans import FortranModule, FortranSubprogram
+
+EXAMPLE_SRC = Path(__file__).resolve().parents[2] / "examples" / "basic" / "src"
+
+
+def _snapshot(root: Path) -> dict[Path, float]:
+    return {p: p.stat().st_mtime for p in (root / "src").glob("*.f90")}
+
+
+@pytest.fixture()
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(EXAMPLE_SRC, tmp_path / "src")
+    assert CliRunner().invoke(app, ["init"]).exit_code == 0
+    state_engine = create_engine(f"sqlite:///{tmp_path / '.forge' / 'forge.sqlite3'}")
+    target_engine = create_engine(f"sqlite:///{tmp_path / 'semantics.sqlite3'}")
+    yield tmp_path, state_engine, target_engine
+    state_engine.dispose()
+    target_engine.dispose()
+
+
+def _cycle(root: Path, state_engine, target_engine):
+    changes = pending_changes(root, state_engine, _snapshot(root))
+    return run_cycle(root, changes, state_engine, target_engine, max_workers=1)
+
+
+def _names(engine, entity) -> set[str]:
+    with Session(engine) as session:
+        return set(session.scalars(select(entity.name)))
+
+
+def test_pending_changes(project) -> None:
+    root, state_engine, _target = project
+    snapshot = _snapshot(root)
+    a, b, c = (
+        root / "src" / name
+        for name in ("constants_mod.f90", "geometry_mod.f90", "vector_mod.f90")
+    )
+
+    def _record(path: str, status: FileStatus, mtime: float) -> FileRecord:
+        return FileRecord(
+            project_id=1,
+            source_path=path,
+            file_hash="",
+            status=status,
+            last_modified=_dt.datetime.utcfromtimestamp(mtime),
+        )
+
+    with Session(state_engine) as session:
+        session.add_all(
+            [
+                # Loaded in its current version
+                _record("src/constants_mod.f90", FileStatus.LOADED, snapshot[a]),
+                # Loaded, but modified since
+                _record("src/geometry_mod.f90", FileStatus.LOADED, snapshot[b] - 10),
+                # Not loaded yet
+                _record("src/vector_mod.f90", FileStatus.TRANSFORMED, snapshot[c]),
+                # Gone from the sources
+                _record("src/old_mod.f90", FileStatus.LOADED, 0.0),
+            ]
+        )
+        session.commit()
+
+    changes = pending_changes(root, state_engine, snapshot)
+    assert set(changes.modified) == {b, c, root / "src" / "physics_mod.f90"}
+    assert changes.removed == {root / "src" / "old_mod.f90"}
+
+
+def test_run_cycle_updates_target(project) -> None:
+    root, state_engine, target_engine = project
+
+    report = _cycle(root, state_engine, target_engine)
+    assert (report.modified, report.removed, report.failed) == (4, 0, [])
+    assert _names(target_engine, FortranModule) == {
+        "constants_mod",
+        "geometry_mod",
+        "physics_mod",
+        "vector_mod",
+    }
+    assert not pending_changes(root, state_engine, _snapshot(root))
+
+    # Modify a module: its rows are replaced and its users resolved again
+    geometry = root / "src" / "geometry_mod.f90"
+    geometry.write_text(geometry.read_text().replace("area_circle", "area_disk"))
+    report = _cycle(root, state_engine, target_engine)
+    assert (report.modified, report.removed, report.failed) == (1, 0, [])
+    assert report.resolved_modules >= 2
+    subprograms = _names(target_engine, FortranSubprogram)
+    assert "area_disk" in subprograms and "area_circle" not in subprograms
+
+    # Remove a file: its modules are unloaded and its record dropped
+    (root / "src" / "vector_mod.f90").unlink()
+    report = _cycle(root, state_engine, target_engine)
+    assert (report.modified, report.removed) == (0, 1)
+    assert "vector_mod" not in _names(target_engine, FortranModule)
+    with Session(state_engine) as session:
+        paths = set(session.scalars(select(FileRecord.source_path)))
+    assert "src/vector_mod.f90" not in paths
+
+
+def test_run_cycle_reloads_external_subprograms(project) -> None:
+    root, state_engine, target_engine = project
+    source = root / "src" / "driver.f90"
+    source.write_text(
+        "subroutine run_driver(n)\n"
+        "   integer, intent(in) :: n\n"
+        "   integer :: i\n"
+        "   i = n + 1\n"
+        "end subroutine run_driver\n"
+    )
+    report = _cycle(root, state_engine, target_engine)
+    assert report.failed == []
+
+    def _count() -> int:
+        with Session(target_engine) as session:
+            return session.scalar(select(func.count()).select_from(FortranSubprogram))
+
+    count = _count()
+    # Each new version replaces the rows of the previous one
+    for step in (2, 3):
+        source.write_text(source.read_text().replace(f"n + {step - 1}", f"n + {step}"))
+        report = _cycle(root, state_engine, target_engine)
+        assert (report.modified, report.failed) == (1, [])
+        assert _count() == count
+
+
+def test_run_cycle_reports_unreadable_files(project) -> None:
+    root, state_engine, target_engine = project
+
+    # A file removed between the scan and the cycle never gets a record
+    changes = Changes(modified={root / "src" / "gone_mod.f90": 1_000.0})
+    report = run_cycle(root, changes, state_engine, target_engine, max_workers=1)
+    assert report.failed == ["src/gone_mod.f90"]
+    assert report.modified == 1
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -7,3 +8,6 @@ for path in (ROOT, SRC):
     if str(path) not in sys.path:
         sys.path.insert(0, str(path))
 
+# Cross-check every trusted model construction of the transformers against
+# validated construction
+os.environ.setdefault("FORGE_CHECK_MODELS", "1")
@@ -0,0 +1,55 @@
+"""Tests for the content-addressed artifact cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from forge.config.models import CacheModel
+from forge.core.cache import AST, SEMANTICS, ArtifactCache
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_from_config_disabled_returns_none() -> None:
+    assert ArtifactCache.from_config(CacheModel()) is None
+
+
+def test_store_and_fetch_round_trip(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_size=1024 * 1024)
+    src = _write(tmp_path / "a.ast", b"ast-bytes")
+
+    dest = tmp_path / "checkout" / "a.ast"
+    assert not cache.fetch(AST, "deadbeef", dest)
+
+    cache.store(AST, "deadbeef", src)
+    assert cache.fetch(AST, "deadbeef", dest)
+    assert dest.read_bytes() == b"ast-bytes"
+
+    # Different artifact kinds never collide for the same source hash
+    assert not cache.fetch(SEMANTICS, "deadbeef", tmp_path / "a.json")
+
+
+def test_variants_are_cached_separately(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_size=1024 * 1024)
+    cache.store(SEMANTICS, "deadbeef", _write(tmp_path / "a.json", b"{}"), "indent=None")
+
+    dest = tmp_path / "out.json"
+    assert not cache.fetch(SEMANTICS, "deadbeef", dest, "indent=2")
+    assert cache.fetch(SEMANTICS, "deadbeef", dest, "indent=None")
+
+
+def test_prune_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_size=10)
+    for i, name in enumerate(["old", "new"]):
+        cache.store(AST, name, _write(tmp_path / f"{name}.ast", b"x" * 8))
+        entry = cache._entry(AST, name)
+        os.utime(entry, (1000 + i, 1000 + i))
+
+    assert cache.prune() == 1
+    assert not cache.fetch(AST, "old", tmp_path / "out.ast")
+    assert cache.fetch(AST, "new", tmp_path / "out.ast")
@@ -0,0 +1,32 @@
+"""Tests for the module dependency scheduling helpers."""
+
+from __future__ import annotations
+
+from forge.core.graph import topological_waves
+
+
+def test_topological_waves_orders_dependencies_first() -> None:
+    waves = topological_waves(
+        {
+            "app": ["physics", "io"],
+            "physics": ["constants", "geometry"],
+            "geometry": ["constants"],
+            "constants": [],
+            "io": [],
+        }
+    )
+    assert waves == [["constants", "io"], ["geometry"], ["physics"], ["app"]]
+
+
+def test_topological_waves_ignores_unknown_and_self_dependencies() -> None:
+    waves = topological_waves({"a": ["iso_c_binding", "a"], "b": ["a"]})
+    assert waves == [["a"], ["b"]]
+
+
+def test_topological_waves_puts_cycles_last() -> None:
+    waves = topological_waves({"a": ["b"], "b": ["a"], "c": [], "d": ["a"]})
+    assert waves == [["c"], ["a", "b", "d"]]
+
+
+def test_topological_waves_empty() -> None:
+    assert topological_waves({}) == []
@@ -0,0 +1,118 @@
+"""Tests for merging shard state into the main state database."""
+
+from __future__ import annotations
+
+import datetime as _dt
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from forge.core.merge import merge_shard, merged_status
+from forge.core.schema import (
+    Base,
+    FileRecord,
+    FileStatus,
+    ModuleDefinition,
+    ModuleUse,
+    ProjectFSMStatus,
+    ProjectState,
+)
+from forge.core.shards import Shard, prepare_shard
+
+T0 = _dt.datetime(2024, 1, 1)
+
+
+def _add_file(session: Session, root: Path, artifacts: str, name: str, when, content: str) -> FileRecord:
+    ast_path = Path(artifacts) / "asts" / f"{name}.ast"
+    (root / ast_path).parent.mkdir(parents=True, exist_ok=True)
+    (root / ast_path).write_text(content)
+    record = FileRecord(
+        project_id=1,
+        source_path=f"src/{name}",
+        file_hash=content,
+        status=FileStatus.EXTRACTED,
+        ast_path=str(ast_path),
+        last_modified=T0,
+        last_processed=when,
+    )
+    session.add(record)
+    session.flush()
+    return record
+
+
+@pytest.fixture()
+def project(tmp_path: Path):
+    (tmp_path / ".forge").mkdir()
+    engine = create_engine(f"sqlite:///{tmp_path / '.forge' / 'forge.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(ProjectState(project_name="demo", forge_version="1.0"))
+        _add_file(session, tmp_path, ".forge", "old.f90", T0, "main-old")
+        _add_file(session, tmp_path, ".forge", "new.f90", T0 + _dt.timedelta(days=2), "main-new")
+        session.commit()
+
+    shard_dir = prepare_shard(tmp_path, Shard(1, 2))
+    shard_engine = create_engine(f"sqlite:///{shard_dir / 'forge.sqlite3'}")
+    artifacts = str(shard_dir.relative_to(tmp_path))
+    with Session(shard_engine) as session:
+        later = T0 + _dt.timedelta(days=1)
+        old = _add_file(session, tmp_path, artifacts, "old.f90", later, "shard-old")
+        _add_file(session, tmp_path, artifacts, "new.f90", later, "shard-new")
+        added = _add_file(session, tmp_path, artifacts, "added.f90", later, "shard-added")
+        session.add(ModuleDefinition(file_id=added.id, name="added_mod"))
+        session.add(ModuleUse(file_id=old.id, module_name=None, used_module="added_mod"))
+        session.get(ProjectState, 1).fsm_status = ProjectFSMStatus.EXTRACTED
+        session.commit()
+    shard_engine.dispose()
+    return tmp_path, engine, shard_dir
+
+
+def test_merge_shard_keeps_newest_records(project) -> None:
+    root, engine, shard_dir = project
+    result = merge_shard(engine, root, shard_dir)
+    assert (result.files, result.kept) == (2, 1)
+    assert result.status is ProjectFSMStatus.EXTRACTED
+
+    with Session(engine) as session:
+        records = {r.source_path: r for r in session.scalars(select(FileRecord))}
+        assert {p: r.file_hash for p, r in records.items()} == {
+            "src/old.f90": "shard-old",
+            "src/new.f90": "main-new",
+            "src/added.f90": "shard-added",
+        }
+        # Artifacts now live in the main .forge directory
+        for record in records.values():
+            assert Path(record.ast_path).parts[0:2] == (".forge", "asts")
+            assert (root / record.ast_path).read_text() == record.file_hash
+
+        ids = {r.id: p for p, r in records.items()}
+        assert [ids[d.file_id] for d in session.scalars(select(ModuleDefinition))] == ["src/added.f90"]
+        assert [(ids[u.file_id], u.used_module) for u in session.scalars(select(ModuleUse))] == [
+            ("src/old.f90", "added_mod")
+        ]
+
+
+def test_merge_shard_is_idempotent(project) -> None:
+    root, engine, shard_dir = project
+    merge_shard(engine, root, shard_dir)
+    result = merge_shard(engine, root, shard_dir)
+    assert (result.files, result.kept) == (0, 3)
+    with Session(engine) as session:
+        assert session.query(FileRecord).count() == 3
+        assert session.query(ModuleDefinition).count() == 1
+
+
+def test_merge_shard_requires_state_database(tmp_path: Path) -> None:
+    engine = create_engine("sqlite://")
+    with pytest.raises(FileNotFoundError):
+        merge_shard(engine, tmp_path, tmp_path / "missing")
+
+
+def test_merged_status() -> None:
+    assert merged_status([]) is None
+    assert (
+        merged_status([ProjectFSMStatus.TRANSFORMED, ProjectFSMStatus.EXTRACTED])
+        is ProjectFSMStatus.EXTRACTED
+    )
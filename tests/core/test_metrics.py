@@ -0,0 +1,53 @@
+"""Tests for the pipeline instrumentation layer."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from forge.core.metrics import current, recording
+
+
+def test_current_is_noop_outside_a_run() -> None:
+    current().incr("ignored")
+    with current().span("ignored"):
+        pass
+    assert current().counters == {}
+    assert current().spans == {}
+
+
+def test_recording_collects_spans_counters_and_files(tmp_path: Path) -> None:
+    with recording("extract") as recorder:
+        assert current() is recorder
+        current().incr("rows.fortran_symbols", 3)
+        current().incr("rows.fortran_symbols", 2)
+        with current().span("extract.parse"):
+            pass
+        for i in range(200):
+            recorder.add_file(f"src/f{i}.f90", float(i))
+
+    assert recorder.counters == {"rows.fortran_symbols": 5}
+    assert recorder.spans["extract.parse"]["count"] == 1
+
+    path = recorder.write(tmp_path)
+    assert path.parent == tmp_path / "metrics"
+    data = json.loads(path.read_text())
+    assert data["stage"] == "extract"
+    assert data["files"]["count"] == 200
+    # The slowest 1% of the files are reported explicitly
+    assert [f["path"] for f in data["files"]["slowest"]] == ["src/f199.f90", "src/f198.f90"]
+    assert recorder.summary_table().row_count > 0
+
+
+def test_instrument_engine_counts_queries_and_commits() -> None:
+    engine = create_engine("sqlite://")
+    with recording("load") as recorder:
+        recorder.instrument_engine(engine, "target")
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+    assert recorder.counters["target.queries"] == 2
+    assert recorder.counters["target.commits"] == 1
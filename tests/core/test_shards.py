@@ -0,0 +1,61 @@
+"""Tests for the partitioning of projects into shards."""
+
+from __future__ import annotations
+
+from pathlib import Path, PurePosixPath, PureWindowsPath
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from forge.core.schema import Base, ProjectState
+from forge.core.shards import Shard, prepare_shard, shard_index
+
+
+@pytest.mark.parametrize("spec, expected", [("1/4", Shard(1, 4)), (" 3 / 3 ", Shard(3, 3))])
+def test_parse(spec: str, expected: Shard) -> None:
+    assert Shard.parse(spec) == expected
+    assert str(expected) == f"{expected.index}/{expected.count}"
+
+
+@pytest.mark.parametrize("spec", ["", "1", "0/4", "5/4", "1/0", "a/b", "-1/2"])
+def test_parse_rejects_invalid_specs(spec: str) -> None:
+    with pytest.raises(ValueError):
+        Shard.parse(spec)
+
+
+def test_shards_partition_the_files() -> None:
+    paths = [f"src/dir{i % 7}/file{i}.f90" for i in range(400)]
+    shards = [Shard(i, 4) for i in range(1, 5)]
+    owners = [[s for s in shards if s.contains(p)] for p in paths]
+    assert all(len(o) == 1 for o in owners)
+    # Every shard gets a reasonable share
+    assert all(sum(o[0] == s for o in owners) > 50 for s in shards)
+
+
+def test_shard_index_is_stable_across_platforms() -> None:
+    assert shard_index(PureWindowsPath("src\\a\\b.f90"), 8) == shard_index("src/a/b.f90", 8)
+    assert shard_index(PurePosixPath("src/a/b.f90"), 8) == shard_index("src/a/b.f90", 8)
+    # The partition must never change between releases
+    assert [shard_index(f"src/m{i}.f90", 4) for i in range(6)] == [4, 4, 2, 2, 3, 3]
+
+
+def test_prepare_shard(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        prepare_shard(tmp_path, Shard(1, 2))
+
+    (tmp_path / ".forge").mkdir()
+    engine = create_engine(f"sqlite:///{tmp_path / '.forge' / 'forge.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(ProjectState(project_name="demo", forge_version="1.2.3"))
+        session.commit()
+
+    directory = prepare_shard(tmp_path, Shard(1, 2))
+    assert directory == tmp_path / ".forge" / "shards" / "1-of-2"
+    shard_engine = create_engine(f"sqlite:///{directory / 'forge.sqlite3'}")
+    with Session(shard_engine) as session:
+        project = session.query(ProjectState).one()
+        assert (project.project_name, project.forge_version) == ("demo", "1.2.3")
+    # Existing shards are reused
+    assert prepare_shard(tmp_path, Shard(1, 2)) == directory
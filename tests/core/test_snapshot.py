@@ -0,0 +1,39 @@
+"""Tests for in-memory snapshots of SQLite databases."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+from forge.core.snapshot import copy_database, memory_snapshot
+
+
+def _names(conn) -> list[str]:
+    return conn.execute(text("SELECT name FROM symbols ORDER BY id")).scalars().all()
+
+
+def test_memory_snapshot_round_trip(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'target.sqlite3'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE symbols (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO symbols (name) VALUES ('a'), ('b')"))
+
+    snapshot = memory_snapshot(engine)
+    with snapshot.begin() as conn:
+        conn.execute(text("UPDATE symbols SET name = 'c' WHERE name = 'b'"))
+        conn.execute(text("CREATE INDEX ix_symbols_name ON symbols (name)"))
+    # Changes to the snapshot do not reach the file until written back
+    with engine.connect() as conn:
+        assert _names(conn) == ["a", "b"]
+    # Every connection of the snapshot engine sees the same database
+    with snapshot.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM symbols")).scalar_one() == 2
+
+    copy_database(snapshot, engine)
+    snapshot.dispose()
+    with engine.connect() as conn:
+        assert _names(conn) == ["a", "c"]
+        indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+        assert indexes.scalars().all() == ["ix_symbols_name"]
+
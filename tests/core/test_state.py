@@ -0,0 +1,258 @@
+"""Tests for the bulk file record helpers."""
+
+from __future__ import annotations
+
+import datetime as _dt
+
+import pytest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import Session
+
+from forge.core.metrics import MetricsRecorder
+from forge.core.schema import (
+    Base,
+    FileRecord,
+    FileStatus,
+    ModuleUse,
+    ProjectFSMStatus,
+    ProjectState,
+)
+from forge.core.state import (
+    Checkpointer,
+    file_rows,
+    failed_files,
+    file_waves,
+    get_project_id,
+    iter_file_records,
+    recent_runs,
+    record_run,
+    set_project_status,
+    status_counts,
+    write_file_records,
+    write_module_graph,
+)
+
+NOW = _dt.datetime(2024, 1, 1)
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _insert(session: Session, project_id: int, batch: list[str]) -> None:
+    write_file_records(
+        session,
+        inserts=[
+            {
+                "project_id": project_id,
+                "source_path": name,
+                "file_hash": name,
+                "status": FileStatus.EXTRACTED,
+                "last_modified": NOW,
+            }
+            for name in batch
+        ],
+    )
+
+
+def _project(engine) -> int:
+    with Session(engine) as session:
+        project = ProjectState(project_name="p", forge_version="0")
+        session.add(project)
+        session.commit()
+        return project.id
+
+
+def _paths(engine) -> list[str]:
+    with Session(engine) as session:
+        return sorted(r.source_path for r in session.query(FileRecord))
+
+
+def test_bulk_insert_and_update_round_trip() -> None:
+    engine = _engine()
+    with Session(engine) as session:
+        project = ProjectState(project_name="p", forge_version="0")
+        session.add(project)
+        session.flush()
+
+        write_file_records(
+            session,
+            inserts=[
+                {
+                    "project_id": project.id,
+                    "source_path": f"src/{name}.f90",
+                    "file_hash": name,
+                    "status": FileStatus.EXTRACTED,
+                    "last_modified": NOW,
+                }
+                for name in ("a", "b")
+            ],
+        )
+        rows = file_rows(session, project.id, FileRecord.file_hash)
+        assert {path: row.file_hash for path, row in rows.items()} == {
+            "src/a.f90": "a",
+            "src/b.f90": "b",
+        }
+
+        write_file_records(
+            session,
+            updates=[
+                {"id": rows["src/a.f90"].id, "status": FileStatus.FAILED_TRANSFORM, "error_message": "x"},
+                {"id": rows["src/b.f90"].id, "status": FileStatus.TRANSFORMED},
+            ],
+        )
+        session.commit()
+
+        records = {r.source_path: r for r in session.query(FileRecord)}
+        assert records["src/a.f90"].status == FileStatus.FAILED_TRANSFORM
+        assert records["src/a.f90"].error_message == "x"
+        assert records["src/b.f90"].status == FileStatus.TRANSFORMED
+        assert records["src/b.f90"].file_hash == "b"
+
+
+def test_checkpointer_commits_every_n_results() -> None:
+    engine = _engine()
+    project_id = _project(engine)
+    write = lambda session, batch: _insert(session, project_id, batch)  # noqa: E731
+
+    with Checkpointer(engine, write, every=2, interval=3600) as checkpoint:
+        for name in ("a", "b", "c"):
+            checkpoint.add(name)
+        assert _paths(engine) == ["a", "b"]
+    assert checkpoint.checkpoints == 2
+    assert _paths(engine) == ["a", "b", "c"]
+
+
+def test_checkpointer_keeps_results_of_interrupted_runs() -> None:
+    engine = _engine()
+    project_id = _project(engine)
+    write = lambda session, batch: _insert(session, project_id, batch)  # noqa: E731
+
+    with pytest.raises(KeyboardInterrupt):
+        with Checkpointer(engine, write, every=100, interval=3600) as checkpoint:
+            checkpoint.add("a")
+            raise KeyboardInterrupt
+    assert _paths(engine) == ["a"]
+
+
+def test_file_waves_follow_the_module_graph() -> None:
+    engine = _engine()
+    project_id = _project(engine)
+    with Session(engine) as session:
+        _insert(session, project_id, ["app.f90", "constants.f90", "physics.f90", "util.f90"])
+        ids = {row.source_path: row.id for row in file_rows(session, project_id).values()}
+        write_module_graph(
+            session,
+            {
+                ids["app.f90"]: (set(), {(None, "physics"), (None, "iso_c_binding")}),
+                ids["constants.f90"]: ({"constants"}, set()),
+                ids["physics.f90"]: ({"physics"}, {("physics", "constants")}),
+            },
+        )
+        session.commit()
+
+        waves = file_waves(session, ids.values())
+        assert waves == [
+            [ids["constants.f90"], ids["util.f90"]],
+            [ids["physics.f90"]],
+            [ids["app.f90"]],
+        ]
+        # Files outside of the selection impose no order
+        assert file_waves(session, [ids["app.f90"], ids["constants.f90"]]) == [
+            [ids["app.f90"], ids["constants.f90"]]
+        ]
+
+        # Recording a file again replaces its graph
+        write_module_graph(session, {ids["physics.f90"]: ({"physics"}, set())})
+        session.commit()
+        assert session.query(ModuleUse).filter_by(file_id=ids["physics.f90"]).count() == 0
+        assert file_waves(session, [ids["physics.f90"], ids["app.f90"]]) == [
+            [ids["physics.f90"]],
+            [ids["app.f90"]],
+        ]
+
+
+def test_project_access_does_not_load_files() -> None:
+    engine = _engine()
+    project_id = _project(engine)
+    with Session(engine) as session:
+        _insert(session, project_id, ["a.f90", "b.f90"])
+        session.commit()
+
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with Session(engine) as session:
+        assert get_project_id(session) == project_id
+        session.query(ProjectState).one()
+        set_project_status(session, project_id, ProjectFSMStatus.EXTRACTED)
+        session.commit()
+    assert not any("file_records" in statement for statement in statements)
+
+    with Session(engine) as session:
+        assert session.get(ProjectState, project_id).fsm_status == ProjectFSMStatus.EXTRACTED
+
+
+def test_iter_file_records_streams_by_status() -> None:
+    engine = _engine()
+    project_id = _project(engine)
+    with Session(engine) as session:
+        _insert(session, project_id, [f"f{i}.f90" for i in range(10)])
+        session.execute(
+            update(FileRecord)
+            .where(FileRecord.source_path.in_(["f1.f90", "f7.f90"]))
+            .values(status=FileStatus.TRANSFORMED)
+        )
+        session.commit()
+
+        rows = list(
+            iter_file_records(
+                session, project_id, FileRecord.status, status=FileStatus.TRANSFORMED, batch_size=3
+            )
+        )
+        assert sorted(row.source_path for row in rows) == ["f1.f90", "f7.f90"]
+        assert {row.status for row in rows} == {FileStatus.TRANSFORMED}
+        assert len(list(iter_file_records(session, project_id, batch_size=3))) == 10
+
+
+def test_status_aggregates() -> None:
+    engine = _engine()
+    project_id = _project(engine)
+    with Session(engine) as session:
+        _insert(session, project_id, ["a.f90", "b.f90", "c.f90", "d.f90"])
+        session.execute(
+            update(FileRecord)
+            .where(FileRecord.source_path.in_(["d.f90", "b.f90"]))
+            .values(status=FileStatus.FAILED_EXTRACT, error_message="syntax error")
+        )
+        session.commit()
+
+        assert status_counts(session) == {FileStatus.EXTRACTED: 2, FileStatus.FAILED_EXTRACT: 2}
+        assert [(r.source_path, r.error_message) for r in failed_files(session)] == [
+            ("b.f90", "syntax error"),
+            ("d.f90", "syntax error"),
+        ]
+        assert len(failed_files(session, limit=1)) == 1
+
+
+def test_record_run_appends_to_the_history() -> None:
+    engine = _engine()
+    _project(engine)
+    for stage in ["extract", "transform"]:
+        recorder = MetricsRecorder(stage)
+        recorder.add_file("a.f90", 0.1)
+        recorder.incr("files.failed", 2)
+        record_run(engine, recorder, files=3 if stage == "transform" else None)
+
+    with Session(engine) as session:
+        runs = recent_runs(session)
+        assert [r.stage for r in runs] == ["transform", "extract"]
+        assert [r.files_processed for r in runs] == [3, 1]
+        assert all(r.files_failed == 2 and r.finished >= r.started for r in runs)
+        assert [r.stage for r in recent_runs(session, stage="extract")] == ["extract"]
+        assert len(recent_runs(session, limit=1)) == 1
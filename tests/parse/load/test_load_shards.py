@@ -0,0 +1,108 @@
+"""Tests for merging databases loaded in parallel into the target database."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    select,
+)
+
+from forge.tasks.parse.load.shards import merge_database
+
+metadata = MetaData()
+modules = Table(
+    "modules",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, unique=True),
+)
+subprograms = Table(
+    "subprograms",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("module_id", ForeignKey("modules.id")),
+    Column("name", String),
+)
+uses = Table(
+    "uses",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("subprogram_id", ForeignKey("subprograms.id"), nullable=True),
+    Column("target_module_id", ForeignKey("modules.id"), nullable=True),
+)
+
+
+def _database(path: Path, rows: dict[Table, list[dict]]):
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table, values in rows.items():
+            if values:
+                conn.execute(insert(table), values)
+    return engine
+
+
+def _names(engine) -> list[tuple]:
+    with engine.connect() as conn:
+        return conn.execute(
+            select(subprograms.c.name, modules.c.name)
+            .join(modules, subprograms.c.module_id == modules.c.id)
+            .order_by(subprograms.c.id)
+        ).all()
+
+
+def test_merge_database_shifts_keys(tmp_path: Path) -> None:
+    target = _database(
+        tmp_path / "target.sqlite3",
+        {
+            modules: [{"id": 1, "name": "a"}],
+            subprograms: [{"id": 1, "module_id": 1, "name": "a_init"}],
+        },
+    )
+    for i, name in enumerate(["b", "c"]):
+        shard = _database(
+            tmp_path / f"{name}.sqlite3",
+            {
+                modules: [{"id": 1, "name": name}, {"id": 2, "name": "a"}],
+                subprograms: [
+                    {"id": 1, "module_id": 1, "name": f"{name}_run"},
+                    {"id": 2, "module_id": 2, "name": f"a_{name}"},
+                ],
+                uses: [
+                    {"id": 1, "subprogram_id": 1, "target_module_id": 2},
+                    {"id": 2, "subprogram_id": 2, "target_module_id": None},
+                ],
+            },
+        )
+        shard.dispose()
+        counts = merge_database(
+            target, tmp_path / f"{name}.sqlite3", metadata, {"modules": ("name",)}
+        )
+        # Module "a" exists in the target and is not copied again
+        assert counts == {"modules": 1, "subprograms": 2, "uses": 2}
+
+    assert _names(target) == [
+        ("a_init", "a"),
+        ("b_run", "b"),
+        ("a_b", "a"),
+        ("c_run", "c"),
+        ("a_c", "a"),
+    ]
+    with target.connect() as conn:
+        rows = conn.execute(
+            select(subprograms.c.name, modules.c.name)
+            .select_from(uses)
+            .join(subprograms, uses.c.subprogram_id == subprograms.c.id)
+            .outerjoin(modules, uses.c.target_module_id == modules.c.id)
+            .order_by(uses.c.id)
+        ).all()
+    assert rows == [("b_run", "a"), ("a_b", None), ("c_run", "a"), ("a_c", None)]
@@ -0,0 +1,50 @@
+"""Tests for the incremental semantics reader."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from forge.tasks.parse.load.reader import iter_file_semantics
+
+DOCUMENT = {
+    "modules": {
+        "m": {"symbol_table": {"x": {"name": "x", "note": "a } in a \"string\""}}},
+        "n": {"references": [1, 2, 3]},
+    },
+    "subprograms": {"m::s": {"calls": []}, "m::t": {"ios": [{"unit": "*"}]}},
+}
+
+
+def _entries(document: dict) -> list[tuple[str, str, dict]]:
+    return [(s, k, v) for s, entries in document.items() for k, v in entries.items()]
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_yields_entries_in_document_order(indent, chunk_size) -> None:
+    text = json.dumps(DOCUMENT, indent=indent)
+    entries = list(iter_file_semantics(io.StringIO(text), chunk_size=chunk_size))
+    assert entries == _entries(DOCUMENT)
+
+
+@pytest.mark.parametrize("text", ["{}", '{"modules": {}, "subprograms": {}}', " {\n}\n"])
+def test_empty_documents(text) -> None:
+    assert list(iter_file_semantics(io.StringIO(text))) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"modules": {"m": {}}',
+        '{"modules": {"m": {"a": 1}',
+        '{"modules": {"m": []}}',
+        '{"other": {}}',
+        '{"modules": {}} trailing',
+    ],
+)
+def test_rejects_malformed_documents(text) -> None:
+    with pytest.raises(ValueError):
+        list(iter_file_semantics(io.StringIO(text), chunk_size=3))
@@ -0,0 +1,76 @@
+"""Tests for source file discovery."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import os
+import re
+
+import pytest
+
+from forge.config.models import SourcesModel
+from forge.tasks.parse.discover import collect_source_files, discover_source_files, translate_glob
+
+
+def _touch(root: Path, *names: str) -> None:
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+
+@pytest.mark.parametrize(
+    "pattern, path, expected",
+    [
+        ("**/*.f90", "a.f90", True),
+        ("**/*.f90", "x/y/a.f90", True),
+        ("**/*.f90", "x/a.F90", False),
+        ("*.f90", "x/a.f90", False),
+        ("x/**", "x/y/a.f90", True),
+        ("x/[ab].f90", "x/b.f90", True),
+        ("x/[!ab].f90", "x/b.f90", False),
+        ("x/?.f90", "x/ab.f90", False),
+    ],
+)
+def test_translate_glob(pattern: str, path: str, expected: bool) -> None:
+    assert (re.match(translate_glob(pattern), path) is not None) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_collect_source_files(tmp_path: Path, workers: int) -> None:
+    _touch(
+        tmp_path,
+        "src/a.f90",
+        "src/b.F90",
+        "src/c.f",
+        "src/deep/nested/d.f90",
+        "src/vendor/e.f90",
+        "src/gen/f_auto.f90",
+        "src/.hidden/g.f90",
+        "lib/h.f90",
+    )
+    sources = SourcesModel(
+        source_dirs=["src", "lib", "src/deep"],
+        exclude_patterns=["src/vendor/*", "*_auto.f90"],
+    )
+
+    files = collect_source_files(tmp_path, sources, workers=workers)
+
+    assert [p.relative_to(tmp_path).as_posix() for p in files] == [
+        "lib/h.f90",
+        "src/a.f90",
+        "src/b.F90",
+        "src/deep/nested/d.f90",
+    ]
+
+
+def test_discover_source_files_reports_modification_times(tmp_path: Path) -> None:
+    _touch(tmp_path, "src/a.f90", "src/b.f90")
+    os.utime(tmp_path / "src/b.f90", (1_000_000, 1_000_000))
+    (tmp_path / "src/dangling.f90").symlink_to(tmp_path / "missing.f90")
+
+    found = discover_source_files(tmp_path, SourcesModel(source_dirs=["src"]))
+
+    assert list(found) == [tmp_path / "src/a.f90", tmp_path / "src/b.f90"]
+    assert found[tmp_path / "src/a.f90"] == (tmp_path / "src/a.f90").stat().st_mtime
+    assert found[tmp_path / "src/b.f90"] == 1_000_000
@@ -0,0 +1,35 @@
+"""Tests for source file fingerprints."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import hashlib
+
+import pytest
+
+from forge.tasks.parse.fingerprint import fingerprint_file, fingerprint_files
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024 * 1024])
+def test_fingerprint_file_hashes_raw_bytes(tmp_path: Path, chunk_size: int) -> None:
+    data = "module m\r\n  ! été\r\nend module m\n".encode("utf-8") * 50
+    path = tmp_path / "m.f90"
+    path.write_bytes(data)
+
+    fingerprint = fingerprint_file(path, chunk_size=chunk_size)
+    assert fingerprint.digest == hashlib.sha256(data).hexdigest()
+    assert fingerprint.lines == data.count(b"\n")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_fingerprint_files_skips_unreadable_files(tmp_path: Path, workers: int) -> None:
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"f{i}.f90"
+        path.write_text(f"! file {i}\n")
+        paths.append(path)
+    missing = tmp_path / "missing.f90"
+
+    fingerprints = fingerprint_files([*paths, missing], workers=workers)
+    assert list(fingerprints) == paths
+    assert fingerprints[paths[2]].digest == hashlib.sha256(b"! file 2\n").hexdigest()
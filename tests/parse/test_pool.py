@@ -0,0 +1,55 @@
+"""Tests for the supervised worker process pool."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from forge.tasks.parse.pool import SupervisedPool
+
+
+def _work(kind: str) -> str:
+    if kind == "sleep":
+        time.sleep(30)
+    elif kind == "memory":
+        blocks = []
+        while True:
+            blocks.append(bytearray(64 * 1024 * 1024))
+    elif kind == "crash":
+        os._exit(3)
+    elif kind == "error":
+        raise ValueError("bad input")
+    return kind.upper()
+
+
+def _run(pool: SupervisedPool, kinds: list[str]) -> dict[int, tuple]:
+    tasks = [(i, (kind,)) for i, kind in enumerate(kinds)]
+    return {key: (result, error) for key, result, error in pool.imap_unordered(tasks)}
+
+
+def test_pool_returns_results_and_errors() -> None:
+    pool = SupervisedPool(_work, workers=2, max_tasks_per_worker=1)
+    results = _run(pool, ["a", "error", "b", "c"])
+    assert results == {
+        0: ("A", None),
+        1: (None, "bad input"),
+        2: ("B", None),
+        3: ("C", None),
+    }
+
+
+def test_pool_kills_tasks_exceeding_the_timeout() -> None:
+    pool = SupervisedPool(_work, workers=2, timeout=0.5)
+    start = time.monotonic()
+    results = _run(pool, ["sleep", "a", "b", "crash", "c"])
+    assert time.monotonic() - start < 10
+    assert results[0][0] is None and "timed out" in results[0][1]
+    assert results[3][0] is None and "died" in results[3][1]
+    assert [results[i] for i in (1, 2, 4)] == [("A", None), ("B", None), ("C", None)]
+
+
+def test_pool_enforces_the_memory_limit() -> None:
+    pool = SupervisedPool(_work, workers=1, memory_limit=1024 * 1024 * 1024)
+    results = _run(pool, ["memory", "a"])
+    assert results[0][0] is None and "memory" in results[0][1]
+    assert results[1] == ("A", None)
@@ -0,0 +1,113 @@
+"""Tests for splitting sources into separately parsed program units."""
+
+from __future__ import annotations
+
+from fparser.two.utils import Base
+
+from forge.tasks.parse.extract import (
+    extract_from_fortran_string,
+    extract_units_from_fortran_string,
+)
+from forge.tasks.parse.split import scan_program_units
+
+SOURCE = """\
+! leading comment
+module m
+  implicit none
+contains
+  subroutine inner(x)
+    real :: x
+    x = 1.0
+  end subroutine inner
+end module m
+
+real(kind=8) function ext(a) result(b)
+  real(8) :: a
+  b = a; if (a > 0) b = 1
+end function ext
+
+subroutine s2(x) ! function foo(
+  character(len=*) :: x
+  x = "end subroutine s2"
+  call foo(x, &
+     & 'module y')
+  do i = 1, 2
+  enddo
+end
+
+program main
+  interface
+    subroutine ifc(a)
+      real :: a
+    end subroutine ifc
+  end interface
+  print *, 'hi'
+end program main
+"""
+
+
+def _spans(node: Base, out: list) -> list:
+    item = getattr(node, "item", None)
+    if item is not None:
+        out.append(item.span)
+    for child in node.children:
+        if isinstance(child, Base):
+            _spans(child, out)
+    return out
+
+
+def test_scan_finds_top_level_units() -> None:
+    units = scan_program_units(SOURCE)
+    assert [(u.kind, u.name, u.start + 1, u.end + 1) for u in units] == [
+        ("module", "m", 2, 9),
+        ("function", "ext", 11, 14),
+        ("subroutine", "s2", 16, 23),
+        ("program", "main", 25, 32),
+    ]
+
+
+def test_scan_skips_comments_within_continuations() -> None:
+    source = (
+        "subroutine &\n"
+        "  ! the name follows\n"
+        "\n"
+        "  & first(a, b)\n"
+        "end subroutine first\n"
+        "subroutine second\n"
+        "end subroutine second\n"
+    )
+    units = scan_program_units(source)
+    assert [(u.name, u.start + 1, u.end + 1) for u in units] == [
+        ("first", 1, 5),
+        ("second", 6, 7),
+    ]
+    stitched, failed = extract_units_from_fortran_string(source)
+    assert failed == []
+    assert str(stitched) == str(extract_from_fortran_string(source))
+
+
+def test_scan_refuses_layouts_it_does_not_understand() -> None:
+    assert scan_program_units("x = 1\nend\n") is None
+    assert scan_program_units("#ifdef A\nmodule a\nend module a\n#endif\n") is None
+    assert scan_program_units("      subroutine a\n      end\n") is None
+    assert scan_program_units("module a\n") is None
+
+
+def test_split_parse_matches_whole_file_parse() -> None:
+    whole = extract_from_fortran_string(SOURCE)
+    stitched, failed = extract_units_from_fortran_string(SOURCE)
+    assert failed == []
+    assert str(stitched) == str(whole)
+    assert _spans(stitched, []) == _spans(whole, [])
+    assert all(child.parent is stitched for child in stitched.children)
+
+
+def test_broken_unit_does_not_discard_the_file() -> None:
+    source = SOURCE.replace("b = a; if", "b = = a; if")
+    ast, failed = extract_units_from_fortran_string(source)
+    assert failed == ["function ext (lines 11-14)"]
+    assert [type(c).__name__ for c in ast.children] == [
+        "Module",
+        "Subroutine_Subprogram",
+        "Main_Program",
+    ]
@@ -0,0 +1,59 @@
+"""Tests for the streaming semantics writer."""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from forge.tasks.parse.transform.writer import FileSemanticsWriter
+
+
+class Entry(BaseModel):
+    names: list[str]
+    line: int
+
+
+def _write(indent: int | None, modules: dict, subprograms: dict) -> str:
+    buffer = io.StringIO()
+    with FileSemanticsWriter(buffer, indent=indent) as writer:
+        for name, entry in modules.items():
+            writer.write_module(name, entry)
+        for key, entry in subprograms.items():
+            writer.write_subprogram(key, entry)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize(
+    "modules, subprograms",
+    [
+        ({}, {}),
+        ({"m": Entry(names=["x"], line=1)}, {}),
+        ({}, {"s": Entry(names=[], line=2)}),
+        (
+            {"m": Entry(names=["x", "ä"], line=1), "n": Entry(names=[], line=9)},
+            {"m::s": Entry(names=["y"], line=3), 'odd "key"': Entry(names=["z"], line=4)},
+        ),
+    ],
+)
+def test_output_matches_json_dump(indent, modules, subprograms) -> None:
+    expected = {
+        "modules": {k: v.model_dump() for k, v in modules.items()},
+        "subprograms": {k: v.model_dump() for k, v in subprograms.items()},
+    }
+    text = _write(indent, modules, subprograms)
+    assert json.loads(text) == expected
+    if indent is None:
+        assert "\n" not in text and ", " not in text
+    else:
+        assert text == json.dumps(expected, indent=indent, ensure_ascii=False)
+
+
+def test_sections_must_be_written_in_order() -> None:
+    writer = FileSemanticsWriter(io.StringIO())
+    writer.write_subprogram("s", Entry(names=[], line=1))
+    with pytest.raises(ValueError):
+        writer.write_module("m", Entry(names=[], line=1))
@@ -135,6 +135,23 @@ def test_data_component_with_array():
     assert result.declared_components["components"].attributes.array_spec.dimensions[0].upper == "3"
     assert result.declared_components["components"].attributes.additional_keywords == ["pointer"]
 
+def test_components_of_one_statement_do_not_share_attributes():
+    """Test that components declared together get their own attributes"""
+    content = """
+    TYPE :: pair
+        REAL, ALLOCATABLE :: first, second
+    END TYPE pair
+    """
+    component = create_data_component_from_str(content)
+    result = from_derived_type_definition(component)
+
+    first = result.declared_components["first"].attributes
+    second = result.declared_components["second"].attributes
+    assert first is not second
+    assert first.additional_keywords is not second.additional_keywords
+    first.additional_keywords.append("pointer")
+    assert second.additional_keywords == ["allocatable"]
+
 def test_data_component_with_multiple_attributes():
     """Test processing of data component with multiple attributes"""
     content = """
@@ -0,0 +1,43 @@
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from forge.tasks.parse.transform.utils import construct
+from forge.tasks.parse.transform.utils.construct import set_model_check
+
+
+class Ref(BaseModel):
+    name: str
+    line: int
+    component_name: Optional[list[str]] = None
+
+
+@pytest.fixture
+def model_check(request):
+    previous = set_model_check(request.param)
+    yield
+    set_model_check(previous)
+
+
+@pytest.mark.parametrize("model_check", [False], indirect=True)
+def test_construct_skips_validation(model_check):
+    ref = construct(Ref, name="a", line="3")
+    assert ref.line == "3"
+    assert ref.component_name is None
+
+
+@pytest.mark.parametrize("model_check", [True], indirect=True)
+def test_construct_matches_validation(model_check):
+    names = ["x"]
+    ref = construct(Ref, name="a", line=3, component_name=names)
+    assert ref == Ref(name="a", line=3, component_name=["x"])
+    # The checked path returns the unvalidated model, like production
+    assert ref.component_name is names
+
+
+@pytest.mark.filterwarnings("ignore:Pydantic serializer warnings")
+@pytest.mark.parametrize("model_check", [True], indirect=True)
+def test_cross_check_reports_divergence(model_check):
+    with pytest.raises(AssertionError, match="Ref"):
+        construct(Ref, name="a", line="3")
@@ -0,0 +1,30 @@
+from fparser.two.utils import Base
+
+from tests.helpers import get_module_ast, parse_fortran_to_ast
+from forge.tasks.parse.transform.utils import annotate_line_numbers, get_line_number
+from forge.tasks.parse.transform.utils.get_line_number import LINE_ATTR
+
+
+def _walk(node):
+    yield node
+    for child in node.children:
+        if isinstance(child, Base):
+            yield from _walk(child)
+
+
+def test_annotation_matches_on_demand_lookup():
+    expected = [get_line_number(n) for n in _walk(get_module_ast("src/vector_mod.f90"))]
+
+    module = get_module_ast("src/vector_mod.f90")
+    annotate_line_numbers(module)
+    nodes = list(_walk(module))
+    assert all(hasattr(n, LINE_ATTR) for n in nodes)
+    assert [get_line_number(n) for n in nodes] == expected
+    assert max(expected) > 30
+
+
+def test_lookup_is_memoized():
+    ast = parse_fortran_to_ast("MODULE TEST\n  INTEGER :: a\nEND MODULE TEST\n")
+    decl = ast.children[0].children[1].children[0]
+    assert get_line_number(decl) == 2
+    assert getattr(decl, LINE_ATTR) == 2
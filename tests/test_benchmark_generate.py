@@ -0,0 +1,34 @@
+"""Tests for the synthetic project generator of the benchmark suite."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.generate import TIERS, ProjectSpec, generate_module, generate_project
+from tests.helpers import parse_fortran_to_ast
+
+
+def test_generator_is_deterministic(tmp_path: Path) -> None:
+    spec = ProjectSpec(modules=4, subprograms=3)
+    first = [p.read_text() for p in generate_project(spec, tmp_path / "a")]
+    second = [p.read_text() for p in generate_project(spec, tmp_path / "b")]
+    assert first == second
+    assert (tmp_path / "a" / "forge.toml").is_file()
+
+
+def test_generated_modules_parse() -> None:
+    spec = ProjectSpec(modules=5, subprograms=4, use_fanout=2, calls=3)
+    for index in range(spec.modules):
+        source = generate_module(spec, index)
+        ast = parse_fortran_to_ast(source)
+        assert source.count("end subroutine") + source.count("end function") == 4
+        assert source.count("   use ") == min(index, spec.use_fanout)
+        assert ast is not None
+
+
+def test_tiers_are_named_after_their_size() -> None:
+    assert {name: spec.total_subprograms for name, spec in TIERS.items()} == {
+        "1k": 1_000,
+        "10k": 10_000,
+        "100k": 100_000,
+    }
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+import json
 import shutil
 
 from typer.testing import CliRunner
@@ -61,3 +62,98 @@ def test_extract_accepts_max_workers_option() -> None:
         result = runner.invoke(app, ["extract", "--max-workers", "2"])
         assert result.exit_code == 0
 
+
+
+def test_extract_shares_artifact_between_identical_files() -> None:
+    runner = CliRunner()
+
+    example_src = (
+        Path(__file__).resolve().parents[1] / "examples" / "basic" / "src"
+    )
+
+    with runner.isolated_filesystem():
+        shutil.copytree(example_src, Path("src"))
+        Path("src/vendor").mkdir()
+        shutil.copy("src/vector_mod.f90", "src/vendor/vector_copy.f90")
+
+        runner.invoke(app, ["init"])
+        result = runner.invoke(app, ["extract", "--max-workers", "1"])
+        assert result.exit_code == 0
+
+        engine = create_engine("sqlite:///.forge/forge.sqlite3")
+        with Session(engine) as session:
+            original, copy = (
+                session.query(FileRecord)
+                .filter(FileRecord.source_path.in_(
+                    ["src/vector_mod.f90", "src/vendor/vector_copy.f90"]
+                ))
+                .order_by(FileRecord.source_path)
+                .all()
+            )
+            assert original.ast_path == copy.ast_path
+            assert original.ast_path.startswith(".forge/asts/_shared/")
+            shared = Path(original.ast_path)
+            assert shared.is_file()
+
+        # Diverging one copy must not break the artifact of the other
+        with open("src/vendor/vector_copy.f90", "a") as f:
+            f.write("\n! local change\n")
+        result = runner.invoke(app, ["extract", "--max-workers", "1"])
+        assert result.exit_code == 0
+
+        with Session(engine) as session:
+            copy = session.query(FileRecord).filter_by(
+                source_path="src/vendor/vector_copy.f90"
+            ).one()
+            assert copy.ast_path == ".forge/asts/src/vendor/vector_copy.f90.ast"
+        assert shared.is_file()
+
+
+def test_extract_writes_run_metrics() -> None:
+    runner = CliRunner()
+
+    example_src = (
+        Path(__file__).resolve().parents[1] / "examples" / "basic" / "src"
+    )
+
+    with runner.isolated_filesystem():
+        shutil.copytree(example_src, Path("src"))
+
+        runner.invoke(app, ["init"])
+        result = runner.invoke(app, ["extract", "--max-workers", "1", "--metrics"])
+        assert result.exit_code == 0
+
+        (metrics_file,) = Path(".forge/metrics").glob("extract-*.json")
+        data = json.loads(metrics_file.read_text())
+        assert data["files"]["count"] == 4
+        assert "extract.parse" in data["spans"]
+        assert data["counters"]["state.commits"] >= 1
+
+
+def test_extract_marks_files_exceeding_the_timeout_as_failed() -> None:
+    runner = CliRunner()
+
+    example_src = (
+        Path(__file__).resolve().parents[1] / "examples" / "basic" / "src"
+    )
+
+    with runner.isolated_filesystem():
+        shutil.copytree(example_src, Path("src"))
+        body = "\n".join(f"   real, parameter :: t{i} = {i}.0" for i in range(40000))
+        Path("src/table_mod.f90").write_text(f"module table_mod\n{body}\nend module table_mod\n")
+
+        runner.invoke(app, ["init"])
+        result = runner.invoke(
+            app,
+            ["extract", "--max-workers", "2", "--file-timeout", "1", "--file-memory-limit", "2048"],
+        )
+        assert result.exit_code == 0
+
+        engine = create_engine("sqlite:///.forge/forge.sqlite3")
+        with Session(engine) as session:
+            records = {r.source_path: r for r in session.query(FileRecord).all()}
+            table = records.pop("src/table_mod.f90")
+            assert table.status == FileStatus.FAILED_EXTRACT
+            assert "timed out" in table.error_message
+            assert table.ast_path is None
+            assert all(r.status == FileStatus.EXTRACTED for r in records.values())